@@ -0,0 +1,49 @@
+"""
+Benchmark copying and comparing BioC collections: clone() and equals()
+against copy.deepcopy and a JSON round-trip.
+
+Usage:
+    python benchmarks/bench_clone.py [NUM_DOCS]
+"""
+import copy
+import sys
+import time
+
+from bioc import biocjson
+from bench_xml_reader import make_collection
+
+
+def json_copy(collection):
+    return biocjson.loads(biocjson.dumps(collection))
+
+
+def json_equals(collection1, collection2):
+    return biocjson.dumps(collection1) == biocjson.dumps(collection2)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    collection = make_collection(num_docs)
+    other = collection.clone()
+    cases = [
+        ('copy.deepcopy', copy.deepcopy, (collection,)),
+        ('JSON round-trip', json_copy, (collection,)),
+        ('clone', lambda c: c.clone(), (collection,)),
+        ('JSON compare', json_equals, (collection, other)),
+        ('equals', lambda c1, c2: c1.equals(c2), (collection, other)),
+        ('structural_hash', lambda c: c.structural_hash(), (collection,)),
+    ]
+    for name, func, args in cases:
+        elapsed = measure(func, *args)
+        print('%-16s %8.3f sec %8.0f docs/sec'
+              % (name, elapsed, num_docs / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark rebuilding the text of a passage from its sentences.
+
+Usage:
+    python benchmarks/bench_get_text.py [NUM_SENTENCES]
+"""
+import sys
+import time
+
+import bioc
+from bioc.utils import pad_char
+
+
+def make_passage(num_sentences):
+    passage = bioc.BioCPassage()
+    offset = 0
+    for i in range(num_sentences):
+        passage.add_sentence(bioc.BioCSentence.of_text('x' * 100, offset))
+        offset += 101
+    return passage
+
+
+def concat(passage):
+    """The previous way: pad and concatenate one sentence at a time."""
+    text = ''
+    for sentence in passage.sentences:
+        text = pad_char(text, sentence.offset - passage.offset, ' ')
+        text += sentence.text
+    return text
+
+
+def build(passage):
+    passage._text_cache = None
+    return bioc.get_text(passage)[1]
+
+
+def main():
+    num_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    passage = make_passage(num_sentences)
+    expected = concat(passage)
+    cases = [
+        ('concatenate', lambda: concat(passage)),
+        ('get_text', lambda: build(passage)),
+        ('get_text cached', lambda: bioc.get_text(passage)[1]),
+    ]
+    for name, func in cases:
+        start = time.perf_counter()
+        for _ in range(10):
+            assert func() == expected
+        elapsed = time.perf_counter() - start
+        print('%-15s %6d sentences x 10 %10.3f sec'
+              % (name, num_sentences, elapsed))
+
+
+if __name__ == '__main__':
+    main()
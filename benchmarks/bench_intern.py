@@ -0,0 +1,84 @@
+"""
+Measure the memory saved by interning infon keys and values when decoding a
+PubTator-derived BioC collection.
+
+Usage:
+    python benchmarks/bench_intern.py [NUM_DOCS]
+"""
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+import bioc
+from bioc import biocxml, biocjson, pubtator
+from bioc.tools.pubtator2bioc import pubtator2bioc
+
+CONCEPTS = [('Chemical', 'D015738'), ('Disease', 'D003693'),
+            ('Disease', 'D014456'), ('Gene', '3576'), ('Gene', '3577'),
+            ('Species', '9606'), ('Mutation', 'rs2234671')]
+
+
+def make_pubtator(num_docs, num_annotations=20, seed=0):
+    """Abstracts with PubTator-style annotations: type and concept id."""
+    rand = random.Random(seed)
+    lines = []
+    for pmid in range(num_docs):
+        title = 'Title of document %d.' % pmid
+        abstract = ' '.join('word%d' % rand.randrange(1000)
+                            for _ in range(200))
+        lines.append('%d|t|%s' % (pmid, title))
+        lines.append('%d|a|%s' % (pmid, abstract))
+        for i in range(num_annotations):
+            start = len(title) + 1 + i * 10
+            type, concept = rand.choice(CONCEPTS)
+            lines.append('%d\t%d\t%d\tword\t%s\t%s'
+                         % (pmid, start, start + 4, type, concept))
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    collection = load()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del collection
+    return size, elapsed
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    collection = bioc.BioCCollection.of_documents(
+        *[pubtator2bioc(doc) for doc in pubtator.loads(
+            make_pubtator(num_docs))])
+    xml = biocxml.dumps(collection)
+    s = io.StringIO()
+    with biocjson.iterwriter(s) as writer:
+        for document in collection.documents:
+            writer.write(document)
+    jsonl = s.getvalue()
+    del collection
+
+    def load_jsonl(intern):
+        with biocjson.iterreader(io.StringIO(jsonl), intern=intern) as reader:
+            return list(reader)
+
+    cases = [
+        ('xml', lambda intern: biocxml.loads(xml, intern=intern)),
+        ('jsonl', load_jsonl),
+    ]
+    for name, load in cases:
+        for intern in (False, True):
+            size, elapsed = measure(lambda: load(intern))
+            print('%-6s intern=%-5s %8.1f MB retained %8.3f sec'
+                  % (name, intern, size / (1 << 20), elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark iterating over all annotations of a collection with
+bioc.annotations, against the previous recursive implementation.
+
+Usage:
+    python benchmarks/bench_itertools.py [NUM_DOCS]
+"""
+import sys
+import time
+
+import bioc
+from bioc import DOCUMENT, PASSAGE, SENTENCE
+from bench_xml_reader import make_collection
+
+
+class OldResult:
+    def __init__(self):
+        self.document = None
+        self.passage = None
+        self.sentence = None
+        self.annotation = None
+        self.relation = None
+
+
+def old_annotations(obj, docid=None, level=(DOCUMENT, PASSAGE, SENTENCE)):
+    """The previous way: recursive generators, patching results on the way
+    up."""
+    if type(level) == int:
+        level = (level, )
+    if isinstance(obj, bioc.BioCCollection):
+        for document in filter(
+                lambda d: docid is None or docid == d.id, obj.documents):
+            yield from old_annotations(document, level=level)
+    elif isinstance(obj, bioc.BioCDocument):
+        if DOCUMENT in level:
+            for ann in obj.annotations:
+                r = OldResult()
+                r.document = obj
+                r.annotation = ann
+                yield r
+        for passage in obj.passages:
+            for r in old_annotations(passage, level=level):
+                r.document = obj
+                yield r
+    elif isinstance(obj, bioc.BioCPassage):
+        if PASSAGE in level:
+            for ann in obj.annotations:
+                r = OldResult()
+                r.passage = obj
+                r.annotation = ann
+                yield r
+        for sentence in obj.sentences:
+            for r in old_annotations(sentence, level=level):
+                r.passage = obj
+                yield r
+    elif isinstance(obj, bioc.BioCSentence):
+        if SENTENCE in level:
+            for ann in obj.annotations:
+                r = OldResult()
+                r.sentence = obj
+                r.annotation = ann
+                yield r
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    collection = make_collection(num_docs)
+    for name, func in [('recursive', old_annotations),
+                       ('flat', bioc.annotations)]:
+        start = time.perf_counter()
+        n = 0
+        for r in func(collection):
+            n += r.annotation is not None
+        elapsed = time.perf_counter() - start
+        print('%-10s %9d annotations %8.3f sec %12.0f /s'
+              % (name, n, elapsed, n / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark reading and writing BioC JSON with each installed JSON backend.
+
+Usage:
+    python benchmarks/bench_json_backend.py [NUM_DOCS]
+"""
+import sys
+import time
+
+import bioc
+from bioc import biocjson
+from bioc.biocjson import backend
+from bench_xml_reader import make_collection
+
+
+def timeit(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    collection = make_collection(num_docs)
+    num_annotations = sum(1 for _ in bioc.annotations(collection))
+    text = biocjson.dumps(collection)
+    expected = biocjson.toJSON(collection)
+    lines = [biocjson.dumps(d) + '\n' for d in collection.documents]
+    print('%d docs, %d annotations, %.1f MB'
+          % (num_docs, num_annotations, len(text) / 2 ** 20))
+    for name in backend.available_backends():
+        backend.use(name)
+        _, parse_time = timeit(lambda: backend.loads(text))
+        loaded, load_time = timeit(lambda: biocjson.loads(text))
+        assert biocjson.toJSON(loaded) == expected
+        _, lines_time = timeit(lambda: [backend.loads(l) for l in lines])
+        s, dump_time = timeit(lambda: biocjson.dumps(collection))
+        print('%-8s parse %7.3f sec  lines %7.3f sec  loads %7.3f sec  '
+              'dumps %7.3f sec (%.1f MB)'
+              % (name, parse_time, lines_time, load_time, dump_time,
+                 len(s) / 2 ** 20))
+    backend.use()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark serializing a collection to JSON with biocjson.dumps, against the
+previous isinstance chain.
+
+Usage:
+    python benchmarks/bench_json_dumps.py [NUM_DOCS]
+"""
+import json
+import sys
+import time
+
+import bioc
+from bioc import biocjson
+from bench_xml_reader import make_collection
+
+
+class OldEncoder(json.JSONEncoder):
+    """The previous way: an isinstance chain, called again for every
+    nested object."""
+
+    def default(self, o):
+        if isinstance(o, bioc.BioCLocation):
+            return {'offset': o.offset, 'length': o.length}
+        if isinstance(o, bioc.BioCAnnotation):
+            return {'id': o.id, 'infons': o.infons, 'text': o.text,
+                    'locations': [self.default(l) for l in o.locations]}
+        if isinstance(o, bioc.BioCNode):
+            return {'refid': o.refid, 'role': o.role}
+        if isinstance(o, bioc.BioCRelation):
+            return {'id': o.id, 'infons': o.infons,
+                    'nodes': [self.default(n) for n in o.nodes]}
+        if isinstance(o, bioc.BioCSentence):
+            return {'bioctype': 'BioCSentence', 'offset': o.offset,
+                    'infons': o.infons, 'text': o.text,
+                    'annotations': [self.default(a) for a in o.annotations],
+                    'relations': [self.default(r) for r in o.relations]}
+        if isinstance(o, bioc.BioCPassage):
+            return {'bioctype': 'BioCPassage', 'offset': o.offset,
+                    'infons': o.infons, 'text': o.text,
+                    'sentences': [self.default(s) for s in o.sentences],
+                    'annotations': [self.default(a) for a in o.annotations],
+                    'relations': [self.default(r) for r in o.relations]}
+        if isinstance(o, bioc.BioCDocument):
+            return {'bioctype': 'BioCDocument', 'id': o.id,
+                    'infons': o.infons,
+                    'passages': [self.default(p) for p in o.passages],
+                    'annotations': [self.default(a) for a in o.annotations],
+                    'relations': [self.default(r) for r in o.relations]}
+        if isinstance(o, bioc.BioCCollection):
+            return {'bioctype': 'BioCCollection', 'source': o.source,
+                    'date': o.date, 'key': o.key, 'version': o.version,
+                    'infons': o.infons,
+                    'documents': [self.default(d) for d in o.documents]}
+        return json.JSONEncoder.default(self, o)
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    collection = make_collection(num_docs)
+    num_annotations = sum(1 for _ in bioc.annotations(collection))
+    expected = None
+    for name, func in [
+            ('isinstance', lambda: json.dumps(collection, cls=OldEncoder)),
+            ('dispatch', lambda: biocjson.dumps(collection))]:
+        start = time.perf_counter()
+        s = func()
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = s
+        assert s == expected
+        print('%-10s %9d annotations %8.3f sec %10.0f docs/s'
+              % (name, num_annotations, elapsed, num_docs / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure the memory of the BioC data model: bytes per annotation, relation,
+and sentence, and bytes per annotation in a BioCAnnotationStore.
+
+Usage:
+    python benchmarks/bench_memory.py [NUM_OBJECTS]
+"""
+import sys
+import tracemalloc
+
+import bioc
+from bioc.columnar import BioCAnnotationStore
+
+
+def make_annotation(i):
+    ann = bioc.BioCAnnotation()
+    ann.id = 'T%d' % i
+    ann.text = 'text'
+    ann.infons['type'] = 'Gene'
+    ann.add_location(bioc.BioCLocation(i, 4))
+    return ann
+
+
+def make_relation(i):
+    rel = bioc.BioCRelation()
+    rel.id = 'R%d' % i
+    rel.infons['type'] = 'Association'
+    rel.add_node(bioc.BioCNode('T%d' % i, 'Gene'))
+    rel.add_node(bioc.BioCNode('T%d' % (i + 1), 'Disease'))
+    return rel
+
+
+def make_sentence(i):
+    return bioc.BioCSentence.of_text('text', i)
+
+
+def measure_store(n):
+    annotations = [make_annotation(i) for i in range(n)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ids and texts are shared with the annotations, so count them here
+    shared = sum(sys.getsizeof(a.id) + sys.getsizeof(a.text)
+                 for a in annotations)
+    return (after - before + shared) / len(store)
+
+
+def measure(factory, n):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(i) for i in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # exclude the list that holds the objects
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, factory in [('annotation', make_annotation),
+                          ('relation', make_relation),
+                          ('sentence', make_sentence)]:
+        print('%-12s %8.1f bytes' % (name, measure(factory, n)))
+    print('%-12s %8.1f bytes' % ('columnar', measure_store(n)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark mapping annotations to sentences in a full-text document.
+
+Usage:
+    python benchmarks/bench_offsets.py [NUM_SENTENCES]
+"""
+import sys
+import time
+
+import bioc
+
+
+def make_passage(num_sentences, num_annotations=4):
+    passage = bioc.BioCPassage()
+    offset = 0
+    for i in range(num_sentences):
+        sentence = bioc.BioCSentence.of_text('x' * 100, offset)
+        for j in range(num_annotations):
+            ann = bioc.BioCAnnotation()
+            ann.id = '%d.%d' % (i, j)
+            ann.add_location(bioc.BioCLocation(offset + j * 20, 10))
+            passage.add_annotation(ann)
+        passage.add_sentence(sentence)
+        offset += 101
+    return passage
+
+
+def scan(passage, offset):
+    """The previous way: a linear scan over the sentences."""
+    for sentence in passage.sentences:
+        if sentence.offset <= offset < sentence.offset + len(sentence.text):
+            return sentence
+    return None
+
+
+def main():
+    num_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    passage = make_passage(num_sentences)
+    offsets = [ann.total_span.offset for ann in passage.annotations]
+    starts = [sentence.offset for sentence in passage.sentences]
+    cases = [
+        ('get_sentence', passage.get_sentence, starts),
+        ('sentence_at', passage.sentence_at, offsets),
+        ('linear scan', lambda o: scan(passage, o), offsets),
+    ]
+    for name, func, queries in cases:
+        start = time.perf_counter()
+        for q in queries:
+            assert func(q) is not None
+        elapsed = time.perf_counter() - start
+        print('%-15s %8d queries %10.3f sec' % (name, len(queries), elapsed))
+
+
+if __name__ == '__main__':
+    main()
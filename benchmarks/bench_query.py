@@ -0,0 +1,56 @@
+"""
+Benchmark a selective query over a BioC XML file: loading everything and
+filtering in Python, against bioc.query.
+
+Usage:
+    python benchmarks/bench_query.py [NUM_DOCS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import bioc
+from bioc import PASSAGE
+from bioc.biocquery import infon, query
+from bench_xml_reader import make_collection
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    collection = make_collection(num_docs)
+    # one document in ten mentions a disease
+    for document in collection.documents[::10]:
+        ann = document.passages[0].sentences[0].annotations[0]
+        ann.infons['type'] = 'Disease'
+    path = os.path.join(tempfile.mkdtemp(), 'collection.xml')
+    with open(path, 'w', encoding='utf8') as fp:
+        bioc.dump(collection, fp)
+    del collection
+
+    def load_and_filter():
+        with open(path, encoding='utf8') as fp:
+            c = bioc.load(fp)
+        return [r for r in bioc.annotations(c)
+                if r.annotation.infons.get('type') == 'Disease'
+                and 'identifier' in r.annotation.infons]
+
+    def run_query():
+        return list(query(path).annotations(type='Disease')
+                    .where(infon('identifier') != None))
+
+    def run_query_passage():
+        return list(query(path).annotations(type='Disease', level=PASSAGE))
+
+    for name, func in [('load + filter', load_and_filter),
+                       ('query', run_query),
+                       ('query PASSAGE', run_query_passage)]:
+        start = time.perf_counter()
+        n = len(func())
+        elapsed = time.perf_counter() - start
+        print('%-15s %8d results %8.3f sec' % (name, n, elapsed))
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
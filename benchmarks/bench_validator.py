@@ -0,0 +1,49 @@
+"""
+Benchmark validating a document with many relations.
+
+Usage:
+    python benchmarks/bench_validator.py [NUM_RELATIONS]
+"""
+import sys
+import time
+
+import bioc
+from bioc.validator import BioCValidator
+
+
+def make_document(num_relations, sentence_len=100):
+    """Make a document of one passage with two annotations and one relation
+    per sentence."""
+    doc = bioc.BioCDocument()
+    doc.id = '1'
+    passage = bioc.BioCPassage()
+    offset = 0
+    for i in range(num_relations):
+        sentence = bioc.BioCSentence.of_text('x' * sentence_len, offset)
+        rel = bioc.BioCRelation()
+        rel.id = 'R%d' % i
+        for j in range(2):
+            ann = bioc.BioCAnnotation()
+            ann.id = 'T%d.%d' % (i, j)
+            ann.text = 'x' * 10
+            ann.add_location(bioc.BioCLocation(offset + j * 20, 10))
+            sentence.add_annotation(ann)
+            rel.add_node(bioc.BioCNode(ann.id, 'arg%d' % j))
+        sentence.add_relation(rel)
+        passage.add_sentence(sentence)
+        offset += sentence_len + 1
+    doc.add_passage(passage)
+    return doc
+
+
+def main():
+    num_relations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    doc = make_document(num_relations)
+    start = time.perf_counter()
+    BioCValidator().validate_doc(doc)
+    elapsed = time.perf_counter() - start
+    print('validate_doc %8d relations %10.3f sec' % (num_relations, elapsed))
+
+
+if __name__ == '__main__':
+    main()
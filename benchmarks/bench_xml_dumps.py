@@ -0,0 +1,70 @@
+"""
+Benchmark BioC XML serialization: the lxml element tree against the direct
+string serializer.
+
+Usage:
+    python benchmarks/bench_xml_dumps.py [NUM_DOCS]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from lxml import etree
+
+from bioc import biocxml
+from bioc.biocxml.encoder import encode_collection
+from bench_xml_reader import make_collection
+
+
+def dumps_tree(collection):
+    """The previous serializer: build the whole tree, then tostring."""
+    doc = etree.ElementTree(encode_collection(collection))
+    s = etree.tostring(doc, pretty_print=True, encoding=collection.encoding,
+                       standalone=collection.standalone)
+    return s.decode(collection.encoding)
+
+
+def dump_tree(collection, path):
+    with open(path, 'w', encoding='utf8') as fp:
+        fp.write(dumps_tree(collection))
+
+
+def dump_stream(collection, path):
+    with open(path, 'wb') as fp:
+        biocxml.dump(collection, fp)
+
+
+def measure(func, *args):
+    # time without tracemalloc, whose hooks slow down allocation
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    # the peak of the Python heap; lxml's own allocations are not traced
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    collection = make_collection(num_docs)
+    path = os.path.join(tempfile.mkdtemp(), 'out.xml')
+    assert dumps_tree(collection) == biocxml.dumps(collection)
+    cases = [
+        ('tostring', dumps_tree, (collection,)),
+        ('dumps', biocxml.dumps, (collection,)),
+        ('element tree to file', dump_tree, (collection, path)),
+        ('dump to file', dump_stream, (collection, path)),
+    ]
+    for name, func, args in cases:
+        elapsed, peak = measure(func, *args)
+        print('%-25s %8.0f docs/sec %10.1f MB peak'
+              % (name, num_docs / elapsed, peak / (1 << 20)))
+
+
+if __name__ == '__main__':
+    main()
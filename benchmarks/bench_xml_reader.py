@@ -0,0 +1,68 @@
+"""
+Benchmark BioCXMLDocumentReader on a large synthetic collection.
+
+Usage:
+    python benchmarks/bench_xml_reader.py [NUM_DOCS]
+"""
+import io
+import sys
+import time
+
+import bioc
+from bioc import biocxml
+
+
+def make_collection(num_docs: int, num_passages: int = 5,
+                    num_sentences: int = 5,
+                    num_annotations: int = 5) -> bioc.BioCCollection:
+    collection = bioc.BioCCollection()
+    collection.source = 'synthetic'
+    for i in range(num_docs):
+        document = bioc.BioCDocument()
+        document.id = str(i)
+        document.infons['type'] = 'article'
+        offset = 0
+        for j in range(num_passages):
+            passage = bioc.BioCPassage()
+            passage.offset = offset
+            passage.infons['section'] = 'p%d' % j
+            for k in range(num_sentences):
+                sentence = bioc.BioCSentence.of_text(
+                    'The BRCA1 gene is associated with breast cancer.',
+                    offset)
+                for m in range(num_annotations):
+                    ann = bioc.BioCAnnotation()
+                    ann.id = 'T%d_%d_%d' % (j, k, m)
+                    ann.infons['type'] = 'Gene'
+                    ann.infons['identifier'] = '672'
+                    ann.text = 'BRCA1'
+                    ann.add_location(bioc.BioCLocation(offset + 4, 5))
+                    sentence.add_annotation(ann)
+                rel = bioc.BioCRelation()
+                rel.id = 'R%d_%d' % (j, k)
+                rel.infons['type'] = 'Association'
+                rel.add_node(bioc.BioCNode('T%d_%d_0' % (j, k), 'Gene'))
+                rel.add_node(bioc.BioCNode('T%d_%d_1' % (j, k), 'Disease'))
+                sentence.add_relation(rel)
+                passage.add_sentence(sentence)
+                offset += len(sentence.text) + 1
+            document.add_passage(passage)
+        collection.add_document(document)
+    return collection
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    data = biocxml.dumps(make_collection(num_docs)).encode('utf8')
+    print('%d documents, %.1f MB' % (num_docs, len(data) / 1e6))
+
+    start = time.perf_counter()
+    with biocxml.iterparse(io.BytesIO(data)) as reader:
+        n = sum(1 for _ in reader)
+    elapsed = time.perf_counter() - start
+    assert n == num_docs
+    print('BioCXMLDocumentReader: %.0f docs/sec' % (n / elapsed))
+
+
+if __name__ == '__main__':
+    main()
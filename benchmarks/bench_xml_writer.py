@@ -0,0 +1,58 @@
+"""
+Benchmark BioCXMLDocumentWriter flush policies and document encoding.
+
+Usage:
+    python benchmarks/bench_xml_writer.py [NUM_DOCS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from lxml import etree
+
+from bioc import biocxml
+from bioc.biocxml.encoder import encode_document
+from bench_xml_reader import make_collection
+
+
+def write_tree(collection, path):
+    """The previous writer: one element tree and one flush per document."""
+    with etree.xmlfile(path, encoding='utf8') as xf:
+        xf.write_declaration(standalone=True)
+        with xf.element('collection'):
+            for document in collection.documents:
+                xf.write(encode_document(document))
+                xf.write('\n')
+                xf.flush()
+
+
+def write_stream(collection, path, **kwargs):
+    with biocxml.iterwrite(path, **kwargs) as writer:
+        for document in collection.documents:
+            writer.write_document(document)
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    collection = make_collection(num_docs, num_passages=2, num_sentences=2,
+                                 num_annotations=2)
+    path = os.path.join(tempfile.mkdtemp(), 'out.xml')
+    cases = [
+        ('element tree, flush every document', write_tree, {}),
+        ('streaming, flush every document', write_stream, {}),
+        ('streaming, flush every 1000 documents', write_stream,
+         {'flush_every': 1000}),
+        ('streaming, flush every 1 MB', write_stream,
+         {'flush_bytes': 1 << 20}),
+        ('streaming, flush on close', write_stream, {'flush_every': None}),
+    ]
+    for name, func, kwargs in cases:
+        start = time.perf_counter()
+        func(collection, path, **kwargs)
+        elapsed = time.perf_counter() - start
+        print('%-40s %8.0f docs/sec' % (name, num_docs / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,19 +4,21 @@ BioC data structures and encoder/decoder for Python
 from .datastructure import BioCAnnotation, BioCCollection, BioCDocument, \
     BioCLocation, BioCNode, BioCPassage, BioCRelation, BioCSentence, \
     BioCDataModel
-from .validator import validate
+from .validator import validate, validate_stream
 from .biocitertools import annotations, relations, sentences
 from .utils import get_text, pretty_print
 from .biocxml import loads, load, dump, dumps
+from .biocquery import query, infon
 from .constants import PASSAGE, DOCUMENT, SENTENCE, COLLECTION
 
 
 __all__ = ['BioCAnnotation', 'BioCCollection', 'BioCDocument', 'BioCLocation',
            'BioCNode', 'BioCPassage', 'BioCRelation', 'BioCSentence',
            'BioCDataModel',
-           'validate', 'annotations', 'relations', 'sentences', 'get_text',
-           'pretty_print',
-           'biocxml', 'biocjson',
+           'validate', 'validate_stream', 'annotations', 'relations',
+           'sentences', 'get_text', 'pretty_print', 'query', 'infon',
+           'biocxml', 'biocjson', 'pipeline', 'columnar', 'intervals',
+           'biocquery', 'stats',
            'load', 'loads', 'dump', 'dumps',
            'PASSAGE', 'DOCUMENT', 'SENTENCE', 'COLLECTION',
            'pubtator']
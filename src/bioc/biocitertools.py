@@ -2,7 +2,7 @@
 This module implements a number of iterator building blocks.
 """
 
-from typing import Generator, Collection, Union, Optional
+from typing import Generator, Collection, Union, Optional, Callable
 
 from bioc.datastructure import BioCCollection, BioCDocument, \
     BioCPassage, BioCSentence, BioCAnnotation, \
@@ -11,12 +11,104 @@ from bioc.constants import DOCUMENT, PASSAGE, SENTENCE
 
 
 class BioCResult:
-    def __init__(self):
-        self.document = None  # type: Optional[BioCDocument]
-        self.passage = None  # type: Optional[BioCPassage]
-        self.sentence = None  # type: Optional[BioCSentence]
-        self.annotation = None  # type: Optional[BioCAnnotation]
-        self.relation = None  # type: Optional[BioCRelation]
+    """
+    An annotation, relation, or sentence with the objects that contain it.
+    """
+    __slots__ = ('document', 'passage', 'sentence', 'annotation', 'relation')
+
+    def __init__(self, document: BioCDocument = None,
+                 passage: BioCPassage = None,
+                 sentence: BioCSentence = None,
+                 annotation: BioCAnnotation = None,
+                 relation: BioCRelation = None):
+        self.document = document  # type: Optional[BioCDocument]
+        self.passage = passage  # type: Optional[BioCPassage]
+        self.sentence = sentence  # type: Optional[BioCSentence]
+        self.annotation = annotation  # type: Optional[BioCAnnotation]
+        self.relation = relation  # type: Optional[BioCRelation]
+
+    def __str__(self):
+        return 'BioCResult[document=%s,passage=%s,sentence=%s,' \
+               'annotation=%s,relation=%s]' \
+               % (None if self.document is None else self.document.id,
+                  None if self.passage is None else self.passage.offset,
+                  None if self.sentence is None else self.sentence.offset,
+                  None if self.annotation is None else self.annotation.id,
+                  None if self.relation is None else self.relation.id)
+
+    def __repr__(self):
+        return str(self)
+
+
+def _relation_result(document, passage, sentence, relation) -> BioCResult:
+    return BioCResult(document, passage, sentence, None, relation)
+
+
+def _iter_results(obj, docid: Optional[str], level, field: str, make,
+                  accept: Callable = None, within: Callable = None) \
+        -> Generator[BioCResult, None, None]:
+    """
+    Walk the documents, passages, and sentences in one loop nest, without
+    recursive generators.
+
+    :param field: 'annotations' or 'relations'
+    :param make: creates the result of (document, passage, sentence, item)
+    :param accept: if not None, only items for which it returns True are
+    reported
+    :param within: if not None, passages and sentences for which it returns
+    False are not visited
+    """
+    if isinstance(level, int):
+        level = (level, )
+    in_document = DOCUMENT in level
+    in_passage = PASSAGE in level
+    in_sentence = SENTENCE in level
+
+    if isinstance(obj, BioCSentence):
+        if in_sentence:
+            for item in getattr(obj, field):
+                if accept is None or accept(item):
+                    yield make(None, None, obj, item)
+        return
+    if isinstance(obj, BioCCollection):
+        documents = obj.documents
+        if docid is not None:
+            documents = [d for d in documents if d.id == docid]
+    elif isinstance(obj, BioCDocument):
+        documents = (obj, )
+    elif isinstance(obj, BioCPassage):
+        # a passage without its document
+        documents = (None, )
+    else:
+        raise TypeError('Object of type %s must be BioCCollection, '
+                        'BioCDocument, BioCPassage, or BioCSentence'
+                        % obj.__class__.__name__)
+
+    for document in documents:
+        if document is None:
+            passages = (obj, )
+        else:
+            passages = document.passages
+            if in_document:
+                for item in getattr(document, field):
+                    if accept is None or accept(item):
+                        yield make(document, None, None, item)
+        if not in_passage and not in_sentence:
+            continue
+        for passage in passages:
+            if within is not None and not within(passage):
+                continue
+            if in_passage:
+                for item in getattr(passage, field):
+                    if accept is None or accept(item):
+                        yield make(document, passage, None, item)
+            if in_sentence:
+                for sentence in passage.sentences:
+                    if within is not None and not within(sentence):
+                        continue
+                    for item in getattr(sentence, field):
+                        if accept is None or accept(item):
+                            yield make(document, passage, sentence, item)
 
 
 def annotations(obj: BioCCollection or BioCDocument or BioCPassage
@@ -32,45 +124,7 @@ def annotations(obj: BioCCollection or BioCDocument or BioCPassage
     :param level: DOCUMENT, PASSAGE, SENTENCE
     :return: one annotation
     """
-    if type(level) == int:
-        level = (level, )
-    if isinstance(obj, BioCCollection):
-        for document in filter(
-                lambda d: docid is None or docid == d.id, obj.documents):
-            yield from annotations(document, level=level)
-    elif isinstance(obj, BioCDocument):
-        if DOCUMENT in level:
-            for ann in obj.annotations:
-                r = BioCResult()
-                r.document = obj
-                r.annotation = ann
-                yield r
-        for passage in obj.passages:
-            for r in annotations(passage, level=level):
-                r.document = obj
-                yield r
-    elif isinstance(obj, BioCPassage):
-        if PASSAGE in level:
-            for ann in obj.annotations:
-                r = BioCResult()
-                r.passage = obj
-                r.annotation = ann
-                yield r
-        for sentence in obj.sentences:
-            for r in annotations(sentence, level=level):
-                r.passage = obj
-                yield r
-    elif isinstance(obj, BioCSentence):
-        if SENTENCE in level:
-            for ann in obj.annotations:
-                r = BioCResult()
-                r.sentence = obj
-                r.annotation = ann
-                yield r
-    else:
-        raise TypeError('Object of type %s must be BioCCollection, '
-                        'BioCDocument, BioCPassage, or BioCSentence'
-                        % obj.__class__.__name__)
+    return _iter_results(obj, docid, level, 'annotations', BioCResult)
 
 
 def relations(obj: BioCCollection or BioCDocument or BioCPassage or BioCSentence,
@@ -85,45 +139,7 @@ def relations(obj: BioCCollection or BioCDocument or BioCPassage or BioCSentence
     :param level: DOCUMENT, PASSAGE, SENTENCE
     :return: one relation
     """
-    if type(level) == int:
-        level = (level, )
-    if isinstance(obj, BioCCollection):
-        for document in filter(
-                lambda d: docid is None or docid == d.id, obj.documents):
-            yield from relations(document, level=level)
-    elif isinstance(obj, BioCDocument):
-        if DOCUMENT in level:
-            for rel in obj.relations:
-                r = BioCResult()
-                r.document = obj
-                r.relation = rel
-                yield r
-        for passage in obj.passages:
-            for r in relations(passage, level=level):
-                r.document = obj
-                yield r
-    elif isinstance(obj, BioCPassage):
-        if PASSAGE in level:
-            for rel in obj.relations:
-                r = BioCResult()
-                r.passage = obj
-                r.relation = rel
-                yield r
-        for sentence in obj.sentences:
-            for r in relations(sentence, level=level):
-                r.passage = obj
-                yield r
-    elif isinstance(obj, BioCSentence):
-        if SENTENCE in level:
-            for rel in obj.relations:
-                r = BioCResult()
-                r.sentence = obj
-                r.relation = rel
-                yield r
-    else:
-        raise TypeError('Object of type %s must be BioCCollection, '
-                        'BioCDocument, BioCPassage, or BioCSentence'
-                        % obj.__class__.__name__)
+    return _iter_results(obj, docid, level, 'relations', _relation_result)
 
 
 def sentences(obj: BioCCollection or BioCDocument or BioCPassage) \
@@ -135,20 +151,18 @@ def sentences(obj: BioCCollection or BioCDocument or BioCPassage) \
     :return: one sentence
     """
     if isinstance(obj, BioCCollection):
-        for document in obj.documents:
-            yield from sentences(document)
+        documents = obj.documents
     elif isinstance(obj, BioCDocument):
-        for passage in obj.passages:
-            for r in sentences(passage):
-                r.document = obj
-                yield r
+        documents = (obj, )
     elif isinstance(obj, BioCPassage):
         for sentence in obj.sentences:
-            r = BioCResult()
-            r.passage = obj
-            r.sentence = sentence
-            yield r
+            yield BioCResult(None, obj, sentence)
+        return
     else:
         raise TypeError('Object of type %s must be BioCCollection, '
                         'BioCDocument, BioCPassage'
                         % obj.__class__.__name__)
+    for document in documents:
+        for passage in document.passages:
+            for sentence in passage.sentences:
+                yield BioCResult(document, passage, sentence)
@@ -0,0 +1,182 @@
+"""
+JSON libraries used by the BioC JSON encoder and decoder.
+
+By default, the fastest installed library (orjson, ujson, or the standard
+library json) parses JSON, and the standard library formatting is used to
+write it. Other libraries write compact JSON without spaces and escapes of
+non-ASCII characters, so they are only used for writing when selected with
+``use``. Either way, the decoded data is the same.
+
+orjson writes NaN and Infinity as null and rejects integers beyond 64
+bits, and ujson rejects such integers too, so objects that they cannot
+write as json does are written with json.
+"""
+import json
+from typing import Any, Callable, List, Optional
+
+# in order of preference
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+class JSONBackend:
+    """
+    The loads and dumps functions of a JSON library.
+    """
+
+    def __init__(self, name: str, parse: Callable[[Any], Any],
+                 serialize: Callable[[Any], str]):
+        """
+        :param name: the name of the library
+        :param parse: parses a str or bytes
+        :param serialize: serializes an object to a str
+        """
+        self.name = name
+        self.loads = parse
+        self.dumps = serialize
+
+    def __str__(self):
+        return 'JSONBackend[%s]' % self.name
+
+    def __repr__(self):
+        return str(self)
+
+
+def _with_fallback(parse: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    :return: parse that falls back to json if the text is rejected, e.g.,
+    because it has NaN or Infinity, which json reads and writes
+    """
+    def func(s):
+        try:
+            return parse(s)
+        except ValueError:
+            return json.loads(s)
+    return func
+
+
+def _orjson() -> JSONBackend:
+    import orjson
+
+    def dumps(obj) -> str:
+        try:
+            b = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g., an integer beyond 64 bits
+            return json.dumps(obj)
+        if b'null' in b:
+            # null may be a NaN or Infinity, which json keeps
+            return json.dumps(obj)
+        return b.decode('utf8')
+
+    return JSONBackend('orjson', _with_fallback(orjson.loads), dumps)
+
+
+def _ujson() -> JSONBackend:
+    import ujson
+
+    def dumps(obj) -> str:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False,
+                               escape_forward_slashes=False)
+        except OverflowError:
+            # e.g., an integer beyond 64 bits
+            return json.dumps(obj)
+
+    return JSONBackend('ujson', _with_fallback(ujson.loads), dumps)
+
+
+def _json() -> JSONBackend:
+    return JSONBackend('json', json.loads, json.dumps)
+
+
+_FACTORIES = {
+    'orjson': _orjson,
+    'ujson': _ujson,
+    'json': _json,
+}
+
+
+def get_backend(name: str) -> JSONBackend:
+    """
+    :param name: orjson, ujson, or json
+    :return: the backend of the library
+    :raise ImportError: if the library is not installed
+    """
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        raise ValueError('Unknown JSON backend: %s. Must be one of %s'
+                         % (name, ', '.join(BACKENDS))) from None
+    return factory()
+
+
+def available_backends() -> List[str]:
+    """
+    :return: the names of the installed libraries, in order of preference
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _fastest() -> JSONBackend:
+    return get_backend(available_backends()[0])
+
+
+class _Selection:
+    """
+    The backends selected with ``use``.
+    """
+
+    def __init__(self):
+        self.reader = _fastest()  # type: JSONBackend
+        # None writes with the standard library formatting
+        self.writer = None  # type: Optional[JSONBackend]
+
+
+_selection = _Selection()
+
+
+def use(name: str = None):
+    """
+    Select the JSON library to read and write BioC JSON.
+
+    :param name: orjson, ujson, or json. If None, restore the default: the
+    fastest installed library reads, and the standard library formatting is
+    used to write
+    :raise ImportError: if the library is not installed
+    """
+    if name is None:
+        _selection.reader = _fastest()
+        _selection.writer = None
+    else:
+        _selection.reader = get_backend(name)
+        # the emitters of the encoder write the same text as json, faster
+        _selection.writer = None if name == 'json' else _selection.reader
+
+
+def reader() -> JSONBackend:
+    """
+    :return: the backend that parses BioC JSON
+    """
+    return _selection.reader
+
+
+def writer() -> Optional[JSONBackend]:
+    """
+    :return: the backend that writes BioC JSON, or None if the standard
+    library formatting is used
+    """
+    return _selection.writer
+
+
+def loads(s) -> Any:
+    """
+    Parse ``s`` with the selected library.
+    """
+    return _selection.reader.loads(s)
@@ -4,16 +4,29 @@ BioC JSON decoder
 import io
 import json
 from contextlib import contextmanager
-from typing import TextIO, Dict, Union
+from typing import TextIO, Dict, Union, Optional, Collection, FrozenSet
 
+from bioc.biocjson import backend
 from bioc.datastructure import BioCCollection, BioCSentence, \
     BioCRelation, BioCAnnotation, BioCNode, \
     BioCLocation, BioCPassage, BioCDocument
+from bioc.utils import projection, string_cache, StringCache
 
 
-def parse_collection(obj: Dict) -> BioCCollection:
+def _infons(infons: Dict, intern: Optional[StringCache]) -> Dict:
+    if intern is None:
+        return infons
+    return {intern(k): intern(v) if isinstance(v, str) else v
+            for k, v in infons.items()}
+
+
+def parse_collection(obj: Dict, skip: FrozenSet[str] = frozenset(),
+                     intern: Optional[StringCache] = None) -> BioCCollection:
     """
     Deserialize a dict ``obj`` to a BioCCollection object
+
+    :param skip: levels and fields that are not materialized
+    :param intern: the cache that shares equal infon keys and values
     """
     collection = BioCCollection()
     collection.source = obj['source']
@@ -21,122 +34,195 @@ def parse_collection(obj: Dict) -> BioCCollection:
     collection.key = obj['key']
     if 'version' in obj:
         collection.version = obj['version']
-    collection.infons = obj['infons']
+    collection.infons = _infons(obj['infons'], intern)
     for doc in obj['documents']:
-        collection.add_document(parse_doc(doc))
+        collection.add_document(parse_doc(doc, skip, intern))
     return collection
 
 
-def parse_annotation(obj: Dict) -> BioCAnnotation:
+def parse_annotation(obj: Dict, intern: Optional[StringCache] = None) \
+        -> BioCAnnotation:
     """
     Deserialize a dict obj to a BioCAnnotation object
+
+    :param intern: the cache that shares equal infon keys and values
     """
     ann = BioCAnnotation()
     ann.id = obj['id']
-    ann.infons = obj['infons']
+    ann.infons = _infons(obj['infons'], intern)
     ann.text = obj['text']
     for loc in obj['locations']:
         ann.add_location(BioCLocation(loc['offset'], loc['length']))
     return ann
 
 
-def parse_relation(obj: Dict) -> BioCRelation:
+def parse_relation(obj: Dict, intern: Optional[StringCache] = None) \
+        -> BioCRelation:
     """
     Deserialize a dict obj to a BioCRelation object
+
+    :param intern: the cache that shares equal infon keys and values
     """
     rel = BioCRelation()
     rel.id = obj['id']
-    rel.infons = obj['infons']
+    rel.infons = _infons(obj['infons'], intern)
     for node in obj['nodes']:
-        rel.add_node(BioCNode(node['refid'], node['role']))
+        role = node['role'] if intern is None else intern(node['role'])
+        rel.add_node(BioCNode(node['refid'], role))
     return rel
 
 
-def parse_sentence(obj: Dict) -> BioCSentence:
+def parse_sentence(obj: Dict, skip: FrozenSet[str] = frozenset(),
+                   intern: Optional[StringCache] = None) -> BioCSentence:
     """
     Deserialize a dict obj to a BioCSentence object
+
+    :param skip: levels and fields that are not materialized
+    :param intern: the cache that shares equal infon keys and values
     """
     sentence = BioCSentence()
     sentence.offset = obj['offset']
-    sentence.infons = obj['infons']
-    sentence.text = obj['text']
-    for annotation in obj['annotations']:
-        sentence.add_annotation(parse_annotation(annotation))
-    for relation in obj['relations']:
-        sentence.add_relation(parse_relation(relation))
+    if 'infons' not in skip:
+        sentence.infons = _infons(obj['infons'], intern)
+    if 'text' not in skip:
+        sentence.text = obj['text']
+    if 'annotations' not in skip:
+        for annotation in obj['annotations']:
+            sentence.add_annotation(parse_annotation(annotation, intern))
+    if 'relations' not in skip:
+        for relation in obj['relations']:
+            sentence.add_relation(parse_relation(relation, intern))
     return sentence
 
 
-def parse_passage(obj: Dict) -> BioCPassage:
+def parse_passage(obj: Dict, skip: FrozenSet[str] = frozenset(),
+                  intern: Optional[StringCache] = None) -> BioCPassage:
     """
     Deserialize a dict obj to a BioCPassage object
+
+    :param skip: levels and fields that are not materialized
+    :param intern: the cache that shares equal infon keys and values
     """
     passage = BioCPassage()
     passage.offset = obj['offset']
-    passage.infons = obj['infons']
-    if 'text' in obj:
+    if 'infons' not in skip:
+        passage.infons = _infons(obj['infons'], intern)
+    if 'text' in obj and 'text' not in skip:
         passage.text = obj['text']
-    for sentence in obj['sentences']:
-        passage.add_sentence(parse_sentence(sentence))
-    for annotation in obj['annotations']:
-        passage.add_annotation(parse_annotation(annotation))
-    for relation in obj['relations']:
-        passage.add_relation(parse_relation(relation))
+    if 'sentences' not in skip:
+        for sentence in obj['sentences']:
+            passage.add_sentence(parse_sentence(sentence, skip, intern))
+    if 'annotations' not in skip:
+        for annotation in obj['annotations']:
+            passage.add_annotation(parse_annotation(annotation, intern))
+    if 'relations' not in skip:
+        for relation in obj['relations']:
+            passage.add_relation(parse_relation(relation, intern))
     return passage
 
 
-def parse_doc(obj: Dict) -> BioCDocument:
+def parse_doc(obj: Dict, skip: FrozenSet[str] = frozenset(),
+              intern: Optional[StringCache] = None) -> BioCDocument:
     """
     Deserialize a dict obj to a BioCDocument object
+
+    :param skip: levels and fields that are not materialized
+    :param intern: the cache that shares equal infon keys and values
     """
     doc = BioCDocument()
     doc.id = obj['id']
-    doc.infons = obj['infons']
-    for passage in obj['passages']:
-        doc.add_passage(parse_passage(passage))
-    if 'annotations' in obj:
+    if 'infons' not in skip:
+        doc.infons = _infons(obj['infons'], intern)
+    if 'passages' not in skip:
+        for passage in obj['passages']:
+            doc.add_passage(parse_passage(passage, skip, intern))
+    if 'annotations' in obj and 'annotations' not in skip:
         for annotation in obj['annotations']:
-            doc.add_annotation(parse_annotation(annotation))
-    for relation in obj['relations']:
-        doc.add_relation(parse_relation(relation))
+            doc.add_annotation(parse_annotation(annotation, intern))
+    if 'relations' not in skip:
+        for relation in obj['relations']:
+            doc.add_relation(parse_relation(relation, intern))
     return doc
 
 
-def load(fp: TextIO, **kwargs) -> BioCCollection:
+def load(fp: TextIO, *, skip: Optional[Collection[str]] = None,
+         fields: Optional[Collection[str]] = None,
+         intern: Union[bool, StringCache] = False, **kwargs) -> BioCCollection:
     """
     Deserialize ``fp`` (a ``.read()``-supporting file-like object containing
-    a JSON document) to a BioCCollection object. kwargs are passed to json.
+    a JSON document) to a BioCCollection object. Without kwargs, the JSON
+    backend parses the document; kwargs are passed to json.
+
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param intern: if True, equal infon keys and values share one string
+    object. A StringCache can be passed to share the cache across calls
     """
-    obj = json.load(fp, **kwargs)
-    return parse_collection(obj)
+    if kwargs:
+        obj = json.load(fp, **kwargs)
+    else:
+        obj = backend.loads(fp.read())
+    return parse_collection(obj, projection(skip, fields),
+                            string_cache(intern))
 
 
-def loads(s: str, **kwargs) -> BioCCollection:
+def loads(s: str, *, skip: Optional[Collection[str]] = None,
+          fields: Optional[Collection[str]] = None,
+          intern: Union[bool, StringCache] = False, **kwargs) \
+        -> BioCCollection:
     """
     Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
-    containing a JSON document) to a BioCCollection object. kwargs are
-    passed to json.
+    containing a JSON document) to a BioCCollection object. Without kwargs,
+    the JSON backend parses the document; kwargs are passed to json.
+
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param intern: if True, equal infon keys and values share one string
+    object. A StringCache can be passed to share the cache across calls
     """
-    obj = json.loads(s, **kwargs)
-    return parse_collection(obj)
+    if kwargs:
+        obj = json.loads(s, **kwargs)
+    else:
+        obj = backend.loads(s)
+    return parse_collection(obj, projection(skip, fields),
+                            string_cache(intern))
+
 
+# fromJSON is called once per object, e.g., per line of a jsonlines file, so
+# intern=True uses one cache for all calls
+_FROMJSON_CACHE = StringCache()
 
-def fromJSON(obj: Dict, bioctype: str = None) \
+
+def fromJSON(obj: Dict, bioctype: str = None, *,
+             skip: Optional[Collection[str]] = None,
+             fields: Optional[Collection[str]] = None,
+             intern: Union[bool, StringCache] = False) \
         -> Union[BioCDocument, BioCPassage, BioCSentence]:
     """
     Convert a Python dict to a BioC object
+
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param intern: if True, equal infon keys and values share one string
+    object through a cache shared by all calls of fromJSON. A StringCache
+    can be passed instead
     """
     if 'bioctype' in obj and bioctype is None:
         bioctype = obj['bioctype']
     if bioctype is None:
         raise KeyError('Cannot find bioctype in the object: %s' % obj)
 
+    skip = projection(skip, fields)
+    intern = _FROMJSON_CACHE if intern is True else string_cache(intern)
     if bioctype == 'BioCDocument':
-        return parse_doc(obj)
+        return parse_doc(obj, skip, intern)
     elif bioctype == 'BioCPassage':
-        return parse_passage(obj)
+        return parse_passage(obj, skip, intern)
     elif bioctype == 'BioCSentence':
-        return parse_sentence(obj)
+        return parse_sentence(obj, skip, intern)
     else:
         raise KeyError
 
@@ -146,9 +232,22 @@ class BioCJsonIterReader:
     Reader for the jsonlines format.
     """
 
-    def __init__(self, fp: TextIO):
+    def __init__(self, fp: TextIO, *, skip: Optional[Collection[str]] = None,
+                 fields: Optional[Collection[str]] = None,
+                 intern: Union[bool, StringCache] = False):
+        """
+        :param fp: a file object
+        :param skip: levels and fields that are not materialized
+        :param fields: fields to materialize; all other fields are skipped
+        :param intern: if True, share equal infon keys and values through a
+        cache of this reader, or through the given StringCache
+        """
         self.fp = fp
         self.lineno = 0
+        self.skip = projection(skip, fields)
+        cache = string_cache(intern)
+        # fromJSON takes False, not None, to disable interning
+        self.__intern = cache if cache is not None else False
 
     def __iter__(self):
         return self
@@ -157,27 +256,37 @@ class BioCJsonIterReader:
         s = self.fp.readline()
         self.lineno += 1
         if s:
-            obj = json.loads(s)
+            obj = backend.loads(s)
             if 'bioctype' not in obj:
                 raise KeyError('%s:%s: Cannot find bioctype in the object: %s'
                                % (self.fp.name, self.lineno, s))
-            return fromJSON(obj)
+            return fromJSON(obj, skip=self.skip, intern=self.__intern)
         else:
             raise StopIteration
 
 
 @contextmanager
-def iterreader(source: Union[str, TextIO]) -> BioCJsonIterReader:
+def iterreader(source: Union[str, TextIO], *,
+               skip: Optional[Collection[str]] = None,
+               fields: Optional[Collection[str]] = None,
+               intern: Union[bool, StringCache] = False) \
+        -> BioCJsonIterReader:
     """
     Parse a jsonline into a BioC object incrementally.
 
     :param file: a filename or file object
+    :param skip: levels and fields that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param intern: if True, share equal infon keys and values through a
+    cache of this reader, or through the given StringCache
     :return: an iterator
     """
     if isinstance(source, io.TextIOBase):
-        reader = BioCJsonIterReader(source)
+        reader = BioCJsonIterReader(source, skip=skip, fields=fields,
+                                    intern=intern)
         yield reader
     else:
-        with open(source) as fp:
-            reader = BioCJsonIterReader(fp)
+        with open(source, encoding='utf8') as fp:
+            reader = BioCJsonIterReader(fp, skip=skip, fields=fields,
+                                        intern=intern)
             yield reader
@@ -4,8 +4,10 @@ BioC JSON encoder
 import io
 import json
 from contextlib import contextmanager
-from typing import Dict, Union, TextIO
+from json.encoder import encode_basestring_ascii as _encode_string
+from typing import Any, Callable, Dict, Iterator, Optional, Union, TextIO
 
+from bioc.biocjson import backend
 from bioc.datastructure import BioCPassage, BioCNode, BioCAnnotation, \
     BioCLocation, BioCRelation, \
     BioCSentence, BioCCollection, BioCDocument
@@ -16,89 +18,298 @@ BIOC_OBJ = Union[BioCCollection, BioCDocument, BioCPassage, BioCSentence]
 
 def dumps(obj: BIOC_OBJ, **kwargs) -> str:
     """
-    Serialize a BioC ``obj`` to a JSON formatted ``str``. kwargs are
-    passed to json.
+    Serialize a BioC ``obj`` to a JSON formatted ``str``. Without kwargs,
+    the JSON backend selected with ``backend.use`` writes the text, if any;
+    kwargs are passed to json.
     """
-    return json.dumps(obj, cls=BioCJSONEncoder, **kwargs)
+    if not kwargs:
+        writer = backend.writer()
+        if writer is not None and _encoder(type(obj)) is not None:
+            return writer.dumps(toJSON(obj))
+        emit = _lookup(_EMITTERS, type(obj))
+        if emit is not None:
+            return emit(obj)
+    if _encoder(type(obj)) is None:
+        return json.dumps(obj, cls=BioCJSONEncoder, **kwargs)
+    if isinstance(obj, BioCCollection) and _streamable(kwargs):
+        return ''.join(_iterencode_collection(obj, kwargs))
+    return json.dumps(toJSON(obj), **kwargs)
 
 
 def dump(obj: BIOC_OBJ, fp: TextIO, **kwargs):
     """
     Serialize ``obj`` as a JSON formatted stream to ``fp``
-    (a ``.write()``-supporting file-like object). kwargs are passed to json.
+    (a ``.write()``-supporting file-like object). Without kwargs, the JSON
+    backend selected with ``backend.use`` writes the text, if any; kwargs are
+    passed to json.
+    """
+    if not kwargs:
+        writer = backend.writer()
+        if writer is not None and _encoder(type(obj)) is not None:
+            fp.write(writer.dumps(toJSON(obj)))
+            return None
+    if _encoder(type(obj)) is None:
+        return json.dump(obj, fp, cls=BioCJSONEncoder, **kwargs)
+    if isinstance(obj, BioCCollection) and _streamable(kwargs):
+        for chunk in _iterencode_collection(obj, kwargs):
+            fp.write(chunk)
+        return None
+    return json.dump(toJSON(obj), fp, **kwargs)
+
+
+def _streamable(kwargs) -> bool:
+    """
+    :return: True if the output of a collection can be built one document
+    at a time, i.e., without indentation or a custom encoder class
     """
-    return json.dump(obj, fp, cls=BioCJSONEncoder, **kwargs)
+    return kwargs.get('indent') is None and 'cls' not in kwargs
+
+
+def _iterencode_collection(collection: BioCCollection, kwargs) \
+        -> Iterator[str]:
+    """
+    Encode a collection one document at a time, so the dicts of only one
+    document are alive at once. The output is the same as json.dumps of
+    toJSON(collection) with kwargs, which must not set indent. Without
+    kwargs, the JSON text of documents is emitted directly.
+    """
+    encoder = json.JSONEncoder(**kwargs)
+    item_separator, key_separator = kwargs.get('separators') or (', ', ': ')
+    info = _encode_collection_info(collection)
+    keys = sorted(info) if kwargs.get('sort_keys') else list(info)
+    for i, key in enumerate(keys):
+        yield ('{' if i == 0 else item_separator) + encoder.encode(key) \
+              + key_separator
+        if key != 'documents':
+            yield encoder.encode(info[key])
+            continue
+        yield '['
+        for k, document in enumerate(collection.documents):
+            if k:
+                yield item_separator
+            if kwargs:
+                yield encoder.encode(_encode_document(document))
+            else:
+                yield _emit_document(document)
+        yield ']'
+    yield '}'
+
+
+def _encode_location(o: BioCLocation) -> Dict:
+    return {
+        'offset': o.offset,
+        'length': o.length,
+    }
+
+
+def _encode_annotation(o: BioCAnnotation) -> Dict:
+    return {
+        'id': o.id,
+        'infons': o.infons,
+        'text': o.text,
+        'locations': [{'offset': l.offset, 'length': l.length}
+                      for l in o.locations],
+    }
+
+
+def _encode_node(o: BioCNode) -> Dict:
+    return {
+        'refid': o.refid,
+        'role': o.role,
+    }
+
+
+def _encode_relation(o: BioCRelation) -> Dict:
+    return {
+        'id': o.id,
+        'infons': o.infons,
+        'nodes': [{'refid': n.refid, 'role': n.role} for n in o.nodes]
+    }
+
+
+def _encode_sentence(o: BioCSentence) -> Dict:
+    return {
+        'bioctype': 'BioCSentence',
+        'offset': o.offset,
+        'infons': o.infons,
+        'text': o.text,
+        'annotations': [_encode_annotation(a) for a in o.annotations],
+        'relations': [_encode_relation(r) for r in o.relations],
+    }
+
+
+def _encode_passage(o: BioCPassage) -> Dict:
+    return {
+        'bioctype': 'BioCPassage',
+        'offset': o.offset,
+        'infons': o.infons,
+        'text': o.text,
+        'sentences': [_encode_sentence(s) for s in o.sentences],
+        'annotations': [_encode_annotation(a) for a in o.annotations],
+        'relations': [_encode_relation(r) for r in o.relations],
+    }
+
+
+def _encode_document(o: BioCDocument) -> Dict:
+    return {
+        'bioctype': 'BioCDocument',
+        'id': o.id,
+        'infons': o.infons,
+        'passages': [_encode_passage(p) for p in o.passages],
+        'annotations': [_encode_annotation(a) for a in o.annotations],
+        'relations': [_encode_relation(r) for r in o.relations],
+    }
+
+
+def _encode_collection_info(o: BioCCollection) -> Dict:
+    return {
+        'bioctype': 'BioCCollection',
+        'source': o.source,
+        'date': o.date,
+        'key': o.key,
+        'version': o.version,
+        'infons': o.infons,
+        'documents': [],
+    }
+
+
+def _encode_collection(o: BioCCollection) -> Dict:
+    obj = _encode_collection_info(o)
+    obj['documents'] = [_encode_document(d) for d in o.documents]
+    return obj
+
+
+# Emitters write the JSON text of BioC objects directly, the same as
+# json.dumps of their dicts with the default arguments.
+def _emit_value(v) -> str:
+    t = type(v)
+    if t is str:
+        return _encode_string(v)
+    if t is int:
+        return '%d' % v
+    return json.dumps(v)
+
+
+def _emit_infons(infons: Dict) -> str:
+    try:
+        return '{%s}' % ', '.join(['%s: %s' % (_encode_string(k),
+                                                _emit_value(v))
+                                   for k, v in infons.items()])
+    except TypeError:
+        # keys that are not strings
+        return json.dumps(infons)
+
+
+def _emit_annotation(o: BioCAnnotation) -> str:
+    return '{"id": %s, "infons": %s, "text": %s, "locations": [%s]}' % (
+        _emit_value(o.id), _emit_infons(o.infons), _emit_value(o.text),
+        ', '.join(['{"offset": %s, "length": %s}'
+                   % (_emit_value(l.offset), _emit_value(l.length))
+                   for l in o.locations]))
+
+
+def _emit_relation(o: BioCRelation) -> str:
+    return '{"id": %s, "infons": %s, "nodes": [%s]}' % (
+        _emit_value(o.id), _emit_infons(o.infons),
+        ', '.join(['{"refid": %s, "role": %s}'
+                   % (_emit_value(n.refid), _emit_value(n.role))
+                   for n in o.nodes]))
+
+
+def _emit_annotations(o) -> str:
+    return '"annotations": [%s], "relations": [%s]' % (
+        ', '.join([_emit_annotation(a) for a in o.annotations]),
+        ', '.join([_emit_relation(r) for r in o.relations]))
+
+
+def _emit_sentence(o: BioCSentence) -> str:
+    return '{"bioctype": "BioCSentence", "offset": %s, "infons": %s, ' \
+           '"text": %s, %s}' % (_emit_value(o.offset), _emit_infons(o.infons),
+                                _emit_value(o.text), _emit_annotations(o))
+
+
+def _emit_passage(o: BioCPassage) -> str:
+    return '{"bioctype": "BioCPassage", "offset": %s, "infons": %s, ' \
+           '"text": %s, "sentences": [%s], %s}' % (
+               _emit_value(o.offset), _emit_infons(o.infons),
+               _emit_value(o.text),
+               ', '.join([_emit_sentence(s) for s in o.sentences]),
+               _emit_annotations(o))
+
+
+def _emit_document(o: BioCDocument) -> str:
+    return '{"bioctype": "BioCDocument", "id": %s, "infons": %s, ' \
+           '"passages": [%s], %s}' % (
+               _emit_value(o.id), _emit_infons(o.infons),
+               ', '.join([_emit_passage(p) for p in o.passages]),
+               _emit_annotations(o))
+
+
+# the encoder of each BioC type. Subclasses, e.g., lazy documents, are added
+# to this table and _EMITTERS on first use.
+_ENCODERS = {
+    BioCLocation: _encode_location,
+    BioCAnnotation: _encode_annotation,
+    BioCNode: _encode_node,
+    BioCRelation: _encode_relation,
+    BioCSentence: _encode_sentence,
+    BioCPassage: _encode_passage,
+    BioCDocument: _encode_document,
+    BioCCollection: _encode_collection,
+}  # type: Dict[type, Callable[[Any], Dict]]
+
+
+def _emit_collection(o: BioCCollection) -> str:
+    return ''.join(_iterencode_collection(o, {}))
+
+
+_EMITTERS = {
+    BioCAnnotation: _emit_annotation,
+    BioCRelation: _emit_relation,
+    BioCSentence: _emit_sentence,
+    BioCPassage: _emit_passage,
+    BioCDocument: _emit_document,
+    BioCCollection: _emit_collection,
+}  # type: Dict[type, Callable[[Any], str]]
+
+
+def _lookup(table: Dict[type, Callable], cls: type) -> Optional[Callable]:
+    """
+    :return: the function of the BioC type in the table, or None if cls is
+    not a BioC type
+    """
+    try:
+        return table[cls]
+    except KeyError:
+        pass
+    for base in cls.__mro__[1:]:
+        if base in table:
+            table[cls] = table[base]
+            return table[cls]
+    return None
+
+
+def _encoder(cls: type) -> Optional[Callable[[Any], Dict]]:
+    """
+    :return: the encoder of the BioC type, or None if cls is not a BioC type
+    """
+    return _lookup(_ENCODERS, cls)
 
 
 class BioCJSONEncoder(json.JSONEncoder):
     """
     Extensible BioC JSON encoder for BioC data structures.
+
+    BioC objects are converted to dicts in one pass by the encoder of their
+    type; nested BioC objects do not go through ``default`` again.
     """
 
     def default(self, o):
-        if isinstance(o, BioCLocation):
-            return {
-                'offset': o.offset,
-                'length': o.length,
-            }
-        if isinstance(o, BioCAnnotation):
-            return {
-                'id': o.id,
-                'infons': o.infons,
-                'text': o.text,
-                'locations': [self.default(l) for l in o.locations],
-            }
-        if isinstance(o, BioCNode):
-            return {
-                'refid': o.refid,
-                'role': o.role,
-            }
-        if isinstance(o, BioCRelation):
-            return {
-                'id': o.id,
-                'infons': o.infons,
-                'nodes': [self.default(n) for n in o.nodes]
-            }
-        if isinstance(o, BioCSentence):
-            return {
-                'bioctype': 'BioCSentence',
-                'offset': o.offset,
-                'infons': o.infons,
-                'text': o.text,
-                'annotations': [self.default(a) for a in o.annotations],
-                'relations': [self.default(r) for r in o.relations],
-            }
-        if isinstance(o, BioCPassage):
-            return {
-                'bioctype': 'BioCPassage',
-                'offset': o.offset,
-                'infons': o.infons,
-                'text': o.text,
-                'sentences': [self.default(s) for s in o.sentences],
-                'annotations': [self.default(a) for a in o.annotations],
-                'relations': [self.default(r) for r in o.relations],
-            }
-        if isinstance(o, BioCDocument):
-            return {
-                'bioctype': 'BioCDocument',
-                'id': o.id,
-                'infons': o.infons,
-                'passages': [self.default(p) for p in o.passages],
-                'annotations': [self.default(a) for a in o.annotations],
-                'relations': [self.default(r) for r in o.relations],
-            }
-        if isinstance(o, BioCCollection):
-            return {
-                'bioctype': 'BioCCollection',
-                'source': o.source,
-                'date': o.date,
-                'key': o.key,
-                'version': o.version,
-                'infons': o.infons,
-                'documents': [self.default(d) for d in o.documents],
-            }
-        # Let the base class default method raise the TypeError
-        return json.JSONEncoder.default(self, o)
+        encode = _encoder(type(o))
+        if encode is None:
+            # Let the base class default method raise the TypeError
+            return json.JSONEncoder.default(self, o)
+        return encode(o)
 
 
 class BioCJsonIterWriter:
@@ -114,7 +325,7 @@ class BioCJsonIterWriter:
         Encode and write a BioC obj (an instance of BioCDocument,
         BioCPassage, or BioCSentence).
         """
-        self.fp.write(json.dumps(BioCJSONEncoder().default(obj)) + '\n')
+        self.fp.write(dumps(obj) + '\n')
 
 
 @contextmanager
@@ -126,7 +337,7 @@ def iterwriter(file: Union[str, TextIO]) -> BioCJsonIterWriter:
         writer = BioCJsonIterWriter(file)
         yield writer
     else:
-        with open(file, 'w') as fp:
+        with open(file, 'w', encoding='utf8') as fp:
             writer = BioCJsonIterWriter(fp)
             yield writer
 
@@ -136,4 +347,7 @@ def toJSON(o) -> Dict:
     Convert a BioC obj (an instance of BioCDocument, BioCPassage, or BioCSentence)
     to a Python `dict`
     """
-    return BioCJSONEncoder().default(o)
+    encode = _encoder(type(o))
+    if encode is None:
+        return BioCJSONEncoder().default(o)
+    return encode(o)
@@ -0,0 +1,363 @@
+"""
+Query annotations and relations with filters pushed down into the traversal
+and the readers.
+
+    query(collection).annotations(type='Gene', level=PASSAGE) \\
+        .where(infon('identifier') != None)
+
+Filters are applied to each annotation before a result is created, and
+passages and sentences outside an offset range are not visited. When the
+source is the name of a BioC XML or jsonlines file, documents that cannot
+match are skipped before they are parsed, and levels and fields that the
+query does not need are not decoded. Like the document scanner, the byte
+filter assumes an ASCII-compatible encoding and that infon values are not
+wrapped in CDATA sections.
+"""
+import json
+import mmap
+import os
+from typing import Callable, Collection, FrozenSet, Iterable, Iterator, \
+    Optional, Tuple, Union
+
+from bioc.biocitertools import BioCResult, _iter_results, _relation_result
+from bioc.biocjson import backend
+from bioc.biocjson.decoder import fromJSON, load as load_json
+from bioc.biocxml.decoder import BioCXMLDecoder
+from bioc.biocxml.scanner import iter_document_spans, document_id, parse_span
+from bioc.constants import DOCUMENT, PASSAGE, SENTENCE
+from bioc.datastructure import BioCCollection, BioCDocument, BioCPassage, \
+    BioCSentence
+from bioc.utils import file_format
+
+# printable ASCII characters that may be escaped when a value is written to
+# XML or JSON
+_ESCAPED_CHARS = frozenset('&<>"\'\\')
+
+
+def _literal(value: str) -> bool:
+    """
+    :return: True if the value is written verbatim, without escapes, to BioC
+    XML and JSON files
+    """
+    return all(' ' <= c <= '~' and c not in _ESCAPED_CHARS for c in value)
+
+
+class Predicate:
+    """
+    A filter on annotations or relations. Predicates can be combined with
+    ``&``, ``|``, and ``~``.
+    """
+    __slots__ = ('func', 'required')
+
+    def __init__(self, func: Callable[[object], bool],
+                 required: Collection[str] = ()):
+        """
+        :param func: returns True if the annotation or relation matches
+        :param required: infon values that every document with a match has
+        """
+        self.func = func
+        self.required = frozenset(required)  # type: FrozenSet[str]
+
+    def __call__(self, obj) -> bool:
+        return self.func(obj)
+
+    def __and__(self, other) -> 'Predicate':
+        other = _predicate(other)
+        return Predicate(lambda obj: self.func(obj) and other.func(obj),
+                         self.required | other.required)
+
+    def __or__(self, other) -> 'Predicate':
+        other = _predicate(other)
+        return Predicate(lambda obj: self.func(obj) or other.func(obj),
+                         self.required & other.required)
+
+    def __invert__(self) -> 'Predicate':
+        return Predicate(lambda obj: not self.func(obj))
+
+
+def _predicate(obj) -> Predicate:
+    if isinstance(obj, Predicate):
+        return obj
+    if callable(obj):
+        return Predicate(obj)
+    raise TypeError('Object of type %s must be Predicate or a callable'
+                    % obj.__class__.__name__)
+
+
+class InfonField:
+    """
+    An infon of annotations or relations, to build predicates with ``==``,
+    ``!=``, and ``isin``. Comparing with None tests if the infon is missing.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __eq__(self, value) -> Predicate:
+        key = self.key
+        if value is None:
+            return Predicate(lambda obj: key not in obj.infons)
+        required = (value, ) if isinstance(value, str) and _literal(value) \
+            else ()
+        return Predicate(lambda obj: obj.infons.get(key) == value, required)
+
+    def __ne__(self, value) -> Predicate:
+        key = self.key
+        if value is None:
+            return Predicate(lambda obj: key in obj.infons)
+        return Predicate(lambda obj: key in obj.infons
+                         and obj.infons[key] != value)
+
+    def isin(self, values: Collection) -> Predicate:
+        """
+        :return: a predicate that matches if the infon is one of the values
+        """
+        key = self.key
+        values = frozenset(values)
+        return Predicate(lambda obj: obj.infons.get(key) in values)
+
+    __hash__ = None
+
+
+def infon(key: str) -> InfonField:
+    """
+    :return: the infon to build a predicate, e.g.,
+    ``infon('identifier') != None``
+    """
+    return InfonField(key)
+
+
+def _total_span(obj) -> Optional[Tuple[int, int]]:
+    if not obj.locations:
+        return None
+    start = min(loc.offset for loc in obj.locations)
+    end = max(loc.offset + loc.length for loc in obj.locations)
+    return start, end
+
+
+def _overlaps(start: int, end: int) -> Predicate:
+    """
+    :return: a predicate that matches annotations whose total span overlaps
+    [start, end). Zero-length annotations match if they are in [start, end).
+    """
+    def func(ann):
+        span = _total_span(ann)
+        if span is None:
+            return False
+        if span[0] == span[1]:
+            return start <= span[0] < end
+        return span[0] < end and span[1] > start
+    return Predicate(func)
+
+
+def _within(start: int, end: int) -> Callable:
+    """
+    :return: a function that returns False for passages and sentences whose
+    text lies outside [start, end)
+    """
+    def func(obj):
+        if not obj.text:
+            return True
+        # a zero-length annotation can sit right after the text
+        return obj.offset < end and obj.offset + len(obj.text) >= start
+    return func
+
+
+class BioCQuery:
+    """
+    A query over a BioC collection, document, reader, or file. Queries are
+    immutable: each method returns a new query.
+    """
+
+    def __init__(self, source, *,
+                 format: str = None):  # pylint: disable=redefined-builtin
+        """
+        :param source: BioCCollection, BioCDocument, BioCPassage,
+        BioCSentence, an iterable of them (e.g., a reader), or the name of a
+        BioC XML, JSON, or jsonlines file
+        :param format: 'xml', 'json', or 'jsonl' if source is a file name.
+        Defaults to 'jsonl' for files ending in .jsonl or .jsonlines, 'json'
+        for files ending in .json, and 'xml' otherwise
+        """
+        fmt = format
+        if isinstance(source, (str, os.PathLike)):
+            source = os.fspath(source)
+            if fmt is None:
+                fmt = file_format(source)
+            if fmt not in ('xml', 'json', 'jsonl'):
+                raise ValueError('Unknown format: %s' % fmt)
+        self.source = source
+        self.format = fmt
+        self.field = 'annotations'
+        self.level = (DOCUMENT, PASSAGE, SENTENCE)  # type: Tuple[int, ...]
+        self.docid = None  # type: Optional[str]
+        self.predicate = None  # type: Optional[Predicate]
+        self.span = None  # type: Optional[Tuple[int, int]]
+
+    def __copy(self, **kwargs) -> 'BioCQuery':
+        selected = BioCQuery.__new__(BioCQuery)
+        selected.__dict__.update(self.__dict__)
+        selected.__dict__.update(kwargs)
+        return selected
+
+    def __select(self, field: str, type_: Optional[str],
+                 level: Union[int, Collection[int]],
+                 docid: Optional[str]) -> 'BioCQuery':
+        if isinstance(level, int):
+            level = (level, )
+        selected = self.__copy(field=field, level=tuple(level),
+                               docid=docid, predicate=None, span=None)
+        if type_ is not None:
+            selected = selected.where(infon('type') == type_)
+        return selected
+
+    def annotations(self,
+                    type: str = None,  # pylint: disable=redefined-builtin
+                    *,
+                    level: Union[int, Collection[int]] = (DOCUMENT, PASSAGE,
+                                                          SENTENCE),
+                    start: int = None, end: int = None,
+                    docid: str = None) -> 'BioCQuery':
+        """
+        Select annotations.
+
+        :param type: the type infon of annotations. If None, all types
+        :param level: DOCUMENT, PASSAGE, SENTENCE
+        :param start: the start of the range. If None, 0
+        :param end: the end of the range (exclusive). If None, unbounded
+        :param docid: document id. If None, all documents
+        :return: a query for the annotations whose total span overlaps
+        [start, end)
+        """
+        selected = self.__select('annotations', type, level, docid)
+        if start is not None or end is not None:
+            span = (0 if start is None else start,
+                    float('inf') if end is None else end)
+            selected = selected.where(_overlaps(*span))
+            selected.span = span
+        return selected
+
+    def relations(self,
+                  type: str = None,  # pylint: disable=redefined-builtin
+                  *,
+                  level: Union[int, Collection[int]] = (DOCUMENT, PASSAGE,
+                                                        SENTENCE),
+                  docid: str = None) -> 'BioCQuery':
+        """
+        Select relations.
+
+        :param type: the type infon of relations. If None, all types
+        :param level: DOCUMENT, PASSAGE, SENTENCE
+        :param docid: document id. If None, all documents
+        :return: a query for the relations
+        """
+        return self.__select('relations', type, level, docid)
+
+    def where(self, predicate: Union[Predicate, Callable]) -> 'BioCQuery':
+        """
+        :param predicate: a Predicate, e.g., ``infon('identifier') != None``,
+        or a function that takes an annotation or relation and returns True
+        if it matches
+        :return: a query for the annotations or relations that also match
+        the predicate
+        """
+        predicate = _predicate(predicate)
+        if self.predicate is not None:
+            predicate = self.predicate & predicate
+        return self.__copy(predicate=predicate)
+
+    def __iter__(self) -> Iterator[BioCResult]:
+        make = BioCResult if self.field == 'annotations' else _relation_result
+        within = None if self.span is None else _within(*self.span)
+        for obj in self.__sources():
+            if self.docid is not None and isinstance(obj, BioCDocument) \
+                    and obj.id != self.docid:
+                continue
+            yield from _iter_results(obj, self.docid, self.level, self.field,
+                                     make, self.predicate, within)
+
+    def count(self) -> int:
+        """
+        :return: the number of matching annotations or relations
+        """
+        return sum(1 for _ in self)
+
+    def __sources(self) -> Iterable:
+        if self.format == 'xml':
+            return self.__read_xml()
+        if self.format == 'jsonl':
+            return self.__read_json()
+        if self.format == 'json':
+            # a BioC JSON file is one object, so it is decoded as a whole
+            with open(self.source, encoding='utf8') as fp:
+                return load_json(fp, skip=self.__skip()).documents
+        if isinstance(self.source, (BioCCollection, BioCDocument, BioCPassage,
+                                    BioCSentence)):
+            return (self.source, )
+        return self.source
+
+    def __skip(self) -> FrozenSet[str]:
+        """
+        :return: the levels and fields that the readers need not decode
+        """
+        skip = {'relations' if self.field == 'annotations' else 'annotations'}
+        if SENTENCE not in self.level:
+            skip.add('sentences')
+            if PASSAGE not in self.level:
+                skip.add('passages')
+        return frozenset(skip)
+
+    def __required(self) -> FrozenSet[str]:
+        """
+        :return: the infon values that every document with a match has
+        """
+        return frozenset() if self.predicate is None \
+            else self.predicate.required
+
+    def __read_xml(self) -> Iterator[BioCDocument]:
+        decoder = BioCXMLDecoder(skip=self.__skip())
+        # an infon value is the text of an <infon> element
+        required = [b'>%s</infon>' % s.encode('ascii')
+                    for s in self.__required()]
+        with open(self.source, 'rb') as fp, \
+                mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            for offset, length in iter_document_spans(buf):
+                end = offset + length
+                if any(buf.find(s, offset, end) < 0 for s in required):
+                    continue
+                if self.docid is not None \
+                        and document_id(buf, offset, length) != self.docid:
+                    continue
+                yield decoder.decode_document(parse_span(buf, offset,
+                                                         length))
+
+    def __read_json(self) -> Iterator:
+        skip = self.__skip()
+        # an infon value is a JSON string that follows a key
+        required = [(':"%s"' % s, ': "%s"' % s) for s in self.__required()]
+        docid = None
+        if self.docid is not None and _literal(self.docid):
+            docid = json.dumps(self.docid)
+        with open(self.source, encoding='utf8') as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+                if not all(a in line or b in line for a, b in required):
+                    continue
+                if docid is not None and docid not in line:
+                    continue
+                yield fromJSON(backend.loads(line), skip=skip)
+
+
+def query(source, *,
+          format: str = None) -> BioCQuery:  # pylint: disable=redefined-builtin
+    """
+    Start a query over a BioC collection, document, reader, or file.
+
+    :param source: BioCCollection, BioCDocument, BioCPassage, BioCSentence,
+    an iterable of them (e.g., a reader), or the name of a BioC XML, JSON,
+    or jsonlines file
+    :param format: 'xml', 'json', or 'jsonl' if source is a file name
+    :return: the query
+    """
+    return BioCQuery(source, format=format)
@@ -1,25 +1,41 @@
 """
 BioC XML encoder and decoder
 """
-from typing import TextIO, Union, BinaryIO
+from typing import TextIO, Union, BinaryIO, Optional, Collection
 from contextlib import contextmanager
 
-from .decoder import BioCXMLDocumentReader
+from .decoder import BioCXMLDocumentReader, BioCXMLLazyDocument, \
+    BioCXMLMmapReader
 from .decoder import load, loads
-from .encoder import BioCXMLDocumentWriter
+from .encoder import BioCXMLDocumentWriter, _DEFAULT_FLUSH_EVERY
 from .encoder import dump, dumps
+from .index import BioCXMLIndexedReader, build_index
+from ..utils import StringCache
 
 __all__ = ['load', 'loads', 'dump', 'dumps', 'iterparse']
 
 
 @contextmanager
-def iterparse(source: Union[str, BinaryIO]):
-    reader = BioCXMLDocumentReader(source)
-    yield reader
+def iterparse(source: Union[str, BinaryIO], *, track_memory: bool = False,
+              skip: Optional[Collection[str]] = None,
+              fields: Optional[Collection[str]] = None,
+              lazy: bool = False,
+              intern: Union[bool, StringCache] = False):
+    reader = BioCXMLDocumentReader(source, track_memory=track_memory,
+                                   skip=skip, fields=fields, lazy=lazy,
+                                   intern=intern)
+    try:
+        yield reader
+    finally:
+        reader.close()
 
 
 @contextmanager
-def iterwrite(file, encoding='utf8', standalone=True):
-    writer = BioCXMLDocumentWriter(file, encoding, standalone)
+def iterwrite(file, encoding='utf8', standalone=True, *,
+              flush_every: Optional[int] = _DEFAULT_FLUSH_EVERY,
+              flush_bytes: Optional[int] = None):
+    writer = BioCXMLDocumentWriter(file, encoding, standalone,
+                                   flush_every=flush_every,
+                                   flush_bytes=flush_bytes)
     yield writer
     writer.close()
@@ -1,14 +1,26 @@
 """
 BioC XML decoder
 """
-import io
-from typing import TextIO, Union, BinaryIO
+import mmap
+import os
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import TextIO, Union, BinaryIO, Optional, Collection, List, \
+    Tuple
 
 from lxml import etree
 
 from bioc.datastructure import BioCCollection, BioCDocument, BioCPassage, \
     BioCSentence, BioCAnnotation, \
     BioCRelation, BioCLocation, BioCNode
+from bioc.biocxml.scanner import iter_document_spans, collection_header, \
+    parse_span
+from bioc.utils import projection, string_cache, StringCache
+
+
+def _identity(s):
+    return s
 
 
 class BioCXMLDecoder:
@@ -16,15 +28,37 @@ class BioCXMLDecoder:
     Reader for the BioC XML format.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, *, skip: Optional[Collection[str]] = None,
+                 fields: Optional[Collection[str]] = None,
+                 lazy: bool = False,
+                 intern: Union[bool, StringCache] = False):
+        """
+        :param skip: levels (passages, sentences) and fields (infons, text,
+        annotations, relations) that are not materialized
+        :param fields: fields to materialize; all other fields are skipped
+        :param lazy: if True, documents are decoded from their XML elements
+        on first access
+        :param intern: if True, equal infon keys and values and node roles
+        share one string object. A StringCache can be passed to share the
+        cache with other decoders
+        """
+        self.skip = projection(skip, fields)
+        self.lazy = lazy
+        cache = string_cache(intern)
+        self.__intern = cache if cache is not None else _identity
+        self.__passages = 'passages' not in self.skip
+        self.__sentences = 'sentences' not in self.skip
+        self.__infons = 'infons' not in self.skip
+        self.__text = 'text' not in self.skip
+        self.__annotations = 'annotations' not in self.skip
+        self.__relations = 'relations' not in self.skip
 
     def decodes(self, s: str) -> BioCCollection:
         """
         Deserialize ``s`` (a ``str`` instance containing a BioC collection)
         to a BioC collection object.
         """
-        tree = etree.parse(io.BytesIO(bytes(s, encoding='UTF-8')))
+        tree = etree.fromstring(s.encode('UTF-8')).getroottree()
         collection = self.__parse_collection(tree.getroot())
         collection.encoding = tree.docinfo.encoding
         collection.standalone = tree.docinfo.standalone
@@ -44,94 +78,341 @@ class BioCXMLDecoder:
         collection.version = tree.docinfo.xml_version
         return collection
 
-    def __parse_collection(self, tree):
+    def decode_document(self, tree) -> BioCDocument:
+        """
+        Deserialize a parsed ``<document>`` element to a BioC document object.
+        """
+        if self.lazy:
+            return BioCXMLLazyDocument(tree, self)
+        return self.__parse_document(tree)
+
+    def decode_document_field(self, tree, name: str):
+        """
+        Deserialize one field (infons, passages, annotations, or relations)
+        of a parsed ``<document>`` element.
+        """
+        if name == 'infons':
+            if not self.__infons:
+                return {}
+            infons = {}
+            for child in tree.iterchildren('infon'):
+                self.__add_infon(infons, child)
+            return infons
+        elif name == 'passages':
+            if not self.__passages:
+                return []
+            return [self.__parse_passage(child)
+                    for child in tree.iterchildren('passage')]
+        elif name == 'annotations':
+            if not self.__annotations:
+                return []
+            return [self.__parse_annotation(child)
+                    for child in tree.iterchildren('annotation')]
+        elif name == 'relations':
+            if not self.__relations:
+                return []
+            return [self.__parse_relation(child)
+                    for child in tree.iterchildren('relation')]
+        raise KeyError('%s: Cannot decode document field' % name)
+
+    def decode_collection_info(self, tree) -> BioCCollection:
+        """
+        Deserialize the information of a parsed ``<collection>`` element
+        (source, date, key, infons) to a BioC collection object without
+        documents.
+        """
+        return self.__parse_collection(tree, documents=False)
+
+    def __add_infon(self, infons, elem):
+        infons[self.__intern(elem.get('key'))] = self.__intern(elem.text)
+
+    def __parse_collection(self, tree, documents: bool = True):
         collection = BioCCollection()
-        collection.source = tree.findtext('source')
-        collection.date = tree.findtext('date')
-        collection.key = tree.findtext('key')
-        collection.infons = self.__parse_infons(tree)
-        for child in tree.findall('document'):
-            collection.add_document(self.__parse_document(child))
+        collection.source = None
+        collection.date = None
+        collection.key = None
+        for child in tree:
+            tag = child.tag
+            if tag == 'document':
+                if documents:
+                    collection.add_document(self.decode_document(child))
+            elif tag == 'infon':
+                self.__add_infon(collection.infons, child)
+            elif tag == 'source':
+                collection.source = child.text or ''
+            elif tag == 'date':
+                collection.date = child.text or ''
+            elif tag == 'key':
+                collection.key = child.text or ''
         return collection
 
     def __parse_document(self, tree):
         document = BioCDocument()
-        document.id = tree.findtext('id')
-        document.infons = self.__parse_infons(tree)
-        for child in tree.findall('passage'):
-            document.add_passage(self.__parse_passage(child))
-        for child in tree.findall('annotation'):
-            document.add_annotation(self.__parse_annotation(child))
-        for child in tree.findall('relation'):
-            document.add_relation(self.__parse_relation(child))
+        document.id = None
+        for child in tree:
+            tag = child.tag
+            if tag == 'passage':
+                if self.__passages:
+                    document.add_passage(self.__parse_passage(child))
+            elif tag == 'annotation':
+                if self.__annotations:
+                    document.add_annotation(self.__parse_annotation(child))
+            elif tag == 'relation':
+                if self.__relations:
+                    document.add_relation(self.__parse_relation(child))
+            elif tag == 'infon':
+                if self.__infons:
+                    self.__add_infon(document.infons, child)
+            elif tag == 'id':
+                document.id = child.text or ''
         return document
 
     def __parse_passage(self, tree):
         passage = BioCPassage()
-        passage.offset = int(tree.findtext('offset'))
-        passage.infons = self.__parse_infons(tree)
-        if tree.find('text') is not None:
-            passage.text = tree.findtext('text')
-        for child in tree.findall('sentence'):
-            passage.add_sentence(self.__parse_sentence(child))
-        for child in tree.findall('annotation'):
-            passage.add_annotation(self.__parse_annotation(child))
-        for child in tree.findall('relation'):
-            passage.add_relation(self.__parse_relation(child))
+        for child in tree:
+            tag = child.tag
+            if tag == 'annotation':
+                if self.__annotations:
+                    passage.add_annotation(self.__parse_annotation(child))
+            elif tag == 'sentence':
+                if self.__sentences:
+                    passage.add_sentence(self.__parse_sentence(child))
+            elif tag == 'relation':
+                if self.__relations:
+                    passage.add_relation(self.__parse_relation(child))
+            elif tag == 'infon':
+                if self.__infons:
+                    self.__add_infon(passage.infons, child)
+            elif tag == 'offset':
+                passage.offset = int(child.text)
+            elif tag == 'text':
+                if self.__text:
+                    passage.text = child.text or ''
         return passage
 
     def __parse_sentence(self, tree):
         sentence = BioCSentence()
-        sentence.offset = int(tree.findtext('offset'))
-        sentence.text = tree.findtext('text')
-        sentence.infons = self.__parse_infons(tree)
-        for child in tree.findall('annotation'):
-            sentence.add_annotation(self.__parse_annotation(child))
-        for child in tree.findall('relation'):
-            sentence.add_relation(self.__parse_relation(child))
+        sentence.text = None
+        for child in tree:
+            tag = child.tag
+            if tag == 'annotation':
+                if self.__annotations:
+                    sentence.add_annotation(self.__parse_annotation(child))
+            elif tag == 'relation':
+                if self.__relations:
+                    sentence.add_relation(self.__parse_relation(child))
+            elif tag == 'infon':
+                if self.__infons:
+                    self.__add_infon(sentence.infons, child)
+            elif tag == 'offset':
+                sentence.offset = int(child.text)
+            elif tag == 'text':
+                if self.__text:
+                    sentence.text = child.text or ''
         return sentence
 
     def __parse_annotation(self, tree):
         annotation = BioCAnnotation()
         annotation.id = tree.attrib['id']
-        annotation.infons = self.__parse_infons(tree)
-        annotation.text = tree.findtext('text')
-        for child in tree.findall('location'):
-            annotation.add_location(BioCLocation(int(child.attrib['offset']),
-                                                 int(child.attrib['length'])))
+        annotation.text = None
+        for child in tree:
+            tag = child.tag
+            if tag == 'location':
+                attrib = child.attrib
+                annotation.add_location(BioCLocation(int(attrib['offset']),
+                                                     int(attrib['length'])))
+            elif tag == 'infon':
+                self.__add_infon(annotation.infons, child)
+            elif tag == 'text':
+                annotation.text = child.text or ''
         return annotation
 
     def __parse_relation(self, tree):
         relation = BioCRelation()
         if 'id' in tree.attrib:
             relation.id = tree.attrib['id']
-        relation.infons = self.__parse_infons(tree)
-        for child in tree.findall('node'):
-            relation.add_node(BioCNode(child.attrib['refid'],
-                                       child.attrib['role']))
+        for child in tree:
+            tag = child.tag
+            if tag == 'node':
+                attrib = child.attrib
+                relation.add_node(BioCNode(attrib['refid'],
+                                           self.__intern(attrib['role'])))
+            elif tag == 'infon':
+                self.__add_infon(relation.infons, child)
         return relation
 
-    @classmethod
-    def __parse_infons(cls, tree):
-        return {child.attrib['key']: child.text
-                for child in tree.findall('infon')}
+
+class _LazyField:
+    """
+    A field of BioCXMLLazyDocument that is decoded on first access.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            return obj.materialize(self.name)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+class BioCXMLLazyDocument(BioCDocument):
+    """
+    A BioC document backed by its parsed ``<document>`` element.
+
+    The id is decoded immediately. Infons, passages, annotations, and
+    relations are decoded on first access and then cached. The element is
+    released once all of them have been decoded.
+    """
+    _LAZY_FIELDS = ('infons', 'passages', 'annotations', 'relations')
+
+    infons = _LazyField('infons')
+    passages = _LazyField('passages')
+    annotations = _LazyField('annotations')
+    relations = _LazyField('relations')
+
+    def __init__(self, tree, decoder: BioCXMLDecoder):
+        super(BioCXMLLazyDocument, self).__init__()
+        for name in self._LAZY_FIELDS:
+            del self.__dict__[name]
+        self.id = tree.findtext('id')
+        self.__tree = tree
+        self.__decoder = decoder
+
+    def materialize(self, name: str = None):
+        """
+        Decode one field, or all fields if name is None, from the element.
+
+        :return: the decoded field if name is not None
+        """
+        if name is None:
+            for field in self._LAZY_FIELDS:
+                getattr(self, field)
+            return None
+        value = self.__decoder.decode_document_field(self.__tree, name)
+        self.__dict__[name] = value
+        if all(field in self.__dict__ for field in self._LAZY_FIELDS):
+            self.__tree = None
+            self.__decoder = None
+        return value
+
+    def __getstate__(self):
+        self.materialize()
+        slots = {name: getattr(self, name) for name in BioCDocument.__slots__
+                 if name not in self._LAZY_FIELDS}
+        return self.__dict__, slots
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Set the peak resident set size of this process to the current one. Only
+    Linux allows this, through /proc/self/clear_refs.
+
+    :return: True if the peak was reset
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as fp:
+            fp.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss() -> Optional[int]:
+    """
+    :return: the peak resident set size of this process in bytes, or None if
+    it is not available on this platform
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as fp:
+            for line in fp:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
 
 
 class BioCXMLDocumentReader:
     """
     Reader for the BioC XML format, one document per iteration.
+
+    Only the end events of ``<document>`` and ``<collection>`` are
+    reported by the parser; each document is decoded from its finished
+    element in one pass. The reader works in constant memory: once a
+    document has been read, its XML subtree and all preceding siblings are
+    released.
     """
 
-    def __init__(self, source: Union[str, BinaryIO]):
+    def __init__(self, source: Union[str, BinaryIO], *,
+                 track_memory: bool = False,
+                 skip: Optional[Collection[str]] = None,
+                 fields: Optional[Collection[str]] = None,
+                 lazy: bool = False,
+                 intern: Union[bool, StringCache] = False):
+        """
+        :param source: a filename or a binary file object
+        :param track_memory: if True, record in ``peak_rss`` the peak
+        resident set size, and in ``peak_memory`` the peak size of the
+        memory blocks traced by tracemalloc, while each document is read.
+        Tracing is started if it is not running, and stopped after the last
+        document or by ``close``
+        :param skip: levels and fields that are not materialized
+        :param fields: fields to materialize; all other fields are skipped
+        :param lazy: if True, return BioCXMLLazyDocument objects
+        :param intern: if True, share equal infon keys and values through a
+        cache of this reader, or through the given StringCache
+        """
         # if not isinstance(file, str):
         #     file = str(file)
         self.file = source
-        self.__context = iter(etree.iterparse(self.file,
-                                              events=('start', 'end')))
-        self.__state = 0
-        self.__event = None
-        self.__elem = None
-        self.__read()
+        self.track_memory = track_memory
+        self.peak_rss = None  # type: Optional[int]
+        self.peak_memory = None  # type: Optional[int]
+        # the reader only resets and stops tracing that it started
+        self.__tracing = track_memory and not tracemalloc.is_tracing()
+        if self.__tracing:
+            tracemalloc.start()
+        self.__decoder = BioCXMLDecoder(skip=skip, fields=fields, lazy=lazy,
+                                        intern=intern)
+        self.__context = etree.iterparse(self.file, events=('end',),
+                                         tag=('document', 'collection'))
+        self.__collection = None  # type: Optional[BioCCollection]
+        self.__document = None  # type: Optional[BioCDocument]
+        # the peaks while the next document was read
+        self.__peaks = None, None
+        try:
+            self.__read()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stop reading, and stop the tracing started by this reader.
+        """
+        self.__document = None
+        if self.__tracing:
+            tracemalloc.stop()
+            self.__tracing = False
 
     def __iter__(self):
         return self
@@ -146,143 +427,56 @@ class BioCXMLDocumentReader:
             raise StopIteration
         else:
             document = self.__document
+            self.peak_rss, self.peak_memory = self.__peaks
             self.__read()
             return document
 
+    def __reset_peaks(self):
+        _reset_peak_rss()
+        if not self.__tracing:
+            return
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            # Python < 3.9; clearing the traces also resets the peak
+            tracemalloc.clear_traces()
+
     def __read(self):
-        while self.__has_next():
-            event, elem = self.__next_event()
-            if self.__state == 0:
-                if event == 'start':
-                    if elem.tag == 'collection':
-                        self.__state = 1
-                        self.__collection = BioCCollection()
-                        # collection information
-            elif self.__state == 1:
-                if event == 'start':
-                    if elem.tag == 'document':
-                        self.__document = BioCDocument()
-                        self.__state = 2
-                elif event == 'end':
-                    if elem.tag == 'source':
-                        self.__collection.source = elem.text
-                    elif elem.tag == 'date':
-                        self.__collection.date = elem.text
-                    elif elem.tag == 'key':
-                        self.__collection.key = elem.text
-                    elif elem.tag == 'infon':
-                        self.__collection.infons[elem.get('key')] = elem.text
-                    elif elem.tag == 'collection':
-                        self.__state = 0
-                        self.__document = None
-                        self.__passage = None
-                        self.__sentence = None
-            elif self.__state == 2:
-                if event == 'start':
-                    if elem.tag == 'passage':
-                        self.__passage = BioCPassage()
-                        self.__state = 3
-                    elif elem.tag == 'annotation':
-                        self.__document.add_annotation(
-                            self.__read_annotation(elem))
-                    elif elem.tag == 'relation':
-                        self.__document.add_relation(
-                            self.__read_relation(elem))
-                elif event == 'end':
-                    if elem.tag == 'id':
-                        self.__document.id = elem.text
-                    elif elem.tag == 'infon':
-                        self.__document.infons[elem.get('key')] = elem.text
-                    elif elem.tag == 'document':
-                        self.__state = 1
-                        return
-            elif self.__state == 3:
-                if event == 'start':
-                    if elem.tag == 'sentence':
-                        self.__sentence = BioCSentence()
-                        self.__state = 4
-                    elif elem.tag == 'annotation':
-                        self.__passage.add_annotation(
-                            self.__read_annotation(elem))
-                    elif elem.tag == 'relation':
-                        self.__passage.add_relation(self.__read_relation(elem))
-                elif event == 'end':
-                    if elem.tag == 'offset':
-                        self.__passage.offset = int(elem.text)
-                    elif elem.tag == 'text':
-                        self.__passage.text = elem.text
-                    elif elem.tag == 'infon':
-                        self.__passage.infons[elem.get('key')] = elem.text
-                    elif elem.tag == 'passage':
-                        self.__state = 2
-                        if self.__passage is not None:
-                            self.__document.add_passage(self.__passage)
-            elif self.__state == 4:
-                if event == 'start':
-                    if elem.tag == 'annotation':
-                        self.__sentence.add_annotation(
-                            self.__read_annotation(elem))
-                    elif elem.tag == 'relation':
-                        self.__sentence.add_relation(
-                            self.__read_relation(elem))
-                elif event == 'end':
-                    if elem.tag == 'offset':
-                        self.__sentence.offset = int(elem.text)
-                    elif elem.tag == 'text':
-                        self.__sentence.text = elem.text
-                    elif elem.tag == 'infon':
-                        self.__sentence.infons[elem.get('key')] = elem.text
-                    elif elem.tag == 'sentence':
-                        self.__state = 3
-                        if self.__sentence is not None:
-                            self.__passage.add_sentence(self.__sentence)
-
-    def __read_annotation(self, start_elem) -> BioCAnnotation:
-        ann = BioCAnnotation()
-        ann.id = start_elem.get('id')
-        while self.__has_next():
-            event, elem = self.__next_event()
-            if event == 'start':
-                pass
-            elif event == 'end':
-                if elem.tag == 'text':
-                    ann.text = elem.text
-                elif elem.tag == 'infon':
-                    ann.infons[elem.get('key')] = elem.text
-                elif elem.tag == 'location':
-                    ann.add_location(BioCLocation(
-                        int(elem.get('offset')), int(elem.get('length'))))
-                elif elem.tag == 'annotation':
-                    return ann
-        raise RuntimeError("should not reach here")  # pragma: no cover
-
-    def __read_relation(self, start_elem) -> BioCRelation:
-        rel = BioCRelation()
-        rel.id = start_elem.get('id')
-        while self.__has_next():
-            event, elem = self.__next_event()
-            if event == 'start':
-                pass
-            elif event == 'end':
-                if elem.tag == 'infon':
-                    rel.infons[elem.get('key')] = elem.text
-                elif elem.tag == 'node':
-                    rel.add_node(BioCNode(elem.get('refid'), elem.get('role')))
-                if elem.tag == 'relation':
-                    return rel
-        raise RuntimeError("should not reach here")  # pragma: no cover
-
-    def __has_next(self) -> bool:
-        try:
-            self.__event, self.__elem = next(self.__context)
-            return True
-        except StopIteration:
-            self.__event = None
-            self.__elem = None
-            return False
+        if self.track_memory:
+            self.__reset_peaks()
+        for _, elem in self.__context:
+            if elem.tag == 'document':
+                if self.__collection is None:
+                    self.__collection = \
+                        self.__decoder.decode_collection_info(elem.getparent())
+                self.__document = self.__decoder.decode_document(elem)
+                self.__release(elem, self.__decoder.lazy)
+                if self.track_memory:
+                    self.__peaks = (
+                        _peak_rss(),
+                        tracemalloc.get_traced_memory()[1]
+                        if self.__tracing else None)
+                return
+            elif self.__collection is None:
+                # a collection without documents
+                self.__collection = self.__decoder.decode_collection_info(elem)
+        self.close()
 
-    def __next_event(self):
-        return self.__event, self.__elem
+    @classmethod
+    def __release(cls, elem, detach: bool = False):
+        """
+        Free the parsed document and everything read before it. If detach
+        is True, the document element is removed from the tree but kept
+        intact for lazy decoding.
+        """
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+            if detach:
+                parent.remove(elem)
+        if not detach:
+            elem.clear()
 
     def get_collection_info(self) -> BioCCollection:
         """
@@ -294,17 +488,179 @@ class BioCXMLDocumentReader:
         return self.__collection
 
 
-def load(fp: TextIO) -> BioCCollection:
+class BioCXMLMmapReader:
+    """
+    Reader for BioC XML files, one document per iteration.
+
+    The file is memory-mapped, and document boundaries are found with a byte
+    scan. Each document is parsed from its slice of the mapped file, so the
+    file contents are not buffered in the Python heap.
+    """
+
+    def __init__(self, path, *,
+                 skip: Optional[Collection[str]] = None,
+                 fields: Optional[Collection[str]] = None,
+                 lazy: bool = False,
+                 intern: Union[bool, StringCache] = False):
+        """
+        :param path: the BioC XML file
+        :param skip: levels and fields that are not materialized
+        :param fields: fields to materialize; all other fields are skipped
+        :param lazy: if True, return BioCXMLLazyDocument objects
+        :param intern: if True, share equal infon keys and values through a
+        cache of this reader, or through the given StringCache
+        """
+        self.file = path
+        self.__decoder = BioCXMLDecoder(skip=skip, fields=fields, lazy=lazy,
+                                        intern=intern)
+        with open(path, 'rb') as fp:
+            self.__buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__spans = iter_document_spans(self.__buf)
+        self.__next_span = next(self.__spans, None)
+        first = None if self.__next_span is None else self.__next_span[0]
+        header = collection_header(self.__buf, first)
+        self.__collection = self.__decoder.decode_collection_info(
+            etree.fromstring(header))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Unmap the BioC XML file."""
+        self.__next_span = None
+        self.__buf.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> BioCDocument:
+        """
+        Reads one BioC document from the XML file.
+
+        :return: the BioC document
+        """
+        if self.__next_span is None:
+            raise StopIteration
+        offset, length = self.__next_span
+        self.__next_span = next(self.__spans, None)
+        return self.__decoder.decode_document(
+            parse_span(self.__buf, offset, length))
+
+    def get_collection_info(self) -> BioCCollection:
+        """
+        Reads the collection information: source, date, key, infons, etc.
+
+        :return: the BioC collection that contains only information
+        """
+        return self.__collection
+
+
+def _split_spans(spans: List[Tuple[int, int]], num_chunks: int) \
+        -> List[Tuple[int, int]]:
+    """
+    Group consecutive document spans into byte ranges of similar size.
+    """
+    if not spans:
+        return []
+    start = spans[0][0]
+    total = spans[-1][0] + spans[-1][1] - start
+    chunk_size = max(1, total // num_chunks)
+    chunks = []
+    for offset, length in spans:
+        end = offset + length
+        if end - start >= chunk_size:
+            chunks.append((start, end))
+            start = end
+    if start < spans[-1][0] + spans[-1][1]:
+        chunks.append((start, spans[-1][0] + spans[-1][1]))
+    return chunks
+
+
+def _decode_range(path, start: int, end: int, skip, intern) \
+        -> List[BioCDocument]:
+    """Decode the documents between two byte offsets of a BioC XML file."""
+    decoder = BioCXMLDecoder(skip=skip, intern=intern)
+    with open(path, 'rb') as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return [decoder.decode_document(parse_span(buf, offset, length))
+                for offset, length in iter_document_spans(buf, start, end)]
+
+
+def _load_parallel(path, workers: int, skip, intern) -> BioCCollection:
+    with open(path, 'rb') as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        spans = list(iter_document_spans(buf))
+        first = spans[0][0] if spans else None
+        header = collection_header(buf, first)
+    tree = etree.fromstring(header).getroottree()
+    collection = BioCXMLDecoder(skip=skip, intern=intern) \
+        .decode_collection_info(tree.getroot())
+    collection.encoding = tree.docinfo.encoding
+    collection.standalone = tree.docinfo.standalone
+    collection.version = tree.docinfo.xml_version
+
+    chunks = _split_spans(spans, workers * 4)
+    del spans
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_decode_range, path, start, end, skip,
+                                   intern)
+                   for start, end in chunks]
+        for future in futures:
+            for document in future.result():
+                collection.add_document(document)
+    return collection
+
+
+def load(fp: Union[str, TextIO], *, skip: Optional[Collection[str]] = None,
+         fields: Optional[Collection[str]] = None,
+         lazy: bool = False, workers: int = 1,
+         intern: Union[bool, StringCache] = False) -> BioCCollection:
     """
     Deserialize ``fp`` (a ``.read()``-supporting file-like object
     containing a BioC collection) to a BioC collection object.
+
+    :param fp: a file object or a filename
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param lazy: if True, documents are decoded on first access
+    :param workers: the number of processes that decode the documents. If
+    greater than 1, the file is split at document boundaries and the chunks
+    are decoded in a process pool. ``fp`` must then be a filename or a file
+    object with a name.
+    :param intern: if True, equal infon keys and values share one string
+    object. A StringCache can be passed to share the cache across calls
     """
-    return BioCXMLDecoder().decode(fp)
+    if workers > 1:
+        if lazy:
+            raise ValueError('Cannot decode lazy documents in parallel')
+        path = fp if isinstance(fp, (str, os.PathLike)) \
+            else getattr(fp, 'name', None)
+        if not isinstance(path, (str, os.PathLike)):
+            raise ValueError('Parallel decoding requires a file name')
+        return _load_parallel(path, workers, projection(skip, fields),
+                              intern)
+    return BioCXMLDecoder(skip=skip, fields=fields, lazy=lazy,
+                          intern=intern).decode(fp)
 
 
-def loads(s: str) -> BioCCollection:
+def loads(s: str, *, skip: Optional[Collection[str]] = None,
+          fields: Optional[Collection[str]] = None,
+          lazy: bool = False,
+          intern: Union[bool, StringCache] = False) -> BioCCollection:
     """
     Deserialize ``s`` (a ``str`` instance containing a BioC collection)
     to a BioC collection object.
+
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) that are not materialized
+    :param fields: fields to materialize; all other fields are skipped
+    :param lazy: if True, documents are decoded on first access
+    :param intern: if True, equal infon keys and values share one string
+    object. A StringCache can be passed to share the cache across calls
     """
-    return BioCXMLDecoder().decodes(s)
+    return BioCXMLDecoder(skip=skip, fields=fields, lazy=lazy,
+                          intern=intern).decodes(s)
@@ -1,22 +1,41 @@
 """
 BioC XML encoder
 """
-from typing import TextIO
+import codecs
+import io
+import os
+import re
+from typing import TextIO, Optional, BinaryIO, Union, Iterator, List
+
 from lxml import etree
 
 from bioc.datastructure import BioCCollection, BioCDocument, BioCLocation, \
-    BioCNode, BioCRelation
+    BioCNode, BioCRelation, BioCAnnotation, BioCSentence, BioCPassage
 
 
-def dump(collection: BioCCollection, fp: TextIO, *, pretty_print: bool = True):
+def dump(collection: BioCCollection, fp: Union[TextIO, BinaryIO], *,
+         pretty_print: bool = True):
     """
     Serialize ``collection`` as a BioC formatted stream to ``fp``.
 
+    The collection is written one document at a time, so memory is
+    bounded by the largest document.
+
     :param collection: the BioC collection fp:
-    a ``.write()``-supporting file-like object
+    a ``.write()``-supporting file-like object. If ``fp`` is a binary file,
+    the output is encoded with ``collection.encoding``.
     :param pretty_print: enables formatted XML
     """
-    fp.write(dumps(collection, pretty_print=pretty_print))
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) \
+            or 'b' in getattr(fp, 'mode', ''):
+        encoder = codecs.getincrementalencoder(collection.encoding)(
+            'xmlcharrefreplace')
+        for chunk in _iterencode(collection, pretty_print):
+            fp.write(encoder.encode(chunk))
+        fp.write(encoder.encode('', final=True))
+    else:
+        for chunk in iterencode(collection, pretty_print=pretty_print):
+            fp.write(chunk)
 
 
 def dumps(collection: BioCCollection, *, pretty_print: bool = True) -> str:
@@ -27,12 +46,206 @@ def dumps(collection: BioCCollection, *, pretty_print: bool = True) -> str:
     :param pretty_print: enables formatted XML
     :return: a BioC formatted ``str``
     """
-    doc = etree.ElementTree(encode_collection(collection))
-    s = etree.tostring(doc,
-                       pretty_print=pretty_print,
-                       encoding=collection.encoding,
-                       standalone=collection.standalone)
-    return s.decode(collection.encoding)
+    return ''.join(iterencode(collection, pretty_print=pretty_print))
+
+
+def iterencode(collection: BioCCollection, *, pretty_print: bool = True) \
+        -> Iterator[str]:
+    """
+    Serialize ``collection`` to BioC formatted ``str`` chunks, one chunk per
+    document. The output is the same as serializing the element tree of
+    ``encode_collection`` with lxml, without building the tree.
+
+    Characters that ``collection.encoding`` cannot represent are written as
+    character references.
+
+    :param collection: the BioC collection
+    :param pretty_print: enables formatted XML
+    :return: the chunks of the BioC formatted ``str``
+    """
+    name = codecs.lookup(collection.encoding).name
+    if name.startswith('utf-'):
+        yield from _iterencode(collection, pretty_print)
+    else:
+        for chunk in _iterencode(collection, pretty_print):
+            yield chunk.encode(name, 'xmlcharrefreplace').decode(name)
+
+
+# Characters that are not allowed in XML
+_INVALID_XML_CHARS = re.compile(
+    '[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+# Encodings for which lxml omits the XML declaration by default
+_DEFAULT_ENCODINGS = ('ASCII', 'UTF-8', 'UTF8', 'US-ASCII')
+
+# flush_every of BioCXMLDocumentWriter when it is not given: 1, or None if
+# flush_bytes is given
+_DEFAULT_FLUSH_EVERY = object()
+
+
+def _escape_text(s: str) -> str:
+    if '&' in s:
+        s = s.replace('&', '&amp;')
+    if '<' in s:
+        s = s.replace('<', '&lt;')
+    if '>' in s:
+        s = s.replace('>', '&gt;')
+    if '\r' in s:
+        s = s.replace('\r', '&#13;')
+    return s
+
+
+def _escape_attrib(s: str) -> str:
+    s = _escape_text(s)
+    if '"' in s:
+        s = s.replace('"', '&quot;')
+    if '\n' in s:
+        s = s.replace('\n', '&#10;')
+    if '\t' in s:
+        s = s.replace('\t', '&#9;')
+    return s
+
+
+def _check_chunk(chunk: str) -> str:
+    if _INVALID_XML_CHARS.search(chunk):
+        raise ValueError('All strings must be XML compatible: Unicode or '
+                         'ASCII, no NULL bytes or control characters')
+    return chunk
+
+
+class _XMLEmitter:
+    """
+    Emit BioC XML as strings, formatted the same way as lxml.
+    """
+
+    def __init__(self, pretty_print: bool):
+        self.pretty_print = pretty_print
+        self.parts = []  # type: List[str]
+        self.__indents = {}
+
+    def indent(self, depth: int) -> str:
+        if not self.pretty_print:
+            return ''
+        try:
+            return self.__indents[depth]
+        except KeyError:
+            indent = self.__indents[depth] = '\n' + '  ' * depth
+            return indent
+
+    def flush(self) -> str:
+        chunk = ''.join(self.parts)
+        self.parts = []
+        return _check_chunk(chunk)
+
+    def leaf(self, tag: str, text: Optional[str], depth: int):
+        if text is None:
+            self.parts.append('%s<%s/>' % (self.indent(depth), tag))
+        else:
+            self.parts.append('%s<%s>%s</%s>'
+                              % (self.indent(depth), tag, _escape_text(text),
+                                 tag))
+
+    def infons(self, infons, depth: int):
+        indent = self.indent(depth)
+        for k, v in infons.items():
+            self.parts.append('%s<infon key="%s">%s</infon>'
+                              % (indent, _escape_attrib(str(k)),
+                                 _escape_text(str(v))))
+
+    def annotation(self, annotation: BioCAnnotation, depth: int):
+        indent = self.indent(depth)
+        self.parts.append('%s<annotation id="%s">'
+                          % (indent, _escape_attrib(annotation.id)))
+        self.infons(annotation.infons, depth + 1)
+        child_indent = self.indent(depth + 1)
+        for location in annotation.locations:
+            self.parts.append('%s<location offset="%s" length="%s"/>'
+                              % (child_indent,
+                                 _escape_attrib(str(location.offset)),
+                                 _escape_attrib(str(location.length))))
+        self.leaf('text', annotation.text, depth + 1)
+        self.parts.append('%s</annotation>' % indent)
+
+    def relation(self, relation: BioCRelation, depth: int):
+        indent = self.indent(depth)
+        if not relation.infons and not relation.nodes:
+            self.parts.append('%s<relation id="%s"/>'
+                              % (indent, _escape_attrib(relation.id)))
+            return
+        self.parts.append('%s<relation id="%s">'
+                          % (indent, _escape_attrib(relation.id)))
+        self.infons(relation.infons, depth + 1)
+        child_indent = self.indent(depth + 1)
+        for node in relation.nodes:
+            self.parts.append('%s<node refid="%s" role="%s"/>'
+                              % (child_indent, _escape_attrib(node.refid),
+                                 _escape_attrib(node.role)))
+        self.parts.append('%s</relation>' % indent)
+
+    def sentence(self, sentence: BioCSentence, depth: int):
+        indent = self.indent(depth)
+        self.parts.append('%s<sentence>' % indent)
+        self.infons(sentence.infons, depth + 1)
+        self.leaf('offset', str(sentence.offset), depth + 1)
+        if sentence.text:
+            self.leaf('text', sentence.text, depth + 1)
+        for ann in sentence.annotations:
+            self.annotation(ann, depth + 1)
+        for rel in sentence.relations:
+            self.relation(rel, depth + 1)
+        self.parts.append('%s</sentence>' % indent)
+
+    def passage(self, passage: BioCPassage, depth: int):
+        indent = self.indent(depth)
+        self.parts.append('%s<passage>' % indent)
+        self.infons(passage.infons, depth + 1)
+        self.leaf('offset', str(passage.offset), depth + 1)
+        if passage.text:
+            self.leaf('text', passage.text, depth + 1)
+        for sen in passage.sentences:
+            self.sentence(sen, depth + 1)
+        for ann in passage.annotations:
+            self.annotation(ann, depth + 1)
+        for rel in passage.relations:
+            self.relation(rel, depth + 1)
+        self.parts.append('%s</passage>' % indent)
+
+    def document(self, document: BioCDocument, depth: int):
+        indent = self.indent(depth)
+        self.parts.append('%s<document>' % indent)
+        self.leaf('id', str(document.id), depth + 1)
+        self.infons(document.infons, depth + 1)
+        for passage in document.passages:
+            self.passage(passage, depth + 1)
+        for ann in document.annotations:
+            self.annotation(ann, depth + 1)
+        for rel in document.relations:
+            self.relation(rel, depth + 1)
+        self.parts.append('%s</document>' % indent)
+
+
+def _iterencode(collection: BioCCollection, pretty_print: bool) \
+        -> Iterator[str]:
+    emitter = _XMLEmitter(pretty_print)
+    if collection.standalone is not None \
+            or collection.encoding.upper() not in _DEFAULT_ENCODINGS:
+        emitter.parts.append("<?xml version='1.0' encoding='%s'"
+                             % collection.encoding)
+        if collection.standalone is not None:
+            emitter.parts.append(" standalone='%s'"
+                                 % ('yes' if collection.standalone else 'no'))
+        emitter.parts.append('?>\n')
+    emitter.parts.append('<collection>')
+    emitter.leaf('source', collection.source, 1)
+    emitter.leaf('date', collection.date, 1)
+    emitter.leaf('key', collection.key, 1)
+    emitter.infons(collection.infons, 1)
+    yield emitter.flush()
+    for document in collection.documents:
+        emitter.document(document, 1)
+        yield emitter.flush()
+    emitter.parts.append('\n</collection>\n' if pretty_print
+                         else '</collection>')
+    yield emitter.flush()
 
 
 def encode_location(location: BioCLocation):
@@ -134,31 +347,179 @@ def encode_collection(collection):
     return tree
 
 
+def _write_infons(xf, infons):
+    for k, v in infons.items():
+        with xf.element('infon', {'key': str(k)}):
+            xf.write(str(v))
+
+
+def _write_text(xf, tag, text):
+    if text is None:
+        xf.write(etree.Element(tag))
+    else:
+        with xf.element(tag):
+            xf.write(text)
+
+
+def _write_annotation(xf, annotation):
+    with xf.element('annotation', {'id': annotation.id}):
+        _write_infons(xf, annotation.infons)
+        for location in annotation.locations:
+            xf.write(encode_location(location))
+        _write_text(xf, 'text', annotation.text)
+
+
+def _write_relation(xf, relation):
+    if not relation.infons and not relation.nodes:
+        # xf.element always writes an end tag
+        xf.write(encode_relation(relation))
+        return
+    with xf.element('relation', {'id': relation.id}):
+        _write_infons(xf, relation.infons)
+        for node in relation.nodes:
+            xf.write(encode_node(node))
+
+
+def _write_sentence(xf, sentence):
+    with xf.element('sentence'):
+        _write_infons(xf, sentence.infons)
+        _write_text(xf, 'offset', str(sentence.offset))
+        if sentence.text:
+            _write_text(xf, 'text', sentence.text)
+        for ann in sentence.annotations:
+            _write_annotation(xf, ann)
+        for rel in sentence.relations:
+            _write_relation(xf, rel)
+
+
+def _write_passage(xf, passage):
+    with xf.element('passage'):
+        _write_infons(xf, passage.infons)
+        _write_text(xf, 'offset', str(passage.offset))
+        if passage.text:
+            _write_text(xf, 'text', passage.text)
+        for sen in passage.sentences:
+            _write_sentence(xf, sen)
+        for ann in passage.annotations:
+            _write_annotation(xf, ann)
+        for rel in passage.relations:
+            _write_relation(xf, rel)
+
+
+def write_document(xf, document: BioCDocument):
+    """
+    Write a single document to an lxml ``xmlfile`` without building its
+    element tree. The output is the same as that of ``encode_document``.
+    """
+    with xf.element('document'):
+        _write_text(xf, 'id', str(document.id))
+        _write_infons(xf, document.infons)
+        for passage in document.passages:
+            _write_passage(xf, passage)
+        for ann in document.annotations:
+            _write_annotation(xf, ann)
+        for rel in document.relations:
+            _write_relation(xf, rel)
+
+
+class _ByteBuffer:
+    """
+    Hold the bytes written by lxml until they are flushed to a file object,
+    so the size of the pending output is known.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.chunks = []  # type: List[bytes]
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+
+    def flush(self):
+        if self.chunks:
+            self.fp.write(b''.join(self.chunks))
+            self.chunks = []
+            self.size = 0
+        if hasattr(self.fp, 'flush'):
+            self.fp.flush()
+
+
 class BioCXMLDocumentWriter:
     """
     Writer for the BioC XML format, one document at a time.
+
+    Documents are streamed to the file without building their element
+    trees. The output is flushed every ``flush_every`` documents, or once
+    at least ``flush_bytes`` bytes are pending, whichever comes first. With
+    ``flush_bytes``, the pending output is held by the writer, so memory is
+    bounded by ``flush_bytes`` plus the largest document. If both are
+    None, the output is only flushed when the writer is closed.
     """
 
-    def __init__(self, file, encoding='utf8', standalone=True):
+    def __init__(self, file, encoding='utf8', standalone=True, *,
+                 flush_every: Optional[int] = _DEFAULT_FLUSH_EVERY,
+                 flush_bytes: Optional[int] = None):
+        """
+        :param file: a filename or a binary file object
+        :param encoding: the encoding of the output
+        :param standalone: the standalone declaration of the output
+        :param flush_every: flush after every N documents. Defaults to 1,
+        or to None if flush_bytes is given
+        :param flush_bytes: flush once at least N bytes are pending
+        """
+        if flush_every is _DEFAULT_FLUSH_EVERY:
+            flush_every = 1 if flush_bytes is None else None
         self.encoding = encoding
         self.standalone = standalone
         self.file = file
+        self.flush_every = flush_every
+        self.flush_bytes = flush_bytes
+        self.__fp = None
+        self.__output = file
+        if flush_bytes is not None:
+            if isinstance(file, (str, os.PathLike)):
+                self.__fp = open(file, 'wb')
+                self.__output = _ByteBuffer(self.__fp)
+            else:
+                self.__output = _ByteBuffer(file)
         self.__writer = self.__writer__()
         next(self.__writer)  # start writing (run up to 'yield')
 
     def __writer__(self):
-        with etree.xmlfile(self.file, encoding=self.encoding) as xf:
+        with etree.xmlfile(self.__output, encoding=self.encoding) as xf:
             xf.write_declaration(standalone=self.standalone)
             with xf.element('collection'):
+                documents = 0
                 try:
                     while True:
-                        elem = (yield)
-                        xf.write(elem)
+                        obj = (yield)
+                        if isinstance(obj, BioCDocument):
+                            write_document(xf, obj)
+                            documents += 1
+                        else:
+                            xf.write(obj)
                         xf.write('\n')
-                        xf.flush()
+                        if self.flush_bytes is not None:
+                            # move the output buffered by lxml to the
+                            # buffer, where it is counted
+                            xf.flush()
+                        if (self.flush_every is not None
+                                and documents >= self.flush_every) \
+                                or (self.flush_bytes is not None
+                                    and self.__output.size
+                                    >= self.flush_bytes):
+                            documents = 0
+                            self.__flush(xf)
                 except GeneratorExit:
                     pass
 
+    def __flush(self, xf):
+        xf.flush()
+        if isinstance(self.__output, _ByteBuffer):
+            self.__output.flush()
+
     def write_collection_info(self, collection: BioCCollection):
         """
         Writes the collection information: encoding, version, DTD,
@@ -184,11 +545,14 @@ class BioCXMLDocumentWriter:
     def close(self):
         """Close this writer"""
         self.__writer.close()
+        if isinstance(self.__output, _ByteBuffer):
+            self.__output.flush()
+        if self.__fp is not None:
+            self.__fp.close()
 
     def write_document(self, document: BioCDocument):
         """Encode and write a single document."""
-        tree = encode_document(document)
-        self.__writer.send(tree)
+        self.__writer.send(document)
 
     # def __enter__(self):
     #     return self
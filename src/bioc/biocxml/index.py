@@ -0,0 +1,189 @@
+"""
+Byte-offset document index for random access into BioC XML files
+"""
+import mmap
+import os
+import warnings
+from pathlib import Path
+from typing import Dict, Tuple, Union, Optional, Collection, Iterator
+
+from lxml import etree
+
+from bioc.biocxml.decoder import BioCXMLDecoder
+from bioc.biocxml.scanner import iter_document_spans, collection_header, \
+    document_id
+from bioc.datastructure import BioCCollection, BioCDocument
+from bioc.utils import StringCache
+
+INDEX_SUFFIX = '.idx'
+_INDEX_HEADER = '# bioc-xml-index'
+
+Index = Dict[str, Tuple[int, int]]
+
+
+def _index_path(path, index_path) -> Path:
+    if index_path is not None:
+        return Path(index_path)
+    return Path(str(path) + INDEX_SUFFIX)
+
+
+def _signature(path) -> str:
+    stat = os.stat(path)
+    return '%s %d %d' % (_INDEX_HEADER, stat.st_size, stat.st_mtime_ns)
+
+
+def build_index(path: Union[str, Path], index_path: Union[str, Path] = None) \
+        -> Index:
+    """
+    Scan a BioC XML file once and write a sidecar index that records the
+    byte offset and length of every document, keyed by document id. If a
+    document id occurs more than once, the first document is indexed. A
+    document without an ``<id>`` element that can be read, or with a line
+    break in its id, is not indexed, and a warning is issued.
+
+    :param path: the BioC XML file
+    :param index_path: the index file. Defaults to ``path`` + ``.idx``
+    :return: the index
+    """
+    index = {}  # type: Index
+    signature = _signature(path)
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size > 0:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for offset, length in iter_document_spans(buf):
+                    docid = document_id(buf, offset, length)
+                    if docid is None:
+                        warnings.warn('%s: Cannot read the id of the document'
+                                      ' at byte %d; it is not indexed'
+                                      % (path, offset))
+                    elif '\n' in docid or '\r' in docid:
+                        # one line per document in the index file
+                        warnings.warn('%s: Cannot index the document at byte'
+                                      ' %d with a line break in its id'
+                                      % (path, offset))
+                    elif docid not in index:
+                        index[docid] = (offset, length)
+
+    with open(_index_path(path, index_path), 'w', encoding='utf8') as fp:
+        fp.write(signature + '\n')
+        for docid, (offset, length) in index.items():
+            fp.write('%d\t%d\t%s\n' % (offset, length, docid))
+    return index
+
+
+def load_index(path: Union[str, Path], index_path: Union[str, Path] = None) \
+        -> Optional[Index]:
+    """
+    Read the sidecar index of a BioC XML file.
+
+    :param path: the BioC XML file
+    :param index_path: the index file. Defaults to ``path`` + ``.idx``
+    :return: the index, or None if the index does not exist or is older
+    than the BioC XML file
+    """
+    index_path = _index_path(path, index_path)
+    if not index_path.exists():
+        return None
+    with open(index_path, encoding='utf8') as fp:
+        if fp.readline().rstrip('\n') != _signature(path):
+            return None
+        index = {}  # type: Index
+        for line in fp:
+            offset, length, docid = line.rstrip('\n').split('\t', 2)
+            index[docid] = (int(offset), int(length))
+    return index
+
+
+class BioCXMLIndexedReader:
+    """
+    Random access to the documents of a BioC XML file through a byte-offset
+    index. The index is read from the sidecar file, or built if it is
+    missing or out of date.
+    """
+
+    def __init__(self, path: Union[str, Path],
+                 index_path: Union[str, Path] = None, *,
+                 skip: Optional[Collection[str]] = None,
+                 fields: Optional[Collection[str]] = None,
+                 intern: Union[bool, StringCache] = False):
+        """
+        :param path: the BioC XML file
+        :param index_path: the index file. Defaults to ``path`` + ``.idx``
+        :param skip: levels and fields that are not materialized
+        :param fields: fields to materialize; all other fields are skipped
+        :param intern: if True, share equal infon keys and values through a
+        cache of this reader, or through the given StringCache
+        """
+        self.path = path
+        self.index = load_index(path, index_path)
+        if self.index is None:
+            self.index = build_index(path, index_path)
+        self.__decoder = BioCXMLDecoder(skip=skip, fields=fields,
+                                        intern=intern)
+        self.__fp = open(path, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the BioC XML file."""
+        self.__fp.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, docid: str) -> bool:
+        return docid in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __getitem__(self, docid: str) -> BioCDocument:
+        return self.get(docid)
+
+    def get(self, docid: str) -> BioCDocument:
+        """
+        Seek to the document and decode only it.
+
+        :param docid: document id
+        :return: the document with the id
+        """
+        try:
+            offset, length = self.index[docid]
+        except KeyError:
+            raise KeyError('%s: Cannot find document' % docid) from None
+        self.__fp.seek(offset)
+        tree = etree.fromstring(self.__fp.read(length))
+        return self.__decoder.decode_document(tree)
+
+    def __first_document(self) -> Optional[int]:
+        """
+        :return: the byte offset of the first document, or None
+        """
+        if os.fstat(self.__fp.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(self.__fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            spans = iter_document_spans(buf)
+            span = next(spans, None)
+            spans.close()
+        return None if span is None else span[0]
+
+    def get_collection_info(self) -> BioCCollection:
+        """
+        Reads the collection information: source, date, key, infons, etc.
+
+        :return: the BioC collection that contains only information
+        """
+        first = min((offset for offset, _ in self.index.values()), default=None)
+        if first is None:
+            # no document is indexed, but the file may have documents
+            first = self.__first_document()
+        self.__fp.seek(0)
+        if first is None:
+            header = collection_header(self.__fp.read())
+        else:
+            header = collection_header(self.__fp.read(first), first)
+        return self.__decoder.decode_collection_info(etree.fromstring(header))
@@ -0,0 +1,121 @@
+"""
+Locate BioC XML documents in raw bytes without parsing them
+"""
+from typing import Generator, Optional, Tuple, Union
+import mmap
+
+from lxml import etree
+
+DOCUMENT_START = b'<document'
+DOCUMENT_END = b'</document>'
+ID_START = b'<id'
+ID_END = b'</id'
+# characters that can follow the tag name in a start tag
+_TAG_NAME_END = frozenset(b'> \t\r\n/')
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+def iter_document_spans(buf: Buffer, start: int = 0, end: int = None) \
+        -> Generator[Tuple[int, int], None, None]:
+    """
+    Scan ``buf`` for ``<document>`` elements.
+
+    The scan works on the raw bytes of an ASCII-compatible encoding (e.g.,
+    UTF-8). It assumes that document tags do not appear in comments or
+    CDATA sections, and that end tags are written as ``</document>``.
+
+    :param buf: bytes or a memory-mapped BioC XML file
+    :param start: the byte offset to start scanning from
+    :param end: the byte offset to stop scanning at
+    :return: the byte offset and length of each document element
+    """
+    if end is None:
+        end = len(buf)
+    pos = start
+    while True:
+        s = buf.find(DOCUMENT_START, pos, end)
+        if s < 0:
+            return
+        pos = s + len(DOCUMENT_START)
+        if pos >= end or buf[pos] not in _TAG_NAME_END:
+            # another tag, e.g., <documents>
+            continue
+        gt = buf.find(b'>', pos, end)
+        if gt < 0:
+            raise ValueError('Unclosed document start tag at byte %d' % s)
+        if buf[gt - 1] == ord('/'):
+            # empty document element
+            pos = gt + 1
+        else:
+            e = buf.find(DOCUMENT_END, gt, end)
+            if e < 0:
+                raise ValueError('Unclosed document at byte %d' % s)
+            pos = e + len(DOCUMENT_END)
+        yield s, pos - s
+
+
+def collection_header(buf: Buffer, first_document: int = None) -> bytes:
+    """
+    :param buf: bytes or a memory-mapped BioC XML file
+    :param first_document: the byte offset of the first document, or None
+    if the collection has no documents
+    :return: the collection without documents, as a well-formed XML string
+    """
+    if first_document is None:
+        return bytes(buf[:])
+    return bytes(buf[:first_document]) + b'</collection>'
+
+
+def document_id(buf: Buffer, offset: int, length: int) -> Optional[str]:
+    """
+    Read the id of a document without parsing the document.
+
+    :param buf: bytes or a memory-mapped BioC XML file
+    :param offset: the byte offset of the document element
+    :param length: the byte length of the document element
+    :return: the text of the first ``<id>`` element in the document, or
+    None if the document has no ``<id>`` element that can be parsed
+    """
+    end = offset + length
+    pos = offset
+    while True:
+        start = buf.find(ID_START, pos, end)
+        if start < 0:
+            return None
+        pos = start + len(ID_START)
+        if pos < end and buf[pos] in _TAG_NAME_END:
+            break
+        # another tag, e.g., <identifier>
+    gt = buf.find(b'>', pos, end)
+    if gt < 0:
+        return None
+    if buf[gt - 1] != ord('/'):
+        # the end tag may have whitespace before >
+        gt = buf.find(ID_END, gt, end)
+        if gt >= 0:
+            gt = buf.find(b'>', gt, end)
+        if gt < 0:
+            return None
+    # parse the <id> element to resolve character references and attributes
+    try:
+        return etree.fromstring(buf[start:gt + 1]).text or ''
+    except etree.XMLSyntaxError:
+        return None
+
+
+def parse_span(buf: Buffer, offset: int, length: int):
+    """
+    Parse one element of a buffer without copying it, if lxml supports it.
+
+    :param buf: bytes or a memory-mapped BioC XML file
+    :param offset: the byte offset of the element
+    :param length: the byte length of the element
+    :return: the element
+    """
+    with memoryview(buf) as view, view[offset:offset + length] as data:
+        try:
+            return etree.fromstring(data)
+        except TypeError:  # pragma: no cover
+            # older lxml versions only parse str and bytes
+            return etree.fromstring(data.tobytes())
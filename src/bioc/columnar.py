@@ -0,0 +1,254 @@
+"""
+Columnar storage of annotations.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional
+
+from bioc.datastructure import BioCAnnotation, BioCLocation
+
+# the start and end of an annotation without locations
+_NO_SPAN = -1
+
+
+class BioCAnnotationStore:
+    """
+    Annotations stored column by column.
+
+    Offsets, lengths, and type ids are kept in typed arrays, and infon keys
+    and types are interned in tables. BioCAnnotation objects are created on
+    demand, so millions of annotations cost a few arrays instead of millions
+    of small objects. Annotations returned by the store are copies; changing
+    them does not change the store.
+
+    The columns support the buffer protocol, so they can be wrapped without
+    copying, e.g., ``numpy.frombuffer(store.starts, dtype='int64')``.
+
+    The store is separate from the BioC objects: a document does not read
+    from or write to it. Fill it with ``of_annotations`` and turn it back
+    into objects with ``list(store)``.
+    """
+
+    def __init__(self):
+        self.ids = []  # type: List[str]
+        self.texts = []  # type: List[str]
+        # index into type_names, -1 if the annotation has no type
+        self.types = array('i')
+        # the total span of each annotation
+        self.starts = array('q')
+        self.ends = array('q')
+        # the locations of annotation i are location_offsets[j:k] and
+        # location_lengths[j:k], where j = location_index[i] and
+        # k = location_index[i + 1]
+        self.location_index = array('q', [0])
+        self.location_offsets = array('q')
+        self.location_lengths = array('q')
+        # infons other than 'type', as (key id, value) pairs
+        self.infons = []  # type: List[Optional[tuple]]
+        self.type_names = []  # type: List[str]
+        self.infon_keys = []  # type: List[str]
+        self.__type_ids = {}  # type: Dict[str, int]
+        self.__infon_key_ids = {}  # type: Dict[str, int]
+        # the first row of each id
+        self.__rows = {}  # type: Dict[str, int]
+        # the rows of each type id
+        self.__type_rows = []  # type: List[array]
+        # the rows with a span sorted by start, built on demand
+        self.__order = None  # type: Optional[array]
+        self.__sorted_starts = None  # type: Optional[array]
+        self.__max_length = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> BioCAnnotation:
+        """
+        :return: the i-th annotation
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('annotation index out of range: %s' % i)
+        ann = BioCAnnotation()
+        ann.id = self.ids[i]
+        ann.text = self.texts[i]
+        type_id = self.types[i]
+        if type_id >= 0:
+            ann.infons['type'] = self.type_names[type_id]
+        if self.infons[i] is not None:
+            for key_id, value in self.infons[i]:
+                ann.infons[self.infon_keys[key_id]] = value
+        for j in range(self.location_index[i], self.location_index[i + 1]):
+            ann.add_location(BioCLocation(self.location_offsets[j],
+                                          self.location_lengths[j]))
+        return ann
+
+    def __iter__(self) -> Iterator[BioCAnnotation]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self):
+        return 'BioCAnnotationStore[annotations=%d,types=[%s]]' \
+               % (len(self), ','.join(self.type_names))
+
+    def __repr__(self):
+        return str(self)
+
+    def add_annotation(self, annotation: BioCAnnotation):
+        """
+        Add a copy of the annotation to this store.
+        """
+        self.__rows.setdefault(annotation.id, len(self.ids))
+        self.ids.append(annotation.id)
+        self.texts.append(annotation.text)
+
+        type_id = -1
+        infons = []
+        for k, v in annotation.infons.items():
+            if k == 'type':
+                type_id = self.__intern(v, self.type_names, self.__type_ids)
+                if type_id == len(self.__type_rows):
+                    self.__type_rows.append(array('q'))
+                self.__type_rows[type_id].append(len(self.types))
+            else:
+                key_id = self.__intern(k, self.infon_keys,
+                                       self.__infon_key_ids)
+                infons.append((key_id, v))
+        self.types.append(type_id)
+        self.infons.append(tuple(infons) if infons else None)
+
+        start = end = _NO_SPAN
+        for loc in annotation.locations:
+            self.location_offsets.append(loc.offset)
+            self.location_lengths.append(loc.length)
+            if start == _NO_SPAN or loc.offset < start:
+                start = loc.offset
+            if end == _NO_SPAN or loc.end > end:
+                end = loc.end
+        self.location_index.append(len(self.location_offsets))
+        self.starts.append(start)
+        self.ends.append(end)
+        self.__max_length = max(self.__max_length, end - start)
+        self.__order = None
+
+    @staticmethod
+    def __intern(name: str, names: List[str], ids: Dict[str, int]) -> int:
+        try:
+            return ids[name]
+        except KeyError:
+            ids[name] = len(names)
+            names.append(name)
+            return ids[name]
+
+    @classmethod
+    def of_annotations(cls, *annotations: BioCAnnotation) \
+            -> 'BioCAnnotationStore':
+        """
+        :return: a store with the annotations
+        """
+        store = BioCAnnotationStore()
+        for annotation in annotations:
+            if annotation is None:
+                raise ValueError('Annotation is None')
+            store.add_annotation(annotation)
+        return store
+
+    def index(self, refid: str) -> int:
+        """
+        :param refid: reference id
+        :return: the index of the first annotation with reference id
+        """
+        try:
+            return self.__rows[refid]
+        except KeyError:
+            raise KeyError('%s: Cannot find refid' % refid) from None
+
+    def get_annotation(self, refid: str) -> BioCAnnotation:
+        """
+        :param refid: reference id
+        :return: the first annotation with reference id
+        """
+        return self[self.index(refid)]
+
+    def find(self, *,
+             type: str = None,  # pylint: disable=redefined-builtin
+             start: int = None, end: int = None) -> List[int]:
+        """
+        Find annotations without creating BioCAnnotation objects.
+
+        :param type: the type of annotations. If None, all types
+        :param start: the start of the range. If None, 0
+        :param end: the end of the range (exclusive). If None, unbounded
+        :return: the indices of annotations of the type whose total span
+        overlaps [start, end)
+        """
+        return self.__find(type, start, end)
+
+    def __find(self, type_: Optional[str], start: Optional[int],
+               end: Optional[int]) -> List[int]:
+        type_id = None
+        if type_ is not None:
+            type_id = self.__type_ids.get(type_)
+            if type_id is None:
+                return []
+        if start is None and end is None:
+            if type_id is None:
+                return list(range(len(self)))
+            return list(self.__type_rows[type_id])
+        if start is None:
+            start = 0
+        order, sorted_starts = self.__sorted()
+        # an annotation that ends after start begins after start - the
+        # longest span
+        lo = bisect_right(sorted_starts, start - self.__max_length)
+        hi = len(order) if end is None else bisect_left(sorted_starts, end)
+        ends = self.ends
+        if type_id is None:
+            rows = [i for i in order[lo:hi] if ends[i] > start]
+        elif len(self.__type_rows[type_id]) < hi - lo:
+            # fewer annotations of the type than in the range
+            starts = self.starts
+            if end is None:
+                end = self.__sorted_starts[-1] + 1
+            return [i for i in self.__type_rows[type_id]
+                    if starts[i] < end and ends[i] > start
+                    and starts[i] != _NO_SPAN]
+        else:
+            types = self.types
+            rows = [i for i in order[lo:hi]
+                    if ends[i] > start and types[i] == type_id]
+        rows.sort()
+        return rows
+
+    def __sorted(self):
+        if self.__order is None:
+            starts = self.starts
+            rows = sorted((i for i in range(len(self))
+                           if starts[i] != _NO_SPAN), key=starts.__getitem__)
+            self.__order = array('q', rows)
+            self.__sorted_starts = array('q', (starts[i] for i in rows))
+        return self.__order, self.__sorted_starts
+
+    def overlapping(self, start: int, end: int,
+                    type: str = None,  # pylint: disable=redefined-builtin
+                    ) -> Iterator[BioCAnnotation]:
+        """
+        :return: the annotations of the type whose total span overlaps
+        [start, end)
+        """
+        for i in self.__find(type, start, end):
+            yield self[i]
+
+    def count(self,
+              type: str = None) -> int:  # pylint: disable=redefined-builtin
+        """
+        :return: the number of annotations of the type
+        """
+        type_ = type
+        if type_ is None:
+            return len(self)
+        type_id = self.__type_ids.get(type_)
+        if type_id is None:
+            return 0
+        return len(self.__type_rows[type_id])
+
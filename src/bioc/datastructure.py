@@ -1,16 +1,19 @@
 """
 Data structures.
 """
+import bisect
 import copy
 import sys
 import time
 from abc import ABC
-from typing import List, NewType, Union, Optional
+from typing import Dict, List, NewType, Union, Optional
 
 from bioc.utils import shorten_text
 
 
 class InfonsMaxin(ABC):
+    __slots__ = ('infons', '__weakref__')
+
     def __init__(self):
         super(InfonsMaxin, self).__init__()
         self.infons = {}
@@ -34,11 +37,53 @@ class InfonsMaxin(ABC):
         return 'infons=[%s],' % \
             ','.join(f'{k}={v}' for (k, v) in self.infons.items())
 
+    def _infons_hash(self) -> int:
+        try:
+            return hash(frozenset(self.infons.items()))
+        except TypeError:
+            # lists or dicts, e.g., from BioC JSON
+            return hash(_hashable(self.infons))
+
+
+def _hashable(value):
+    """
+    :return: a hashable form of value, equal for equal values
+    """
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_hashable(v) for v in value)
+    return value
+
+
+def _copy_infons(infons: dict) -> dict:
+    """
+    :return: a copy of infons. Strings are shared; other values, e.g.,
+    lists from BioC JSON, are deep copied.
+    """
+    copied = dict(infons)
+    for k, v in copied.items():
+        if not isinstance(v, str):
+            copied[k] = copy.deepcopy(v)
+    return copied
+
+
+def _equal_lists(list1: list, list2: list) -> bool:
+    return len(list1) == len(list2) \
+        and all(a.equals(b) for a, b in zip(list1, list2))
+
+
+def _hash_list(items: list) -> int:
+    return hash(tuple(obj.structural_hash() for obj in items))
+
 
 class BioCNode:
     """
     The annotations and/or other relations in the relation.
     """
+    __slots__ = ('refid', 'role', '__weakref__')
 
     def __init__(self, refid: str, role: str):
         """
@@ -66,12 +111,31 @@ class BioCNode:
     def __hash__(self):
         return hash((self.refid, self.role))
 
+    def clone(self) -> 'BioCNode':
+        """
+        :return: a copy of this node
+        """
+        return BioCNode(self.refid, self.role)
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a node with the same refid and role
+        """
+        return self == other
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for nodes that are equal
+        """
+        return hash(self)
+
 
 class BioCLocation:
     """
     The connection to the original text can be made through the offset
     and length fields.
     """
+    __slots__ = ('offset', 'length', '__weakref__')
 
     def __init__(self, offset: int, length: int):
         """
@@ -102,6 +166,24 @@ class BioCLocation:
     def __hash__(self):
         return hash((self.offset, self.length))
 
+    def clone(self) -> 'BioCLocation':
+        """
+        :return: a copy of this location
+        """
+        return BioCLocation(self.offset, self.length)
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a location with the same offset and length
+        """
+        return self == other
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for locations that are equal
+        """
+        return hash(self)
+
     def contains(self, offset: int) -> bool:
         """
         :param offset: the offset
@@ -121,6 +203,7 @@ class BioCAnnotation(InfonsMaxin):
     """
     Stand-off annotation.
     """
+    __slots__ = ('locations', 'id', 'text')
 
     def __init__(self):
         super(BioCAnnotation, self).__init__()
@@ -159,6 +242,37 @@ class BioCAnnotation(InfonsMaxin):
         end = max(l.end for l in self.locations)
         return BioCLocation(start, end - start)
 
+    def clone(self) -> 'BioCAnnotation':
+        """
+        :return: a copy of this annotation. Strings are shared, since they
+        are immutable.
+        """
+        ann = BioCAnnotation()
+        ann.id = self.id
+        ann.text = self.text
+        ann.infons = _copy_infons(self.infons)
+        ann.locations = [BioCLocation(loc.offset, loc.length)
+                         for loc in self.locations]
+        return ann
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is an annotation with the same id, text,
+        infons, and locations
+        """
+        return isinstance(other, BioCAnnotation) \
+            and self.id == other.id \
+            and self.text == other.text \
+            and self.infons == other.infons \
+            and self.locations == other.locations
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for annotations that are equal
+        """
+        return hash((self.id, self.text, self._infons_hash(),
+                     tuple(self.locations)))
+
     def __contains__(self, annotation):
         if not isinstance(annotation, BioCAnnotation):
             raise TypeError('Object of type %s is not BioCAnnotation'
@@ -173,6 +287,7 @@ class BioCRelation(InfonsMaxin):
     Relationship between multiple BioCAnnotations and possibly other
     BioCRelations
     """
+    __slots__ = ('id', 'nodes')
 
     def __init__(self):
         super(BioCRelation, self).__init__()
@@ -196,6 +311,32 @@ class BioCRelation(InfonsMaxin):
         """
         self.nodes.append(node)
 
+    def clone(self) -> 'BioCRelation':
+        """
+        :return: a copy of this relation
+        """
+        rel = BioCRelation()
+        rel.id = self.id
+        rel.infons = _copy_infons(self.infons)
+        rel.nodes = [BioCNode(node.refid, node.role) for node in self.nodes]
+        return rel
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a relation with the same id, infons, and
+        nodes
+        """
+        return isinstance(other, BioCRelation) \
+            and self.id == other.id \
+            and self.infons == other.infons \
+            and self.nodes == other.nodes
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for relations that are equal
+        """
+        return hash((self.id, self._infons_hash(), tuple(self.nodes)))
+
     def get_node(self, *, role: str = None, refid: str = None, default=None) \
             -> BioCNode:
         """
@@ -215,16 +356,95 @@ class BioCRelation(InfonsMaxin):
             return default
 
 
-class AnnotationMixin(ABC):
+class _ListIndex:
+    """
+    An index over a list. It is rebuilt when the list is replaced or its
+    length changes. Changes in place, e.g., ``items[i] = obj``, are not
+    seen, so every hit is checked against the list, and a miss falls back
+    to a linear scan.
+    """
+    __slots__ = ('items', 'length')
+
     def __init__(self):
-        super(AnnotationMixin, self).__init__()
-        self.annotations = []  # type: List[BioCAnnotation]
-        self.relations = []  # type: List[BioCRelation]
+        self.items = None  # type: Optional[list]
+        self.length = 0
+
+    def is_valid(self, items: list) -> bool:
+        return self.items is items and self.length == len(items)
+
+    def clear(self):
+        """
+        Drop the index. It is rebuilt on the next lookup.
+        """
+        self.items = None
+
+    def build(self, items: list):
+        self.items = items
+        self.length = len(items)
+
+
+class _IdIndex(_ListIndex):
+    """
+    A map from ids to the position of the first annotation or relation with
+    that id in a list.
+    """
+    __slots__ = ('positions',)
+
+    def __init__(self):
+        super(_IdIndex, self).__init__()
+        self.positions = {}  # type: Dict[str, int]
+
+    def build(self, items: list):
+        super(_IdIndex, self).build(items)
+        self.positions = {}
+        for i, obj in enumerate(items):
+            self.positions.setdefault(obj.id, i)
+
+    def add(self, items: list, obj):
+        """
+        Index obj before it is appended to items.
+        """
+        if self.is_valid(items):
+            self.positions.setdefault(obj.id, self.length)
+            self.length += 1
+
+    def find(self, items: list, refid: str):
+        """
+        :return: the first object with refid, or None
+        """
+        if not self.is_valid(items):
+            self.build(items)
+        i = self.positions.get(refid)
+        if i is not None and items[i].id == refid:
+            return items[i]
+        # the id was set or changed after the index was built
+        for obj in items:
+            if obj.id == refid:
+                self.build(items)
+                return obj
+        return None
+
+
+class AnnotationMixin(ABC):
+    """
+    Annotations and relations with an id index.
+
+    The index is built on the first lookup, updated by ``add_annotation``
+    and ``add_relation``, and rebuilt after ``annotations`` or
+    ``relations`` is changed directly. Ids that are set or changed after an
+    annotation or relation was added are found as well: a lookup that misses
+    the index scans the list and, on a match, rebuilds the index.
+
+    The classes that use this mixin own the ``annotations``, ``relations``,
+    ``_annotation_index``, and ``_relation_index`` slots.
+    """
+    __slots__ = ()
 
     def add_annotation(self, annotation: BioCAnnotation):
         """
         Add the annotation to this sentence.
         """
+        self._annotation_index.add(self.annotations, annotation)
         self.annotations.append(annotation)
 
     def clear_annotations(self):
@@ -232,51 +452,71 @@ class AnnotationMixin(ABC):
         Clears all annotations.
         """
         del self.annotations[:]
+        self._annotation_index.clear()
 
     def clear_relations(self):
         """
         Clears all relations.
         """
         del self.relations[:]
+        self._relation_index.clear()
 
     def add_relation(self, relation: BioCRelation):
         """
         Add the relation to this sentence.
         """
+        self._relation_index.add(self.relations, relation)
         self.relations.append(relation)
 
+    def _find_annotation(self, refid: str) -> Optional[BioCAnnotation]:
+        return self._annotation_index.find(self.annotations, refid)
+
+    def _find_relation(self, refid: str) -> Optional[BioCRelation]:
+        return self._relation_index.find(self.relations, refid)
+
     def get_annotation(self, refid: str) -> BioCAnnotation:
         """
         :param refid: reference id
         :return: the first annotation with reference id
         """
-        for ann in self.annotations:
-            if ann.id == refid:
-                return ann
-        raise KeyError('%s: Cannot find refid' % refid)
+        ann = self._find_annotation(refid)
+        if ann is None:
+            raise KeyError('%s: Cannot find refid' % refid)
+        return ann
 
     def get_relation(self, refid: str) -> BioCRelation:
         """
         :param refid: node reference id
         :return: the first relation with reference id
         """
-        for rel in self.relations:
-            if rel.id == refid:
-                return rel
-        raise KeyError('%s: Cannot find refid' % refid)
+        rel = self._find_relation(refid)
+        if rel is None:
+            raise KeyError('%s: Cannot find refid' % refid)
+        return rel
 
     def get(self, refid: str) -> Union[BioCAnnotation, BioCRelation]:
         """
         :param refid: reference id
         :return: one annotation or relation with the refid
         """
-        for ann in self.annotations:
-            if ann.id == refid:
-                return ann
-        for rel in self.relations:
-            if rel.id == refid:
-                return rel
-        raise KeyError('%s: Cannot find refid' % refid)
+        obj = self._find_annotation(refid)
+        if obj is None:
+            obj = self._find_relation(refid)
+        if obj is None:
+            raise KeyError('%s: Cannot find refid' % refid)
+        return obj
+
+    def _clone_annotations(self, obj: 'AnnotationMixin'):
+        obj.annotations.extend(ann.clone() for ann in self.annotations)
+        obj.relations.extend(rel.clone() for rel in self.relations)
+
+    def _equal_annotations(self, other: 'AnnotationMixin') -> bool:
+        return _equal_lists(self.annotations, other.annotations) \
+            and _equal_lists(self.relations, other.relations)
+
+    def _annotations_hash(self) -> int:
+        return hash((_hash_list(self.annotations),
+                     _hash_list(self.relations)))
 
     def anns_repr(self) -> str:
         """
@@ -298,9 +538,15 @@ class BioCSentence(AnnotationMixin, InfonsMaxin):
     However, the currently available DTDs only describe the listed
     possibilities.
     """
+    __slots__ = ('annotations', 'relations', '_annotation_index',
+                 '_relation_index', 'offset', 'text')
 
     def __init__(self):
         super(BioCSentence, self).__init__()
+        self.annotations = []  # type: List[BioCAnnotation]
+        self.relations = []  # type: List[BioCRelation]
+        self._annotation_index = _IdIndex()
+        self._relation_index = _IdIndex()
         self.offset = None  # type: int or None
         self.text = ''  # type: str
 
@@ -335,15 +581,160 @@ class BioCSentence(AnnotationMixin, InfonsMaxin):
         """
         return BioCLocation(self.offset, len(self.text))
 
+    def clone(self) -> 'BioCSentence':
+        """
+        :return: a copy of this sentence. Strings are shared, since they are
+        immutable.
+        """
+        sentence = BioCSentence()
+        sentence.offset = self.offset
+        sentence.text = self.text
+        sentence.infons = _copy_infons(self.infons)
+        self._clone_annotations(sentence)
+        return sentence
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a sentence with the same offset, text,
+        infons, annotations, and relations
+        """
+        return isinstance(other, BioCSentence) \
+            and self.offset == other.offset \
+            and self.text == other.text \
+            and self.infons == other.infons \
+            and self._equal_annotations(other)
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for sentences that are equal
+        """
+        return hash((self.offset, self.text, self._infons_hash(),
+                     self._annotations_hash()))
+
+
+def _sentence_end(sentence: 'BioCSentence') -> int:
+    return sentence.offset + len(sentence.text or '')
+
+
+def _passage_end(passage: 'BioCPassage') -> int:
+    """
+    :return: the end of the passage. A passage spans from its offset to the
+    end of its text or, if it has no text, of its last sentence
+    """
+    if passage.text:
+        return passage.offset + len(passage.text)
+    ends = [_sentence_end(s) for s in passage.sentences
+            if s.offset is not None]
+    return max(ends) if ends else passage.offset
+
+
+class _OffsetIndex(_ListIndex):
+    """
+    The positions of sentences or passages in a list, sorted by offset.
+    """
+    __slots__ = ('end', 'positions', 'starts', 'sorted')
+
+    def __init__(self, end):
+        """
+        :param end: returns the end of an object
+        """
+        super(_OffsetIndex, self).__init__()
+        self.end = end
+        # the first position of each offset
+        self.positions = {}  # type: Dict[int, int]
+        # the offsets and positions of the objects with an offset
+        self.starts = []  # type: List[int]
+        self.sorted = []  # type: List[int]
+
+    def build(self, items: list):
+        super(_OffsetIndex, self).build(items)
+        # stable, so objects with the same offset keep their order
+        rows = sorted((i for i, obj in enumerate(items)
+                       if obj.offset is not None),
+                      key=lambda i: items[i].offset)
+        self.positions = {}
+        for i in rows:
+            self.positions.setdefault(items[i].offset, i)
+        self.sorted = rows
+        self.starts = [items[i].offset for i in rows]
+
+    def add(self, items: list, obj):
+        """
+        Index obj before it is appended to items.
+        """
+        if not self.is_valid(items):
+            return
+        i = self.length
+        self.length += 1
+        if obj.offset is None:
+            return
+        self.positions.setdefault(obj.offset, i)
+        if not self.starts or self.starts[-1] <= obj.offset:
+            self.starts.append(obj.offset)
+            self.sorted.append(i)
+        else:
+            j = bisect.bisect_right(self.starts, obj.offset)
+            self.starts.insert(j, obj.offset)
+            self.sorted.insert(j, i)
+
+    def matches(self, obj, offset: int, containing: bool) -> bool:
+        """
+        :return: True if obj starts at (or contains) the offset
+        """
+        if obj.offset is None:
+            return False
+        if containing:
+            return obj.offset <= offset < self.end(obj)
+        return obj.offset == offset
+
+    def __lookup(self, items: list, offset: int, containing: bool):
+        if containing:
+            j = bisect.bisect_right(self.starts, offset) - 1
+            i = self.sorted[j] if j >= 0 else None
+        else:
+            i = self.positions.get(offset)
+        if i is not None and self.matches(items[i], offset, containing):
+            return items[i]
+        return None
+
+    def find(self, items: list, offset: int, containing: bool):
+        """
+        :return: the object that starts at (or contains) the offset, or None
+        """
+        if not self.is_valid(items):
+            self.build(items)
+        obj = self.__lookup(items, offset, containing)
+        if obj is not None:
+            return obj
+        # an offset was set or changed after the index was built
+        if any(self.matches(x, offset, containing) for x in items):
+            self.build(items)
+            return self.__lookup(items, offset, containing)
+        return None
+
 
 class WithSentence(ABC):
-    def __init__(self):
-        self.sentences = []  # type: List[BioCSentence]
+    """
+    Sentences with an offset index.
+
+    The index is built on the first lookup, updated by ``add_sentence``,
+    and rebuilt after ``sentences`` is changed directly. Offsets that are
+    set or changed after a sentence was added are found as well: a lookup
+    that misses the index scans the list and, on a match, rebuilds the
+    index.
+
+    The classes that use this mixin own the ``sentences`` and
+    ``_sentence_index`` slots.
+    """
+    __slots__ = ()
+    sentences: List[BioCSentence]
+    _sentence_index: '_OffsetIndex'
 
     def add_sentence(self, sentence: BioCSentence):
         """
         Add the sentence to this passage
         """
+        self._sentence_index.add(self.sentences, sentence)
         self.sentences.append(sentence)
 
     def get_sentence(self, offset: int) -> Optional[BioCSentence]:
@@ -351,10 +742,16 @@ class WithSentence(ABC):
         :param offset: sentence offset
         :return: the sentence with specified offset
         """
-        for sentence in self.sentences:
-            if sentence.offset == offset:
-                return sentence
-        return None
+        return self._sentence_index.find(self.sentences, offset,
+                                         containing=False)
+
+    def sentence_at(self, offset: int) -> Optional[BioCSentence]:
+        """
+        :param offset: an offset in the text
+        :return: the sentence that contains the offset
+        """
+        return self._sentence_index.find(self.sentences, offset,
+                                         containing=True)
 
 
 class BioCPassage(AnnotationMixin, InfonsMaxin, WithSentence):
@@ -366,11 +763,22 @@ class BioCPassage(AnnotationMixin, InfonsMaxin, WithSentence):
     either case it might include BioCRelations over annotations
     on the passage.
     """
+    __slots__ = ('annotations', 'relations', '_annotation_index',
+                 '_relation_index', 'sentences', '_sentence_index', 'offset',
+                 'text', '_text_cache')
 
     def __init__(self):
         super(BioCPassage, self).__init__()
+        self.annotations = []  # type: List[BioCAnnotation]
+        self.relations = []  # type: List[BioCRelation]
+        self._annotation_index = _IdIndex()
+        self._relation_index = _IdIndex()
+        self.sentences = []  # type: List[BioCSentence]
+        self._sentence_index = _OffsetIndex(_sentence_end)
         self.offset = 0  # type: int
         self.text = ''  # type: str
+        # the text built from the sentences, see bioc.utils.get_text
+        self._text_cache = None  # type: Optional[tuple]
 
     def __str__(self):
         s = 'BioCPassage['
@@ -386,6 +794,13 @@ class BioCPassage(AnnotationMixin, InfonsMaxin, WithSentence):
     def __repr__(self):
         return str(self)
 
+    def add_sentence(self, sentence: BioCSentence):
+        """
+        Add the sentence to this passage
+        """
+        super(BioCPassage, self).add_sentence(sentence)
+        self._text_cache = None
+
     @classmethod
     def of_sentences(cls, *sentences: BioCSentence) -> 'BioCPassage':
         """
@@ -427,6 +842,38 @@ class BioCPassage(AnnotationMixin, InfonsMaxin, WithSentence):
             return BioCLocation(self.sentences[0].offset,
                                 self.sentences[-1].total_span.end)
 
+    def clone(self) -> 'BioCPassage':
+        """
+        :return: a copy of this passage. Strings are shared, since they are
+        immutable.
+        """
+        passage = BioCPassage()
+        passage.offset = self.offset
+        passage.text = self.text
+        passage.infons = _copy_infons(self.infons)
+        passage.sentences.extend(s.clone() for s in self.sentences)
+        self._clone_annotations(passage)
+        return passage
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a passage with the same offset, text,
+        infons, sentences, annotations, and relations
+        """
+        return isinstance(other, BioCPassage) \
+            and self.offset == other.offset \
+            and self.text == other.text \
+            and self.infons == other.infons \
+            and _equal_lists(self.sentences, other.sentences) \
+            and self._equal_annotations(other)
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for passages that are equal
+        """
+        return hash((self.offset, self.text, self._infons_hash(),
+                     _hash_list(self.sentences), self._annotations_hash()))
+
 
 class BioCDocument(AnnotationMixin, InfonsMaxin, WithSentence):
     """
@@ -436,12 +883,24 @@ class BioCDocument(AnnotationMixin, InfonsMaxin, WithSentence):
     particular document. It includes BioCPassages in the document
     and possibly BioCRelations over annotations on the document.
     """
+    __slots__ = ('annotations', 'relations', '_annotation_index',
+                 '_relation_index', 'sentences', '_sentence_index', 'id',
+                 'passages', '_passage_index', 'text', '_text_cache')
 
     def __init__(self):
         super(BioCDocument, self).__init__()
+        self.annotations = []  # type: List[BioCAnnotation]
+        self.relations = []  # type: List[BioCRelation]
+        self._annotation_index = _IdIndex()
+        self._relation_index = _IdIndex()
+        self.sentences = []  # type: List[BioCSentence]
+        self._sentence_index = _OffsetIndex(_sentence_end)
         self.id = ''  # type: str
         self.passages = []  # type: List[BioCPassage]
+        self._passage_index = _OffsetIndex(_passage_end)
         self.text = ''  # type: str
+        # the text built from the passages, see bioc.utils.get_text
+        self._text_cache = None  # type: Optional[tuple]
 
     def __str__(self):
         s = 'BioCDocument['
@@ -461,17 +920,45 @@ class BioCDocument(AnnotationMixin, InfonsMaxin, WithSentence):
         """
         Add the passage to this document
         """
+        self._passage_index.add(self.passages, passage)
         self.passages.append(passage)
+        self._text_cache = None
 
     def get_passage(self, offset: int) -> Optional[BioCPassage]:
         """
         :param offset: passage offset
         :return: the passage with specified offset
         """
+        return self._passage_index.find(self.passages, offset,
+                                        containing=False)
+
+    def passage_at(self, offset: int) -> Optional[BioCPassage]:
+        """
+        :param offset: an offset in the text
+        :return: the passage that contains the offset
+        """
+        return self._passage_index.find(self.passages, offset,
+                                        containing=True)
+
+    def lookup(self, refid: str) -> Union[BioCAnnotation, BioCRelation]:
+        """
+        Find an annotation or relation at any level of this document.
+
+        :param refid: reference id
+        :return: the first annotation or relation with the refid in this
+        document, its passages, or their sentences
+        """
+        containers = [self]
         for passage in self.passages:
-            if passage.offset == offset:
-                return passage
-        return None
+            containers.append(passage)
+            containers.extend(passage.sentences)
+        for container in containers:
+            obj = container._find_annotation(refid)
+            if obj is None:
+                obj = container._find_relation(refid)
+            if obj is not None:
+                return obj
+        raise KeyError('%s: Cannot find refid' % refid)
 
     @classmethod
     def of_passages(cls, *passages: BioCPassage) -> 'BioCDocument':
@@ -496,6 +983,41 @@ class BioCDocument(AnnotationMixin, InfonsMaxin, WithSentence):
         doc.text = text
         return doc
 
+    def clone(self) -> 'BioCDocument':
+        """
+        :return: a copy of this document. Strings are shared, since they are
+        immutable.
+        """
+        document = BioCDocument()
+        document.id = self.id
+        document.text = self.text
+        document.infons = _copy_infons(self.infons)
+        document.passages.extend(p.clone() for p in self.passages)
+        document.sentences.extend(s.clone() for s in self.sentences)
+        self._clone_annotations(document)
+        return document
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a document with the same id, text, infons,
+        passages, annotations, and relations
+        """
+        return isinstance(other, BioCDocument) \
+            and self.id == other.id \
+            and self.text == other.text \
+            and self.infons == other.infons \
+            and _equal_lists(self.passages, other.passages) \
+            and _equal_lists(self.sentences, other.sentences) \
+            and self._equal_annotations(other)
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for documents that are equal
+        """
+        return hash((self.id, self.text, self._infons_hash(),
+                     _hash_list(self.passages), _hash_list(self.sentences),
+                     self._annotations_hash()))
+
 
 class BioCCollection(InfonsMaxin, WithSentence):
     """
@@ -507,9 +1029,13 @@ class BioCCollection(InfonsMaxin, WithSentence):
 
     Documents may appear empty if doing document at a time IO.
     """
+    __slots__ = ('sentences', '_sentence_index', 'encoding', 'version',
+                 'standalone', 'source', 'date', 'key', 'documents')
 
     def __init__(self):
         super(BioCCollection, self).__init__()
+        self.sentences = []  # type: List[BioCSentence]
+        self._sentence_index = _OffsetIndex(_sentence_end)
         self.encoding = 'utf-8'
         self.version = '1.0'
         self.standalone = True  # type: bool
@@ -530,6 +1056,37 @@ class BioCCollection(InfonsMaxin, WithSentence):
         self.infons = copy.deepcopy(another.infons)
         return self
 
+    def clone(self) -> 'BioCCollection':
+        """
+        :return: a copy of this collection. Strings are shared, since they
+        are immutable.
+        """
+        collection = BioCCollection().copy_infon(self)
+        collection.documents = [d.clone() for d in self.documents]
+        collection.sentences.extend(s.clone() for s in self.sentences)
+        return collection
+
+    def equals(self, other) -> bool:
+        """
+        :return: True if other is a collection with the same source, date,
+        key, infons, and documents. The encoding, version, and standalone
+        flag of the XML declaration are not compared.
+        """
+        return isinstance(other, BioCCollection) \
+            and self.source == other.source \
+            and self.date == other.date \
+            and self.key == other.key \
+            and self.infons == other.infons \
+            and _equal_lists(self.documents, other.documents) \
+            and _equal_lists(self.sentences, other.sentences)
+
+    def structural_hash(self) -> int:
+        """
+        :return: a hash that is equal for collections that are equal
+        """
+        return hash((self.source, self.date, self.key, self._infons_hash(),
+                     _hash_list(self.documents), _hash_list(self.sentences)))
+
     def add_document(self, document: BioCDocument):
         """
         Add one document to this collection.
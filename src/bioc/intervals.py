@@ -0,0 +1,100 @@
+"""
+Offset-based queries over the annotations, sentences, and passages of a
+document.
+"""
+import bisect
+from typing import List, Optional, Union, Collection, Tuple
+
+from intervaltree import IntervalTree
+
+from bioc.constants import DOCUMENT, PASSAGE, SENTENCE
+from bioc.datastructure import BioCDocument, BioCPassage, BioCSentence, \
+    BioCAnnotation
+from bioc.biocitertools import annotations as iter_annotations
+
+
+class BioCIntervalIndex:
+    """
+    An index of the annotation spans of a document.
+
+    Each annotation is indexed by its total span, so discontinuous
+    annotations cover the gaps between their locations. The annotation
+    index is a snapshot: build a new index after the document is changed.
+    Sentences and passages are looked up through the offset indexes of the
+    document.
+    """
+
+    def __init__(self, document: BioCDocument,
+                 level: Union[int, Collection[int]] = (DOCUMENT, PASSAGE,
+                                                       SENTENCE)):
+        """
+        :param document: the document
+        :param level: the levels of annotations to index: DOCUMENT, PASSAGE,
+        SENTENCE
+        """
+        self.document = document
+        spans = []
+        # zero-length annotations, which an interval tree cannot hold
+        self.__points = []  # type: List[Tuple[int, int, BioCAnnotation]]
+        for seq, r in enumerate(iter_annotations(document, level=level)):
+            ann = r.annotation
+            if not ann.locations:
+                continue
+            span = ann.total_span
+            if span.length > 0:
+                spans.append((span.offset, span.end, (seq, ann)))
+            else:
+                self.__points.append((span.offset, seq, ann))
+        # building the tree at once is much faster than adding one by one
+        self.__tree = IntervalTree.from_tuples(spans)
+        self.__points.sort(key=lambda x: (x[0], x[1]))
+        self.__point_offsets = [offset for offset, _, _ in self.__points]
+
+    def __len__(self):
+        return len(self.__tree) + len(self.__points)
+
+    @staticmethod
+    def __sorted(spans) -> List[BioCAnnotation]:
+        spans = sorted(spans, key=lambda x: x[:3])
+        return [ann for *_, ann in spans]
+
+    def overlapping(self, start: int, end: int) -> List[BioCAnnotation]:
+        """
+        :return: the annotations whose total span overlaps [start, end),
+        sorted by offset. Zero-length annotations at an offset in
+        [start, end) are included.
+        """
+        if start >= end:
+            return []
+        spans = [(iv.begin, iv.end) + iv.data
+                 for iv in self.__tree.overlap(start, end)]
+        lo = bisect.bisect_left(self.__point_offsets, start)
+        hi = bisect.bisect_left(self.__point_offsets, end)
+        spans.extend((offset, offset, seq, ann)
+                     for offset, seq, ann in self.__points[lo:hi])
+        return self.__sorted(spans)
+
+    def enclosing(self, offset: int) -> List[BioCAnnotation]:
+        """
+        :return: the annotations whose total span contains the offset,
+        sorted by offset
+        """
+        return self.__sorted((iv.begin, iv.end) + iv.data
+                             for iv in self.__tree.at(offset))
+
+    def sentence_at(self, offset: int) -> Optional[BioCSentence]:
+        """
+        :return: the sentence that contains the offset, or None. Same as
+        ``passage_at(offset).sentence_at(offset)``
+        """
+        passage = self.document.passage_at(offset)
+        if passage is None:
+            return None
+        return passage.sentence_at(offset)
+
+    def passage_at(self, offset: int) -> Optional[BioCPassage]:
+        """
+        :return: the passage that contains the offset, or None. Same as
+        ``BioCDocument.passage_at``
+        """
+        return self.document.passage_at(offset)
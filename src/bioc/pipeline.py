@@ -0,0 +1,258 @@
+"""
+Parallel processing of BioC documents read from a stream
+"""
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future, wait, \
+    FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, Any, Optional, Dict, List
+
+
+class PipelineStats:
+    """
+    Counters and timers of each stage of a pipeline.
+    """
+
+    def __init__(self):
+        self.read = 0
+        self.processed = 0
+        self.written = 0
+        self.restarts = 0
+        # the input positions of the items that crashed a worker on their own
+        self.skipped = []  # type: List[int]
+        self.read_time = 0.0
+        self.process_time = 0.0
+        self.write_time = 0.0
+        self.start_time = time.perf_counter()
+        self.end_time = None  # type: Optional[float]
+
+    @property
+    def elapsed(self) -> float:
+        """
+        :return: the wall-clock time of the pipeline in seconds
+        """
+        end = self.end_time if self.end_time is not None \
+            else time.perf_counter()
+        return end - self.start_time
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        :return: documents per second of each stage. The process stage is
+        measured in the workers, so its throughput is per worker.
+        """
+        def rate(n, t):
+            return n / t if t > 0 else 0.0
+
+        return {
+            'read': rate(self.read, self.read_time),
+            'process': rate(self.processed, self.process_time),
+            'write': rate(self.written, self.write_time),
+            'total': rate(self.processed, self.elapsed),
+        }
+
+    def __str__(self):
+        s = 'PipelineStats['
+        s += 'read=%d,processed=%d,written=%d,restarts=%d,skipped=%d,' \
+             % (self.read, self.processed, self.written, self.restarts,
+                len(self.skipped))
+        s += 'elapsed=%.3fs,' % self.elapsed
+        s += ','.join('%s=%.1f/s' % (k, v)
+                      for k, v in self.throughput().items())
+        s += ']'
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+
+def _call(func, item):
+    start = time.perf_counter()
+    result = func(item)
+    return result, time.perf_counter() - start
+
+
+def _submit(executor, func, item) -> Future:
+    try:
+        return executor.submit(_call, func, item)
+    except BrokenProcessPool as e:
+        # a worker died before the crash was noticed; handle it with the
+        # results
+        future = Future()
+        future.set_exception(e)
+        return future
+
+
+def imap(func: Callable[[Any], Any], iterable: Iterable, *,
+         workers: int = None,
+         ordered: bool = True,
+         max_inflight: int = None,
+         max_restarts: int = 3,
+         stats: PipelineStats = None) -> Iterator:
+    """
+    Apply ``func`` to every item of ``iterable`` in a process pool.
+
+    At most ``max_inflight`` items are read ahead of the results, so memory
+    stays bounded however long the stream is. If a worker process dies, the
+    pool is restarted and the items in flight are submitted again, one at a
+    time. An item that crashes a worker on its own is skipped, and its input
+    position is added to ``stats.skipped``.
+
+    :param func: a picklable callable, e.g., a module-level function
+    :param iterable: the items, e.g., a BioC document reader
+    :param workers: the number of processes. Defaults to the number of CPUs
+    :param ordered: if True, results are returned in input order
+    :param max_inflight: the maximum number of items submitted but not yet
+    returned. Defaults to twice the number of workers
+    :param max_restarts: the maximum number of times the pool is restarted
+    after a worker crash that is not traced to a skipped item
+    :param stats: counters to update
+    :return: the results
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_inflight is None:
+        max_inflight = 2 * workers
+    if max_inflight < 1:
+        raise ValueError('max_inflight must be positive: %s' % max_inflight)
+    if stats is None:
+        stats = PipelineStats()
+
+    source = iter(iterable)
+    exhausted = False
+    inflight = {}  # seq -> (item, future or None if not submitted)
+    order = deque()  # seqs in input order
+    # seqs in flight at the last crash, submitted again one at a time
+    suspects = deque()
+    # crashes that count against max_restarts, and whether the last one
+    # does
+    failures = 0
+    charged = False
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        seq = 0
+        while True:
+            if suspects:
+                item, future = inflight[suspects[0]]
+                if future is None:
+                    inflight[suspects[0]] = \
+                        (item, _submit(executor, func, item))
+            while not suspects and not exhausted \
+                    and len(inflight) < max_inflight:
+                start = time.perf_counter()
+                try:
+                    item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                finally:
+                    stats.read_time += time.perf_counter() - start
+                stats.read += 1
+                inflight[seq] = (item, _submit(executor, func, item))
+                order.append(seq)
+                seq += 1
+            if not inflight:
+                break
+
+            if ordered:
+                ready = [order[0]]
+                wait([inflight[order[0]][1]])
+            else:
+                done, _ = wait([f for _, f in inflight.values()
+                                if f is not None],
+                               return_when=FIRST_COMPLETED)
+                ready = [k for k in order if inflight[k][1] in done]
+
+            try:
+                results = [(k, inflight[k][1].result()) for k in ready]
+            except BrokenProcessPool:
+                stats.restarts += 1
+                if suspects:
+                    # the item crashed a worker on its own; skip it
+                    k = suspects.popleft()
+                    del inflight[k]
+                    order.remove(k)
+                    stats.skipped.append(k)
+                    if charged:
+                        failures -= 1
+                        charged = False
+                else:
+                    failures += 1
+                    charged = True
+                    if failures > max_restarts:
+                        raise
+                    for k in order:
+                        item, future = inflight[k]
+                        if not future.done() \
+                                or future.exception() is not None:
+                            inflight[k] = (item, None)
+                            suspects.append(k)
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                continue
+
+            for k, (result, elapsed) in results:
+                del inflight[k]
+                order.remove(k)
+                if suspects and suspects[0] == k:
+                    suspects.popleft()
+                stats.processed += 1
+                stats.process_time += elapsed
+                yield result
+    finally:
+        if sys.version_info >= (3, 9):
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:  # pragma: no cover
+            executor.shutdown(wait=False)
+        stats.end_time = time.perf_counter()
+
+
+def _get_write(sink) -> Callable[[Any], Any]:
+    if hasattr(sink, 'write_document'):
+        return sink.write_document
+    if hasattr(sink, 'write'):
+        return sink.write
+    if callable(sink):
+        return sink
+    raise TypeError('Object of type %s must be BioCXMLDocumentWriter, '
+                    'BioCJsonIterWriter, or a callable'
+                    % sink.__class__.__name__)
+
+
+def run(func: Callable[[Any], Any], source: Iterable, sink, *,
+        workers: int = None,
+        ordered: bool = True,
+        max_inflight: int = None,
+        max_restarts: int = 3) -> PipelineStats:
+    """
+    Read documents from ``source``, apply ``func`` to each document in a
+    process pool, and write the results to ``sink``. Results that are None
+    are not written.
+
+    :param func: a picklable callable that takes and returns a BioC object
+    :param source: a BioC reader, e.g., BioCXMLDocumentReader or
+    BioCJsonIterReader
+    :param sink: a BioC writer, e.g., BioCXMLDocumentWriter or
+    BioCJsonIterWriter, or a callable
+    :param workers: the number of processes. Defaults to the number of CPUs
+    :param ordered: if True, results are written in input order
+    :param max_inflight: the maximum number of documents submitted but not
+    yet written. Defaults to twice the number of workers
+    :param max_restarts: the maximum number of times the pool is restarted
+    after a worker crash that is not traced to a skipped document
+    :return: the counters of the pipeline
+    """
+    write = _get_write(sink)
+    stats = PipelineStats()
+    for result in imap(func, source, workers=workers, ordered=ordered,
+                       max_inflight=max_inflight, max_restarts=max_restarts,
+                       stats=stats):
+        if result is None:
+            continue
+        start = time.perf_counter()
+        write(result)
+        stats.write_time += time.perf_counter() - start
+        stats.written += 1
+    return stats
@@ -0,0 +1,320 @@
+"""
+Corpus statistics collected in one streaming pass.
+
+Counts are kept in typed arrays indexed by interned names, so the partial
+statistics of many files are small, picklable, and can be merged.
+"""
+import os
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from bioc import pipeline
+from bioc.biocjson.decoder import BioCJsonIterReader, load as load_json
+from bioc.biocxml.decoder import BioCXMLDocumentReader
+from bioc.datastructure import BioCCollection, BioCDocument
+from bioc.utils import file_format
+
+# text lengths are counted in buckets of powers of two: bucket i holds the
+# lengths in [2 ** (i - 1), 2 ** i)
+_NUM_BUCKETS = 64
+
+
+class _Tally:
+    """
+    Counts of names, e.g., annotation types.
+    """
+
+    def __init__(self):
+        self.names = []  # type: List[str]
+        self.counts = array('q')
+        self.__ids = {}  # type: Dict[str, int]
+
+    def add(self, name: str, n: int = 1) -> int:
+        """
+        :return: the id of the name
+        """
+        try:
+            i = self.__ids[name]
+        except KeyError:
+            i = self.__ids[name] = len(self.names)
+            self.names.append(name)
+            self.counts.append(0)
+        self.counts[i] += n
+        return i
+
+    def merge(self, other: '_Tally'):
+        for name, n in zip(other.names, other.counts):
+            self.add(name, n)
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(zip(self.names, self.counts))
+
+
+class _Histogram:
+    """
+    A histogram of lengths in buckets of powers of two.
+    """
+
+    def __init__(self):
+        self.counts = array('q', [0] * _NUM_BUCKETS)
+        self.total = 0
+        self.max = 0
+
+    def add(self, length: int):
+        self.counts[length.bit_length()] += 1
+        self.total += length
+        if length > self.max:
+            self.max = length
+
+    def merge(self, other: '_Histogram'):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def to_dict(self) -> Dict:
+        """
+        :return: the count, mean, max, and the non-empty buckets as
+        [min length, max length, count]
+        """
+        count = len(self)
+        buckets = [[0 if i == 0 else 2 ** (i - 1), 2 ** i - 1, n]
+                   for i, n in enumerate(self.counts) if n]
+        return {'count': count,
+                'mean': self.total / count if count else 0.0,
+                'max': self.max,
+                'buckets': buckets}
+
+
+class BioCStats:
+    """
+    Counts of documents, passages, sentences, annotations per type, and
+    relations per type, the number of distinct values of each infon key, and
+    histograms of text lengths.
+
+    The distinct values of an infon key are counted exactly up to
+    ``max_values``; keys with more values are reported as saturated.
+    """
+
+    def __init__(self, max_values: int = 100000):
+        """
+        :param max_values: the maximum number of distinct values kept for
+        each infon key
+        """
+        self.max_values = max_values
+        self.documents = 0
+        self.passages = 0
+        self.sentences = 0
+        self.annotation_types = _Tally()
+        self.relation_types = _Tally()
+        # the number of objects with each infon key, and its distinct values
+        self.infon_keys = _Tally()
+        self.infon_values = []  # type: List[Set[str]]
+        self.passage_lengths = _Histogram()
+        self.sentence_lengths = _Histogram()
+        self.annotation_lengths = _Histogram()
+
+    @property
+    def annotations(self) -> int:
+        return sum(self.annotation_types.counts)
+
+    @property
+    def relations(self) -> int:
+        return sum(self.relation_types.counts)
+
+    def __add_infons(self, infons: Dict[str, str]):
+        for key, value in infons.items():
+            i = self.infon_keys.add(key)
+            if i == len(self.infon_values):
+                self.infon_values.append(set())
+            values = self.infon_values[i]
+            if len(values) < self.max_values:
+                values.add(value)
+
+    def __add_annotations(self, obj):
+        for ann in obj.annotations:
+            self.annotation_types.add(ann.infons.get('type'))
+            self.__add_infons(ann.infons)
+            if ann.text is not None:
+                self.annotation_lengths.add(len(ann.text))
+        for rel in obj.relations:
+            self.relation_types.add(rel.infons.get('type'))
+            self.__add_infons(rel.infons)
+
+    def add_document(self, document: BioCDocument):
+        """
+        Count the document.
+        """
+        self.documents += 1
+        self.__add_infons(document.infons)
+        self.__add_annotations(document)
+        for passage in document.passages:
+            self.passages += 1
+            self.__add_infons(passage.infons)
+            if passage.text:
+                self.passage_lengths.add(len(passage.text))
+            self.__add_annotations(passage)
+            for sentence in passage.sentences:
+                self.sentences += 1
+                self.__add_infons(sentence.infons)
+                if sentence.text:
+                    self.sentence_lengths.add(len(sentence.text))
+                self.__add_annotations(sentence)
+
+    def merge(self, other: 'BioCStats') -> 'BioCStats':
+        """
+        Add the counts of other to this object.
+
+        :return: this object
+        """
+        self.documents += other.documents
+        self.passages += other.passages
+        self.sentences += other.sentences
+        self.annotation_types.merge(other.annotation_types)
+        self.relation_types.merge(other.relation_types)
+        for key, n, values in zip(other.infon_keys.names,
+                                  other.infon_keys.counts,
+                                  other.infon_values):
+            i = self.infon_keys.add(key, n)
+            if i == len(self.infon_values):
+                self.infon_values.append(set())
+            mine = self.infon_values[i]
+            for value in values:
+                if len(mine) >= self.max_values:
+                    break
+                mine.add(value)
+        self.passage_lengths.merge(other.passage_lengths)
+        self.sentence_lengths.merge(other.sentence_lengths)
+        self.annotation_lengths.merge(other.annotation_lengths)
+        return self
+
+    def infon_cardinalities(self) -> Dict[str, int]:
+        """
+        :return: the number of distinct values of each infon key, at most
+        max_values
+        """
+        return {key: len(values) for key, values
+                in zip(self.infon_keys.names, self.infon_values)}
+
+    def to_dict(self) -> Dict:
+        """
+        :return: the statistics as a JSON-serializable dict
+        """
+        return {
+            'documents': self.documents,
+            'passages': self.passages,
+            'sentences': self.sentences,
+            'annotations': self.annotations,
+            'relations': self.relations,
+            'annotation_types': self.annotation_types.to_dict(),
+            'relation_types': self.relation_types.to_dict(),
+            'infon_keys': self.infon_keys.to_dict(),
+            'infon_cardinalities': self.infon_cardinalities(),
+            'saturated_infon_keys': sorted(
+                key for key, values
+                in zip(self.infon_keys.names, self.infon_values)
+                if len(values) >= self.max_values),
+            'passage_lengths': self.passage_lengths.to_dict(),
+            'sentence_lengths': self.sentence_lengths.to_dict(),
+            'annotation_lengths': self.annotation_lengths.to_dict(),
+        }
+
+    def __str__(self):
+        return 'BioCStats[documents=%d,passages=%d,sentences=%d,' \
+               'annotations=%d,relations=%d]' \
+               % (self.documents, self.passages, self.sentences,
+                  self.annotations, self.relations)
+
+    def __repr__(self):
+        return str(self)
+
+
+def _documents(source) -> Iterable:
+    if isinstance(source, BioCCollection):
+        return source.documents
+    if isinstance(source, BioCDocument):
+        return (source, )
+    return source
+
+
+def collect(source, *,
+            format: str = None,  # pylint: disable=redefined-builtin
+            max_values: int = 100000) -> BioCStats:
+    """
+    Collect the statistics of a collection, a reader, or a file in one
+    pass.
+
+    :param source: BioCCollection, BioCDocument, an iterable of documents
+    (e.g., a reader), or the name of a BioC XML, JSON, or jsonlines file
+    :param format: 'xml', 'json', or 'jsonl' if source is a file name.
+    Defaults to 'jsonl' for files ending in .jsonl or .jsonlines, 'json' for
+    files ending in .json, and 'xml' otherwise
+    :param max_values: the maximum number of distinct values kept for each
+    infon key
+    :return: the statistics
+    """
+    return _collect(source, format, max_values)
+
+
+def _collect(source, fmt: Optional[str], max_values: int) -> BioCStats:
+    stats = BioCStats(max_values)
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if fmt is None:
+            fmt = file_format(path)
+        if fmt == 'xml':
+            for document in BioCXMLDocumentReader(path):
+                stats.add_document(document)
+        elif fmt == 'json':
+            with open(path, encoding='utf8') as fp:
+                for document in load_json(fp).documents:
+                    stats.add_document(document)
+        elif fmt == 'jsonl':
+            with open(path, encoding='utf8') as fp:
+                for obj in BioCJsonIterReader(fp):
+                    if isinstance(obj, BioCDocument):
+                        stats.add_document(obj)
+        else:
+            raise ValueError('Unknown format: %s' % fmt)
+        return stats
+    for document in _documents(source):
+        stats.add_document(document)
+    return stats
+
+
+def _collect_file(task) -> BioCStats:
+    path, fmt, max_values = task
+    return _collect(path, fmt, max_values)
+
+
+def collect_files(paths: Iterable[Union[str, os.PathLike]], *,
+                  format: str = None,  # pylint: disable=redefined-builtin
+                  workers: int = None,
+                  max_values: int = 100000) -> BioCStats:
+    """
+    Collect the statistics of many files, one file per task in a process
+    pool, and merge them.
+
+    :param paths: the names of BioC XML, JSON, or jsonlines files
+    :param format: 'xml', 'json', or 'jsonl'. Defaults to the file extension
+    :param workers: the number of processes. Defaults to the number of
+    CPUs. If 1, files are read in this process
+    :param max_values: the maximum number of distinct values kept for each
+    infon key
+    :return: the merged statistics
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = ((path, format, max_values) for path in paths)
+    if workers == 1:
+        results = map(_collect_file, tasks)
+    else:
+        results = pipeline.imap(_collect_file, tasks, workers=workers,
+                                ordered=False)
+    stats = BioCStats(max_values)
+    for partial in results:
+        stats.merge(partial)
+    return stats
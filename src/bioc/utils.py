@@ -1,10 +1,114 @@
 """
 Utilities
 """
-from typing import Tuple
+from typing import Tuple, Collection, FrozenSet, Optional, Union
 
 from lxml import etree
 
+# Fields of documents, passages, and sentences that can be projected away
+# during decoding. Annotations and relations are either built completely or
+# skipped.
+PROJECTION_FIELDS = frozenset({'infons', 'text', 'annotations', 'relations'})
+PROJECTION_LEVELS = frozenset({'passages', 'sentences'})
+
+
+def projection(skip: Optional[Collection[str]] = None,
+               fields: Optional[Collection[str]] = None) -> FrozenSet[str]:
+    """
+    Return the names of the levels and fields that are not materialized
+    during decoding.
+
+    :param skip: levels (passages, sentences) and fields (infons, text,
+    annotations, relations) to skip
+    :param fields: fields to materialize; all other fields are skipped.
+    None materializes all fields.
+    :return: the skipped levels and fields
+    """
+    skipped = frozenset(skip or ())
+    if fields is not None:
+        fields = frozenset(fields)
+        unknown = fields - PROJECTION_FIELDS
+        if unknown:
+            raise ValueError('Unknown fields: %s' % ', '.join(sorted(unknown)))
+        skipped |= PROJECTION_FIELDS - fields
+    unknown = skipped - PROJECTION_FIELDS - PROJECTION_LEVELS
+    if unknown:
+        raise ValueError('Unknown fields: %s' % ', '.join(sorted(unknown)))
+    return skipped
+
+
+class StringCache:
+    """
+    A bounded cache that maps equal strings to one shared object.
+
+    Decoders use it for infon keys and values, which repeat across a
+    collection. The cache keeps two generations of at most ``maxsize // 2``
+    strings each. When the young generation is full, it becomes the old one
+    and the previous old generation is dropped, so strings that are no
+    longer seen, such as unique ids, are evicted while frequent strings are
+    kept.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        """
+        :param maxsize: the maximum number of cached strings
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must not be negative: %s' % maxsize)
+        self.maxsize = maxsize
+        self.__young = {}
+        self.__old = {}
+
+    def __call__(self, s: Optional[str]) -> Optional[str]:
+        try:
+            return self.__young[s]
+        except KeyError:
+            pass
+        if self.maxsize == 0:
+            return s
+        s = self.__old.pop(s, s)
+        if len(self.__young) >= max(self.maxsize // 2, 1):
+            self.__old = self.__young
+            self.__young = {}
+        self.__young[s] = s
+        return s
+
+    def __len__(self):
+        return len(self.__young) + len(self.__old)
+
+    def clear(self):
+        """
+        Removes all cached strings.
+        """
+        self.__young.clear()
+        self.__old.clear()
+
+
+def string_cache(intern: Union[bool, StringCache]) -> Optional[StringCache]:
+    """
+    :param intern: True for a new cache, False for no cache, or a cache to
+    share between decoders
+    :return: the string cache, or None
+    """
+    if isinstance(intern, StringCache):
+        return intern
+    if intern:
+        return StringCache()
+    return None
+
+
+def file_format(path: str) -> str:
+    """
+    :param path: the name of a BioC file
+    :return: 'jsonl' for files ending in .jsonl or .jsonlines, 'json' for
+    files ending in .json, and 'xml' otherwise
+    """
+    if path.endswith(('.jsonl', '.jsonlines')):
+        return 'jsonl'
+    if path.endswith('.json'):
+        return 'json'
+    return 'xml'
+
 
 def pad_char(text: str, width: int, char: str = '\n') -> str:
     """Pads a text until length width."""
@@ -16,10 +120,82 @@ def pad_char(text: str, width: int, char: str = '\n') -> str:
     return text
 
 
+def _join_segments(segments, start: int, char: str, error) -> str:
+    """
+    Join (offset, text) segments in one pass, padding the gaps between them
+    with char.
+
+    :param start: the offset of the first character
+    :param error: returns the exception raised if a segment starts before
+    the end of the previous one
+    """
+    parts = []
+    pos = start
+    for offset, text in segments:
+        if offset < pos:
+            raise error(offset)
+        if offset > pos:
+            parts.append(char * (offset - pos))
+        parts.append(text)
+        pos = offset + len(text)
+    return ''.join(parts)
+
+
+def _cached_text(obj, start: int, segments: list):
+    """
+    :return: the text cached on obj if it was built from the same start and
+    (offset, text) segments, or None. Texts are compared by identity, so
+    the check does not compare the characters.
+    """
+    cache = obj._text_cache
+    if cache is not None and cache[0] == start \
+            and len(cache[1]) == len(segments) \
+            and all(a[0] == b[0] and a[1] is b[1]
+                    for a, b in zip(cache[1], segments)):
+        return cache[2]
+    return None
+
+
+def _passage_text(passage) -> str:
+    if passage.text:
+        return passage.text
+    # one (offset, text) pair per sentence
+    segments = [(s.offset, s.text) for s in passage.sentences]
+    text = _cached_text(passage, passage.offset, segments)
+    if text is None:
+        for offset, sentence_text in segments:
+            assert sentence_text, 'BioC sentence has no text: %s' % offset
+        text = _join_segments(
+            segments, passage.offset, ' ',
+            lambda offset: ValueError('Overlapping sentences %s' % offset))
+        passage._text_cache = (passage.offset, segments, text)
+    return text
+
+
+def _document_text(document) -> str:
+    if document.text:
+        return document.text
+    # one (offset, text) pair per passage; the texts of passages are cached
+    segments = [(p.offset, _passage_text(p)) for p in document.passages]
+    text = _cached_text(document, 0, segments)
+    if text is None:
+        text = _join_segments(
+            segments, 0, '\n',
+            lambda offset: ValueError('%s: overlapping passages %s'
+                                      % (document.id, offset)))
+        document._text_cache = (0, segments, text)
+    return text
+
+
 def get_text(obj) -> Tuple[int, str]:
     """
     Return text with its offset in the document
 
+    The text of a passage or document without text is rebuilt from its
+    sentences or passages in linear time, and cached on the object until
+    the offset of the passage or the offsets and texts of its sentences or
+    passages change.
+
     :param obj: BioCDocument, BioCPassage, or BioCSentence
     :return: offset, text
     """
@@ -28,30 +204,9 @@ def get_text(obj) -> Tuple[int, str]:
     if isinstance(obj, BioCSentence):
         return obj.offset, obj.text
     elif isinstance(obj, BioCPassage):
-        if obj.text:
-            return obj.offset, obj.text
-        text = ''
-        for sentence in obj.sentences:
-            try:
-                text = pad_char(text, sentence.offset - obj.offset, ' ')
-                assert sentence.text, \
-                    'BioC sentence has no text: %s' % sentence.offset
-                text += sentence.text
-            except ValueError:
-                raise ValueError('Overlapping sentences %s' % sentence.offset)
-        return obj.offset, text
+        return obj.offset, _passage_text(obj)
     elif isinstance(obj, BioCDocument):
-        if obj.text:
-            return 0, obj.text
-        text = ''
-        for passage in obj.passages:
-            try:
-                text = pad_char(text, passage.offset)
-                text += get_text(passage)[1]
-            except ValueError:
-                raise ValueError('%s: overlapping passages %s'
-                                 % (obj.id, passage.offset))
-        return 0, text
+        return 0, _document_text(obj)
     else:
         raise TypeError('Object of type %s must be BioCCollection, '
                         'BioCDocument, BioCPassage, or BioCSentence'
@@ -1,9 +1,22 @@
 """
 Validate BioC data structure
 """
-from typing import Callable, List
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Set, Dict, Tuple, Union, Iterable, \
+    Iterator, TextIO, Optional
 
-from bioc.datastructure import BioCDocument, BioCCollection, BioCSentence
+from bioc import pipeline
+from bioc.biocjson import backend
+from bioc.biocjson.decoder import fromJSON, load as load_json
+from bioc.biocxml.decoder import BioCXMLDecoder
+from bioc.biocxml.scanner import iter_document_spans, parse_span
+from bioc.datastructure import BioCDocument, BioCCollection, BioCSentence, \
+    BioCPassage, BioCAnnotation, BioCRelation
+from bioc.utils import file_format
 
 
 # pylint: disable=unused-argument
@@ -25,31 +38,30 @@ class BioCValidator:
 
     def validate_doc(self, document: BioCDocument):
         """Validate a single document."""
-        annotations = []
-        annotations.extend(document.annotations)
-        annotations.extend(document.relations)
-        for passage in document.passages:
-            annotations.extend(passage.annotations)
-            annotations.extend(passage.relations)
-            for sentence in passage.sentences:
-                annotations.extend(sentence.annotations)
-                annotations.extend(sentence.relations)
+        ids = self.__ids(document)
 
         self.current_docid = document.id
         self.traceback.append(document)
 
-        text = self.__get_doc_text(document)
+        # build the text of each passage once, for both the document and the
+        # passage annotations
+        passage_texts = []
+        for passage in document.passages:
+            self.traceback.append(passage)
+            passage_texts.append(self.__get_passage_text(passage))
+            self.traceback.pop()
+
+        text = self.__get_doc_text(document, passage_texts)
         self._validate_ann(document.annotations, text, 0)
-        self._validate_rel(annotations,
+        self._validate_rel(ids,
                            document.relations,
                            'document %s' % document.id)
 
-        for passage in document.passages:
+        for passage, text in zip(document.passages, passage_texts):
             self.traceback.append(passage)
 
-            text = self.__get_passage_text(passage)
             self._validate_ann(passage.annotations, text, passage.offset)
-            self._validate_rel(annotations,
+            self._validate_rel(ids,
                                passage.relations,
                                'document %s --> passage %s'
                                % (document.id, passage.offset))
@@ -59,7 +71,7 @@ class BioCValidator:
                 self._validate_ann(sentence.annotations,
                                    sentence.text,
                                    sentence.offset)
-                self._validate_rel(annotations,
+                self._validate_rel(ids,
                                    sentence.relations,
                                    'document %s --> sentence %s'
                                    % (document.id, sentence.offset))
@@ -71,7 +83,7 @@ class BioCValidator:
         self.traceback.append(sentence)
         self._validate_ann(sentence.annotations,sentence.text,
                            sentence.offset)
-        self._validate_rel(sentence.annotations,
+        self._validate_rel({ann.id for ann in sentence.annotations},
                            sentence.relations,
                            'sentence %s' % sentence.offset)
         self.traceback.pop()
@@ -81,12 +93,18 @@ class BioCValidator:
         for document in collection.documents:
             self.validate_doc(document)
 
-    def _validate_rel(self, annotations, relations, path):
+    def _validate_rel(self, ids: Set[str], relations, path):
+        """
+        :param ids: the ids of the annotations and relations that nodes can
+        refer to
+        """
         for relation in relations:
+            self.traceback.append(relation)
             for node in relation.nodes:
-                if not self.__contains(annotations, node.refid):
+                if node.refid not in ids:
                     self.onerror('Cannot find node %s in %s'  % (node, path),
                                  self.traceback)
+            self.traceback.pop()
 
     def _validate_ann(self, annotations, text, offset):
         for ann in annotations:
@@ -107,53 +125,306 @@ class BioCValidator:
                     self.traceback)
             self.traceback.pop()
 
-    @classmethod
-    def __contains(cls, annotations, ann_id):
-        for ann in annotations:
-            if ann.id == ann_id:
-                return True
-        return False
+    @staticmethod
+    def __ids(document: BioCDocument) -> Set[str]:
+        """
+        :return: the ids of all annotations and relations in the document
+        """
+        ids = set()
+        for obj in [document] + document.passages:
+            ids.update(ann.id for ann in obj.annotations)
+            ids.update(rel.id for rel in obj.relations)
+        for passage in document.passages:
+            for sentence in passage.sentences:
+                ids.update(ann.id for ann in sentence.annotations)
+                ids.update(rel.id for rel in sentence.relations)
+        return ids
+
+    def __fill_newline(self, parts: List[str], end: int, offset: int) -> int:
+        """
+        Pad parts, whose text ends at end, with newlines up to offset.
 
-    def __fill_newline(self, text, offset):
-        dis = offset - len(text)
+        :return: the new end of the text
+        """
+        dis = offset - end
         if dis < 0:
+            text = ''.join(parts)
             self.onerror('%s: Overlap with previous text: '
                          'len[%d] vs next offset[%d]\n%s'
-                         % (self.current_docid, len(text), offset, text),
+                         % (self.current_docid, end, offset, text),
                          self.traceback)
+            return end
         if dis > 0:
-            text += '\n' * dis
-        return text
+            parts.append('\n' * dis)
+        return offset
 
     def __get_passage_text(self, passage):
         if passage.text:
             return passage.text
 
-        text = ''
+        parts = []
+        end = passage.offset
         for sentence in passage.sentences:
             self.traceback.append(sentence)
-            text = self.__fill_newline(text, sentence.offset)
+            end = self.__fill_newline(parts, end, sentence.offset)
             if sentence.text:
-                text += sentence.text
+                parts.append(sentence.text)
+                end += len(sentence.text)
             else:
                 self.onerror(
                     '%s: BioC sentence has no text: %s'
                     % (self.current_docid, sentence.offset),
                     self.traceback)
             self.traceback.pop()
-        return text
+        return ''.join(parts)
 
-    def __get_doc_text(self, document):
+    def __get_doc_text(self, document, passage_texts):
         if document.text:
             return document.text
 
-        text = ''
-        for passage in document.passages:
-            text = self.__fill_newline(text, passage.offset)
-            text += self.__get_passage_text(passage)
-        return text
+        parts = []
+        end = 0
+        for passage, text in zip(document.passages, passage_texts):
+            end = self.__fill_newline(parts, end, passage.offset)
+            parts.append(text)
+            end += len(text)
+        return ''.join(parts)
 
 
 def validate(collection, onerror: Callable[[str, List], None] = _default_error):
     """Validate BioC data structure."""
     BioCValidator(onerror).validate(collection)
+
+
+def _traceback_path(traceback: List) -> str:
+    """
+    :return: the location of the last object in the traceback, e.g.,
+    ``document 1 --> passage 0 --> annotation T1``
+    """
+    names = []
+    for obj in traceback:
+        if isinstance(obj, BioCDocument):
+            names.append('document %s' % obj.id)
+        elif isinstance(obj, BioCPassage):
+            names.append('passage %s' % obj.offset)
+        elif isinstance(obj, BioCSentence):
+            names.append('sentence %s' % obj.offset)
+        elif isinstance(obj, BioCAnnotation):
+            names.append('annotation %s' % obj.id)
+        elif isinstance(obj, BioCRelation):
+            names.append('relation %s' % obj.id)
+    return ' --> '.join(names)
+
+
+def _error_record(docid: Optional[str], traceback: List, msg: str) -> Dict:
+    annid = None
+    if traceback and isinstance(traceback[-1], (BioCAnnotation, BioCRelation)):
+        annid = traceback[-1].id
+    return {'docid': docid, 'path': _traceback_path(traceback),
+            'annotation': annid, 'message': msg}
+
+
+def _validate_obj(obj) -> Tuple[Optional[str], List[Dict]]:
+    """
+    Validate a document or sentence and collect its errors instead of
+    raising them.
+
+    :return: the document id and the error records
+    """
+    errors = []
+    validator = BioCValidator()
+    validator.onerror = lambda msg, traceback: errors.append(
+        _error_record(validator.current_docid, traceback, msg))
+    docid = getattr(obj, 'id', None)
+    try:
+        if isinstance(obj, BioCDocument):
+            validator.validate_doc(obj)
+        elif isinstance(obj, BioCSentence):
+            validator.validate_sen(obj)
+        else:
+            raise TypeError('Object of type %s must be BioCDocument or '
+                            'BioCSentence' % obj.__class__.__name__)
+    except Exception as e:  # pylint: disable=broad-except
+        # keep validating the stream if a document is malformed
+        errors.append(_error_record(docid, validator.traceback,
+                                    'Cannot validate: %r' % e))
+    return docid, errors
+
+
+def _validate_objs(objs: List) -> List[Tuple[Optional[str], List[Dict]]]:
+    return [_validate_obj(obj) for obj in objs]
+
+
+def _validate_json_lines(lines: List[str]) \
+        -> List[Tuple[Optional[str], List[Dict]]]:
+    results = []
+    for line in lines:
+        try:
+            obj = fromJSON(backend.loads(line))
+        except Exception as e:  # pylint: disable=broad-except
+            results.append((None, [_error_record(
+                None, [], 'Cannot decode: %r' % e)]))
+        else:
+            results.append(_validate_obj(obj))
+    return results
+
+
+def _validate_xml_range(task: Tuple[str, int, int]) \
+        -> List[Tuple[Optional[str], List[Dict]]]:
+    path, start, end = task
+    decoder = BioCXMLDecoder()
+    results = []
+    with open(path, 'rb') as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for offset, length in iter_document_spans(buf, start, end):
+            try:
+                obj = decoder.decode_document(parse_span(buf, offset, length))
+            except Exception as e:  # pylint: disable=broad-except
+                results.append((None, [_error_record(
+                    None, [], 'Cannot decode at byte %d: %r' % (offset, e))]))
+            else:
+                results.append(_validate_obj(obj))
+    return results
+
+
+def _batched(items: Iterable, batch_size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _xml_ranges(path: str, batch_size: int) -> Iterator[Tuple[str, int, int]]:
+    """
+    Group the documents of a BioC XML file into byte ranges of batch_size
+    documents, without parsing them.
+    """
+    with open(path, 'rb') as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for spans in _batched(iter_document_spans(buf), batch_size):
+            offset, length = spans[-1]
+            yield path, spans[0][0], offset + length
+
+
+def _json_lines(path: str, batch_size: int) -> Iterator[List[str]]:
+    with open(path, encoding='utf8') as fp:
+        yield from _batched((line for line in fp if line.strip()), batch_size)
+
+
+class ValidationSummary:
+    """
+    Counts of a validation run.
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self.invalid_documents = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def to_dict(self) -> Dict:
+        return {'documents': self.documents,
+                'invalid_documents': self.invalid_documents,
+                'errors': self.errors,
+                'elapsed': self.elapsed}
+
+    def __str__(self):
+        return 'ValidationSummary[documents=%d,invalid_documents=%d,' \
+               'errors=%d,elapsed=%.3fs]' \
+               % (self.documents, self.invalid_documents, self.errors,
+                  self.elapsed)
+
+    def __repr__(self):
+        return str(self)
+
+
+def validate_stream(source, report: Union[str, Path, TextIO] = None, *,
+                    format: str = None,  # pylint: disable=redefined-builtin
+                    workers: int = None,
+                    batch_size: int = 100,
+                    max_inflight: int = None) -> ValidationSummary:
+    """
+    Validate a stream of BioC documents in a process pool.
+
+    Unlike ``validate``, errors are not raised but written to ``report`` as
+    jsonlines, one object per error with the keys ``docid``, ``path``,
+    ``annotation`` (the id of the annotation or relation, or null), and
+    ``message``. Documents are validated in batches, and at most
+    ``max_inflight`` batches are read ahead, so memory stays bounded.
+
+    If ``source`` is the name of a BioC XML file, the parent process only
+    scans the file for document boundaries, and the workers parse the
+    documents themselves. The same holds for the lines of a jsonlines file.
+    A BioC JSON file is decoded as a whole in the parent process.
+
+    :param source: the name of a BioC XML, JSON, or jsonlines file, or an
+    iterable of documents, e.g., BioCXMLDocumentReader or BioCJsonIterReader
+    :param report: a filename or text file object for the errors. If None,
+    only the summary is returned
+    :param format: 'xml', 'json', or 'jsonl'. Defaults to 'jsonl' for files
+    ending in .jsonl or .jsonlines, 'json' for files ending in .json, and
+    'xml' otherwise
+    :param workers: the number of processes. Defaults to the number of
+    CPUs. If 1, documents are validated in this process
+    :param batch_size: the number of documents sent to a worker at once
+    :param max_inflight: the maximum number of batches submitted but not yet
+    reported. Defaults to twice the number of workers
+    :return: the summary counts
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be positive: %s' % batch_size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    fmt = format
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if fmt is None:
+            fmt = file_format(path)
+        if fmt == 'xml':
+            func, batches = _validate_xml_range, _xml_ranges(path, batch_size)
+        elif fmt == 'jsonl':
+            func, batches = _validate_json_lines, \
+                            _json_lines(path, batch_size)
+        elif fmt == 'json':
+            with open(path, encoding='utf8') as fp:
+                collection = load_json(fp)
+            func, batches = _validate_objs, \
+                            _batched(collection.documents, batch_size)
+        else:
+            raise ValueError('Unknown format: %s' % fmt)
+    else:
+        func, batches = _validate_objs, _batched(source, batch_size)
+
+    if workers == 1:
+        results = map(func, batches)
+    else:
+        results = pipeline.imap(func, batches, workers=workers,
+                                max_inflight=max_inflight)
+
+    if isinstance(report, (str, os.PathLike)):
+        with open(report, 'w', encoding='utf8') as fp:
+            return _write_report(results, fp)
+    return _write_report(results, report)
+
+
+def _write_report(results: Iterable, fp: Optional[TextIO]) \
+        -> ValidationSummary:
+    summary = ValidationSummary()
+    start = time.perf_counter()
+    for batch in results:
+        for _, errors in batch:
+            summary.documents += 1
+            if errors:
+                summary.invalid_documents += 1
+                summary.errors += len(errors)
+                if fp is not None:
+                    for error in errors:
+                        fp.write(json.dumps(error, ensure_ascii=False))
+                        fp.write('\n')
+    summary.elapsed = time.perf_counter() - start
+    return summary
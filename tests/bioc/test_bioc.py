@@ -1,4 +1,6 @@
 import copy
+import pickle
+import weakref
 from pathlib import Path
 
 import pytest
@@ -107,3 +109,272 @@ def test_BioCColection(collection):
 
     with pytest.raises(ValueError):
         bioc.BioCCollection.of_documents(None)
+
+
+def test_slots(collection):
+    document = collection.documents[0]
+    passage = document.passages[0]
+    sentence = collection.documents[1].passages[0].sentences[0]
+    objects = [collection, document, passage, sentence,
+               passage.annotations[0], passage.annotations[0].locations[0],
+               passage.relations[0], passage.relations[0].nodes[0]]
+    for obj in objects:
+        assert not hasattr(obj, '__dict__'), type(obj).__name__
+        with pytest.raises(AttributeError):
+            obj.foo = 'bar'
+        assert weakref.ref(obj)() is obj
+
+    c = pickle.loads(pickle.dumps(collection))
+    assert biocxml.dumps(c) == biocxml.dumps(collection)
+    c = copy.deepcopy(collection)
+    assert biocxml.dumps(c) == biocxml.dumps(collection)
+
+
+def _annotation(id):
+    ann = bioc.BioCAnnotation()
+    ann.id = id
+    return ann
+
+
+def test_id_index():
+    p = bioc.BioCPassage()
+    p.add_annotation(_annotation('T1'))
+    p.add_annotation(_annotation('T1'))
+    first = p.annotations[0]
+    assert p.get_annotation('T1') is first
+
+    # added through the API
+    ann = _annotation('T2')
+    p.add_annotation(ann)
+    assert p.get('T2') is ann
+
+    # changed directly
+    ann = _annotation('T3')
+    p.annotations.append(ann)
+    assert p.get_annotation('T3') is ann
+    p.annotations[0] = _annotation('T4')
+    assert p.get_annotation('T4') is p.annotations[0]
+    assert p.get_annotation('T1') is p.annotations[1]
+    del p.annotations[:2]
+    with pytest.raises(KeyError):
+        p.get_annotation('T1')
+    with pytest.raises(KeyError):
+        p.get_annotation('T4')
+    p.annotations = [_annotation('T4')]
+    assert p.get_annotation('T4') is p.annotations[0]
+    p.annotations.append(_annotation('T5'))
+    assert p.get_annotation('T5') is p.annotations[1]
+    p.annotations[0].id = 'T6'
+    with pytest.raises(KeyError):
+        p.get_annotation('T4')
+    assert p.get_annotation('T6') is p.annotations[0]
+
+    p.clear_annotations()
+    with pytest.raises(KeyError):
+        p.get_annotation('T5')
+
+    # ids set or changed after the index was built
+    p = bioc.BioCPassage()
+    p.add_annotation(_annotation('T1'))
+    ann = bioc.BioCAnnotation()
+    p.add_annotation(ann)
+    assert p.get('T1') is p.annotations[0]
+    ann.id = 'T2'
+    assert p.get('T2') is ann
+    ann.id = 'T3'
+    assert p.get_annotation('T3') is ann
+    with pytest.raises(KeyError):
+        p.get_annotation('T2')
+
+    rel = bioc.BioCRelation()
+    rel.id = 'R1'
+    p.add_relation(rel)
+    assert p.get('R1') is rel
+    p.clear_relations()
+    with pytest.raises(KeyError):
+        p.get('R1')
+
+
+def test_lookup(collection):
+    document = collection.documents[0]
+    passage = document.passages[0]
+    assert document.lookup('1') is passage.get_annotation('1')
+    assert document.lookup('R1') is passage.get_relation('R1')
+
+    sentence = bioc.BioCSentence()
+    sentence.add_annotation(_annotation('S1'))
+    passage.add_sentence(sentence)
+    assert document.lookup('S1') is sentence.annotations[0]
+    with pytest.raises(KeyError):
+        document.lookup('x')
+
+
+def test_sentence_index():
+    p = bioc.BioCPassage()
+    p.add_sentence(bioc.BioCSentence.of_text('Hello.', 0))
+    p.add_sentence(bioc.BioCSentence.of_text('Bye.', 20))
+    s1, s2 = p.sentences
+    assert p.get_sentence(20) is s2
+    assert p.get_sentence(3) is None
+    assert p.sentence_at(3) is s1
+    assert p.sentence_at(6) is None
+    assert p.sentence_at(23) is s2
+
+    # added out of order through the API
+    s3 = bioc.BioCSentence.of_text('Hi.', 10)
+    p.add_sentence(s3)
+    assert p.get_sentence(10) is s3
+    assert p.sentence_at(12) is s3
+    assert p.sentence_at(23) is s2
+
+    # changed directly
+    s4 = bioc.BioCSentence.of_text('Yes.', 30)
+    p.sentences.append(s4)
+    assert p.sentence_at(31) is s4
+    p.sentences[-1] = s5 = bioc.BioCSentence.of_text('No.', 30)
+    assert p.sentence_at(31) is s5
+    # a changed offset is seen once the stale entry is hit
+    s5.offset = 40
+    assert p.get_sentence(30) is None
+    assert p.get_sentence(40) is s5
+    assert p.sentence_at(41) is s5
+    p.sentences.sort(key=lambda s: -s.offset)
+    assert p.sentence_at(1) is s1
+    p.sentences = [s1]
+    assert p.get_sentence(20) is None
+    assert p.sentence_at(1) is s1
+
+
+def test_passage_index():
+    p1 = bioc.BioCPassage.of_text('Title', 0)
+    p2 = bioc.BioCPassage.of_sentences(bioc.BioCSentence.of_text('Hello.', 6),
+                                       bioc.BioCSentence.of_text('Bye.', 13))
+    document = bioc.BioCDocument.of_passages(p1, p2)
+    assert document.get_passage(6) is p2
+    assert document.get_passage(7) is None
+    assert document.passage_at(4) is p1
+    assert document.passage_at(5) is None
+    assert document.passage_at(16) is p2
+    assert document.passage_at(17) is None
+
+    p3 = bioc.BioCPassage.of_text('Abstract', 20)
+    document.add_passage(p3)
+    assert document.passage_at(27) is p3
+    document.passages.pop()
+    assert document.passage_at(27) is None
+
+
+def test_offset_index_changed():
+    # offsets set or changed after the index was built
+    p = bioc.BioCPassage()
+    s1 = bioc.BioCSentence.of_text('Hello.', 0)
+    p.add_sentence(s1)
+    assert p.get_sentence(0) is s1
+    s2 = bioc.BioCSentence.of_text('Bye.')
+    p.add_sentence(s2)
+    s2.offset = 5
+    assert p.get_sentence(5) is s2
+    s2.offset = 10
+    assert p.sentence_at(12) is s2
+    assert p.get_sentence(5) is None
+
+    document = bioc.BioCDocument()
+    p1 = bioc.BioCPassage.of_text('Title', 0)
+    document.add_passage(p1)
+    assert document.passage_at(1) is p1
+    p2 = bioc.BioCPassage.of_text('Abstract', 0)
+    document.add_passage(p2)
+    p2.offset = 6
+    assert document.get_passage(6) is p2
+    p2.offset = 20
+    assert document.passage_at(22) is p2
+
+
+def test_index_copy():
+    document = bioc.BioCDocument()
+    document.add_passage(bioc.BioCPassage.of_text('Title', 0))
+    document.passages[0].add_annotation(_annotation('T1'))
+    # build the indexes before copying
+    assert document.passage_at(1) is document.passages[0]
+    assert document.passages[0].get('T1') is not None
+    for c in [document.clone(), pickle.loads(pickle.dumps(document)),
+              copy.deepcopy(document)]:
+        assert c.equals(document)
+        assert c.passage_at(1) is c.passages[0]
+        assert c.passages[0].get('T1') is c.passages[0].annotations[0]
+        c.passages[0].annotations[0] = _annotation('T2')
+        assert c.passages[0].get('T2') is c.passages[0].annotations[0]
+        c.add_passage(bioc.BioCPassage.of_text('Abstract', 6))
+        assert c.passage_at(7) is c.passages[1]
+    assert document.passage_at(7) is None
+    assert document.passages[0].get('T1') is document.passages[0].annotations[0]
+
+
+def test_clone(collection):
+    c = collection.clone()
+    assert c is not collection
+    assert c.equals(collection)
+    assert c.structural_hash() == collection.structural_hash()
+    assert biocxml.dumps(c) == biocxml.dumps(collection)
+
+    p1 = collection.documents[0].passages[0]
+    p2 = c.documents[0].passages[0]
+    assert p2 is not p1
+    assert p2.annotations[0] is not p1.annotations[0]
+    assert p2.annotations[0].locations[0] is not p1.annotations[0].locations[0]
+    assert p2.infons is not p1.infons
+    # strings are shared
+    assert p2.text is p1.text
+
+    p2.annotations[0].locations[0].offset += 1
+    assert not c.equals(collection)
+    assert p1.annotations[0].locations[0].offset \
+           != p2.annotations[0].locations[0].offset
+
+
+def test_equals(collection):
+    c = copy.deepcopy(collection)
+    assert c.equals(collection)
+    c.encoding = 'ascii'
+    assert c.equals(collection)
+
+    objects = [
+        (c, collection),
+        (c.documents[0], collection.documents[0]),
+        (c.documents[0].passages[0], collection.documents[0].passages[0]),
+        (c.documents[1].passages[0].sentences[0],
+         collection.documents[1].passages[0].sentences[0]),
+        (c.documents[0].passages[0].annotations[0],
+         collection.documents[0].passages[0].annotations[0]),
+        (c.documents[0].passages[0].relations[0],
+         collection.documents[0].passages[0].relations[0]),
+    ]
+    for obj1, obj2 in objects:
+        assert obj1.equals(obj2)
+        assert obj1.structural_hash() == obj2.structural_hash()
+        assert obj1.clone().equals(obj2)
+        obj1.infons['foo'] = 'bar'
+        assert not obj1.equals(obj2)
+        assert not obj2.equals(obj1)
+        assert not obj1.equals('foo')
+
+    assert not collection.documents[0].equals(collection.documents[1])
+
+
+def test_nested_infons(collection):
+    document = collection.documents[0]
+    document.infons['list'] = ['a', {'b': [1, 2]}]
+    document.infons['dict'] = {'c': 'd'}
+    c = document.clone()
+    assert c.equals(document)
+    assert c.structural_hash() == document.structural_hash()
+    c.infons['list'][1]['b'].append(3)
+    assert document.infons['list'][1]['b'] == [1, 2]
+    assert not c.equals(document)
+    assert c.structural_hash() != document.structural_hash()
+
+    collection.infons['list'] = ['a']
+    other = bioc.BioCCollection().copy_infon(collection)
+    other.infons['list'].append('b')
+    assert collection.infons['list'] == ['a']
+    assert isinstance(collection.structural_hash(), int)
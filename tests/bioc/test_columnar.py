@@ -0,0 +1,88 @@
+import pytest
+
+import bioc
+from bioc.columnar import BioCAnnotationStore
+
+
+def _make_annotation(id, type, *spans, **infons):
+    ann = bioc.BioCAnnotation()
+    ann.id = id
+    ann.text = id.lower()
+    if type is not None:
+        ann.infons['type'] = type
+    ann.infons.update(infons)
+    for offset, length in spans:
+        ann.add_location(bioc.BioCLocation(offset, length))
+    return ann
+
+
+@pytest.fixture
+def annotations():
+    return [
+        _make_annotation('T1', 'Gene', (0, 5)),
+        _make_annotation('T2', 'Disease', (10, 5), (30, 5), identifier='D1'),
+        _make_annotation('T3', 'Gene', (20, 5), identifier='G1'),
+        _make_annotation('T4', None),
+    ]
+
+
+def test_round_trip(annotations):
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    assert len(store) == 4
+    assert store.type_names == ['Gene', 'Disease']
+    assert store.infon_keys == ['identifier']
+    for expected, actual in zip(annotations, store):
+        assert str(actual) == str(expected)
+    assert str(store[-1]) == str(annotations[-1])
+    with pytest.raises(IndexError):
+        store[4]
+    with pytest.raises(ValueError):
+        BioCAnnotationStore.of_annotations(None)
+
+
+def test_copy(annotations):
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    ann = store[0]
+    ann.infons['type'] = 'Chemical'
+    ann.locations[0].offset = 100
+    assert store[0].infons['type'] == 'Gene'
+    assert store[0].locations[0].offset == 0
+
+
+def test_get_annotation(annotations):
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    assert store.index('T3') == 2
+    assert store.get_annotation('T2').infons['identifier'] == 'D1'
+    with pytest.raises(KeyError):
+        store.get_annotation('x')
+
+
+def test_find(annotations):
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    assert store.find() == [0, 1, 2, 3]
+    assert store.find(type='Gene') == [0, 2]
+    assert store.find(type='Chemical') == []
+    assert store.find(start=3, end=12) == [0, 1]
+    # the total span of T2 is [10, 35)
+    assert store.find(start=25, end=28) == [1]
+    assert store.find(type='Gene', start=18) == [2]
+    assert store.find(end=10) == [0]
+    assert [a.id for a in store.overlapping(0, 100, type='Disease')] == ['T2']
+    assert store.count() == 4
+    assert store.count('Gene') == 2
+    assert store.count('Chemical') == 0
+
+
+def test_find_after_add(annotations):
+    store = BioCAnnotationStore.of_annotations(*annotations)
+    assert store.find(start=40, end=50) == []
+    # a long annotation added after the first search
+    store.add_annotation(_make_annotation('T5', 'Gene', (0, 100)))
+    store.add_annotation(_make_annotation('T1', 'Disease', (45, 1)))
+    assert store.find(start=40, end=50) == [4, 5]
+    assert store.find(type='Gene', start=40) == [4]
+    assert store.find(type='Disease', start=12, end=25) == [1]
+    assert store.count('Gene') == 3
+    # the first annotation with the id
+    assert store.index('T1') == 0
+    assert store.types.itemsize == 4
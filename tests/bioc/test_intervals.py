@@ -0,0 +1,75 @@
+import bioc
+from bioc.intervals import BioCIntervalIndex
+
+
+def _annotation(id, *spans):
+    ann = bioc.BioCAnnotation()
+    ann.id = id
+    for offset, length in spans:
+        ann.add_location(bioc.BioCLocation(offset, length))
+    return ann
+
+
+def _make_document():
+    s1 = bioc.BioCSentence.of_text('Hello world.', 0)
+    s2 = bioc.BioCSentence.of_text('Bye.', 13)
+    s1.add_annotation(_annotation('S1', (0, 5)))
+    p1 = bioc.BioCPassage.of_sentences(s1, s2)
+    p1.add_annotation(_annotation('P1', (6, 5)))
+    p1.add_annotation(_annotation('P2', (2, 2), (13, 3)))
+    p2 = bioc.BioCPassage.of_text('Second passage', 20)
+    p2.add_annotation(_annotation('P3', (27, 0)))
+    p2.add_annotation(_annotation('P4'))
+    document = bioc.BioCDocument.of_passages(p1, p2)
+    document.add_annotation(_annotation('D1', (20, 6)))
+    return document
+
+
+def _ids(anns):
+    return [a.id for a in anns]
+
+
+def test_overlapping():
+    index = BioCIntervalIndex(_make_document())
+    assert len(index) == 5
+    assert _ids(index.overlapping(0, 100)) == ['S1', 'P2', 'P1', 'D1', 'P3']
+    assert _ids(index.overlapping(5, 6)) == ['P2']
+    assert _ids(index.overlapping(24, 28)) == ['D1', 'P3']
+    assert _ids(index.overlapping(16, 20)) == []
+    assert _ids(index.overlapping(5, 5)) == []
+
+
+def test_enclosing():
+    index = BioCIntervalIndex(_make_document())
+    assert _ids(index.enclosing(3)) == ['S1', 'P2']
+    assert _ids(index.enclosing(5)) == ['P2']
+    assert _ids(index.enclosing(27)) == []
+    assert _ids(index.enclosing(100)) == []
+
+
+def test_level():
+    index = BioCIntervalIndex(_make_document(), level=bioc.PASSAGE)
+    assert _ids(index.overlapping(0, 100)) == ['P2', 'P1', 'P3']
+
+
+def test_sentence_at():
+    document = _make_document()
+    index = BioCIntervalIndex(document)
+    s1, s2 = document.passages[0].sentences
+    assert index.sentence_at(0) is s1
+    assert index.sentence_at(11) is s1
+    assert index.sentence_at(12) is None
+    assert index.sentence_at(16) is s2
+    assert index.sentence_at(17) is None
+    assert index.sentence_at(-1) is None
+
+
+def test_passage_at():
+    document = _make_document()
+    index = BioCIntervalIndex(document)
+    p1, p2 = document.passages
+    assert index.passage_at(12) is p1
+    assert index.passage_at(18) is None
+    assert index.passage_at(20) is p2
+    assert index.passage_at(33) is p2
+    assert index.passage_at(34) is None
@@ -76,3 +76,28 @@ def test_relations():
 
     with pytest.raises(TypeError):
         next(bioc.relations('Foo'))
+
+
+def test_results():
+    passage = collection.documents[1].passages[0]
+    results = list(bioc.annotations(passage))
+    assert {'3', '4'} == {r.annotation.id for r in results}
+    assert {None} == {r.document for r in results}
+    assert {None} == {r.relation for r in results}
+
+    results = list(bioc.relations(passage.sentences[0]))
+    assert ['R3'] == [r.relation.id for r in results]
+    assert results[0].sentence is passage.sentences[0]
+    assert results[0].annotation is None
+
+    results = list(bioc.sentences(passage))
+    assert [27, 34] == [r.sentence.offset for r in results]
+    assert {None} == {r.document for r in results}
+
+    assert [] == list(bioc.annotations(collection, docid='foo'))
+    results = list(bioc.annotations(collection, docid='2'))
+    assert {'3', '4'} == {r.annotation.id for r in results}
+    assert 'annotation=3' in str(results[0])
+
+    with pytest.raises(AttributeError):
+        results[0].foo = 'bar'
@@ -0,0 +1,134 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from bioc import biocjson
+from bioc.biocjson import backend
+from bioc.biocjson.decoder import parse_collection
+from tests.utils import assert_everything
+
+file = Path(__file__).parent / 'everything.json'
+with open(file, encoding='utf8') as fp:
+    text = fp.read()
+expected = parse_collection(json.loads(text))
+
+
+@pytest.fixture(params=backend.BACKENDS)
+def name(request):
+    if request.param not in backend.available_backends():
+        pytest.skip('%s is not installed' % request.param)
+    backend.use(request.param)
+    yield request.param
+    backend.use()
+
+
+def unicode_collection():
+    collection = biocjson.loads(text)
+    document = collection.documents[0]
+    document.infons['note'] = 'café α-synuclein \U0001f600 "q" \\ /'
+    document.passages[0].text = 'line\nbreak\ttab  '
+    return collection
+
+
+def test_default():
+    backend.use()
+    assert backend.writer() is None
+    assert backend.reader().name == backend.available_backends()[0]
+    assert 'json' in backend.available_backends()
+
+
+def test_loads(name):
+    assert backend.reader().name == name
+    collection = biocjson.loads(text)
+    assert_everything(collection)
+    assert biocjson.toJSON(collection) == biocjson.toJSON(expected)
+
+    collection = biocjson.load(io.StringIO(text))
+    assert biocjson.toJSON(collection) == biocjson.toJSON(expected)
+
+
+def test_iterreader(name, tmp_path):
+    collection = unicode_collection()
+    filepath = tmp_path / 'foo.jsonl'
+    with biocjson.iterwriter(filepath) as writer:
+        for doc in collection.documents:
+            writer.write(doc)
+    with biocjson.iterreader(filepath) as reader:
+        docs = list(reader)
+    assert [biocjson.toJSON(d) for d in docs] \
+        == [biocjson.toJSON(d) for d in collection.documents]
+
+
+def test_dumps(name):
+    collection = unicode_collection()
+    obj = biocjson.toJSON(collection)
+    s = biocjson.dumps(collection)
+    assert json.loads(s) == obj
+    assert biocjson.toJSON(biocjson.loads(s)) == obj
+
+    fp = io.StringIO()
+    biocjson.dump(collection, fp)
+    assert fp.getvalue() == s
+
+    for doc in collection.documents:
+        assert json.loads(biocjson.dumps(doc)) == biocjson.toJSON(doc)
+    # kwargs always go to json
+    assert biocjson.dumps(collection, indent=2) \
+        == json.dumps(obj, indent=2)
+
+
+def test_nan(name):
+    collection = biocjson.loads(text)
+    collection.infons['nan'] = float('nan')
+    collection.infons['inf'] = float('-inf')
+    backend.use()
+    s = biocjson.dumps(collection)
+    backend.use(name)
+    c = biocjson.loads(s)
+    assert c.infons['nan'] != c.infons['nan']
+    assert c.infons['inf'] == float('-inf')
+    with pytest.raises(ValueError):
+        biocjson.loads('{"bioctype": ')
+
+
+def test_dumps_fallback(name):
+    collection = biocjson.loads(text)
+    collection.infons['nan'] = float('nan')
+    collection.infons['inf'] = float('inf')
+    collection.infons['big'] = 1 << 70
+    c = biocjson.loads(biocjson.dumps(collection))
+    assert c.infons['nan'] != c.infons['nan']
+    assert c.infons['inf'] == float('inf')
+    assert c.infons['big'] == 1 << 70
+
+    # None is still written as null
+    collection = biocjson.loads(text)
+    collection.infons['none'] = None
+    c = biocjson.loads(biocjson.dumps(collection))
+    assert c.infons['none'] is None
+
+
+def test_identical():
+    collection = unicode_collection()
+    backend.use()
+    s = biocjson.dumps(collection)
+    assert s == json.dumps(biocjson.toJSON(collection))
+    try:
+        backend.use('json')
+        assert biocjson.dumps(collection) == s
+    finally:
+        backend.use()
+
+
+def test_get_backend():
+    with pytest.raises(ValueError):
+        backend.get_backend('foo')
+    with pytest.raises(ValueError):
+        backend.use('foo')
+    assert backend.get_backend('json').loads('[1]') == [1]
+    if 'ujson' not in backend.available_backends():
+        with pytest.raises(ImportError):
+            backend.use('ujson')
+    backend.use()
@@ -105,3 +105,78 @@ def test_iterreader_sentence():
             collection.documents[1].passages[0].add_sentence(obj)
 
     assert_everything(collection)
+
+
+def test_load_skip():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp, skip={'relations', 'sentences'})
+    document = collection.documents[0]
+    assert '1' == document.id
+    assert 0 == len(document.relations)
+    assert 0 == len(document.passages[0].relations)
+    assert 2 == len(document.passages[0].annotations)
+    assert 0 == len(collection.documents[1].passages[0].sentences)
+
+    with pytest.raises(ValueError):
+        biocjson.loads('{}', fields={'foo'})
+
+
+def test_iterreader_fields():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp)
+
+    s = io.StringIO()
+    with biocjson.iterwriter(s) as writer:
+        for doc in collection.documents:
+            writer.write(doc)
+
+    with biocjson.iterreader(io.StringIO(s.getvalue()),
+                             fields={'text'}) as reader:
+        documents = list(reader)
+    passage = documents[0].passages[0]
+    assert 'abcdefghijklmnopqrstuvwxyz' == passage.text
+    assert {} == passage.infons
+    assert 0 == len(passage.annotations)
+    sentence = documents[1].passages[0].sentences[1]
+    assert '测试Non-ASCII' == sentence.text
+    assert 0 == len(sentence.annotations)
+
+
+def test_iterreader_intern():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp, intern=True)
+    ann1, ann2 = collection.documents[0].passages[0].annotations
+    (k1, v1), = ann1.infons.items()
+    (k2, v2), = ann2.infons.items()
+    assert k1 is k2 and v1 is v2
+
+    s = io.StringIO()
+    with biocjson.iterwriter(s) as writer:
+        for doc in collection.documents:
+            writer.write(doc)
+
+    # each line is decoded by its own json.loads call
+    with biocjson.iterreader(io.StringIO(s.getvalue()),
+                             intern=True) as reader:
+        doc1, doc2 = list(reader)
+    ann1 = doc1.passages[0].annotations[0]
+    ann2 = doc2.passages[0].sentences[0].annotations[0]
+    (k1, v1), = ann1.infons.items()
+    (k2, v2), = ann2.infons.items()
+    assert k1 is k2 and v1 is v2
+
+    # separate calls of fromJSON share one cache
+    line1, line2 = s.getvalue().splitlines()
+    doc1 = biocjson.fromJSON(json.loads(line1), intern=True)
+    doc2 = biocjson.fromJSON(json.loads(line2), intern=True)
+    ann1 = doc1.passages[0].annotations[0]
+    ann2 = doc2.passages[0].sentences[0].annotations[0]
+    (k1, v1), = ann1.infons.items()
+    (k2, v2), = ann2.infons.items()
+    assert k1 is k2 and v1 is v2
+
+    with biocjson.iterreader(io.StringIO(s.getvalue()),
+                             intern=False) as reader:
+        doc1, doc2 = list(reader)
+    assert 'annotation-infon-value' \
+           == doc1.passages[0].annotations[0].infons['annotation-infon-key']
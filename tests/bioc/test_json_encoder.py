@@ -1,8 +1,11 @@
+import io
+import json
 from pathlib import Path
 
 import pytest
 
-from bioc import biocjson
+from bioc import biocjson, biocxml
+from bioc.biocjson.encoder import BioCJSONEncoder
 from tests.utils import assert_everything
 
 file = Path(__file__).parent / 'everything.json'
@@ -53,3 +56,65 @@ def test_toJSON():
     with pytest.raises(TypeError):
         biocjson.toJSON({})
 
+
+
+def test_dispatch():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp)
+    expected = json.dumps(collection, cls=BioCJSONEncoder, indent=2)
+    assert expected == biocjson.dumps(collection, indent=2)
+    f = io.StringIO()
+    biocjson.dump(collection, f, indent=2)
+    assert expected == f.getvalue()
+
+    # lists of BioC objects go through the encoder class
+    docs = biocjson.dumps(collection.documents)
+    assert [biocjson.toJSON(d) for d in collection.documents] \
+           == json.loads(docs)
+
+    # subclasses use the encoder of their base class
+    xml = biocxml.dumps(collection)
+    with biocxml.iterparse(io.BytesIO(xml.encode('utf8')), lazy=True) \
+            as reader:
+        doc = next(reader)
+    assert biocjson.toJSON(collection.documents[0]) == biocjson.toJSON(doc)
+
+
+def test_emit():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp)
+    expected = json.dumps(biocjson.toJSON(collection), separators=(',', ':'),
+                          sort_keys=True)
+    assert expected == biocjson.dumps(collection, separators=(',', ':'),
+                                      sort_keys=True)
+
+    doc = collection.documents[0]
+    doc.infons['int'] = 1
+    doc.infons['bool'] = True
+    doc.infons['none'] = None
+    doc.infons['text'] = 'Non-ASCII 测试 "quoted"\n'
+    doc.passages[0].annotations[0].text = None
+    doc.passages[0].annotations[0].infons[2] = 'int key'
+    doc.passages[0].annotations[0].locations[0].offset = 1.5
+    doc.passages[0].relations[0].nodes[0].refid = None
+
+    for obj in [collection, doc, doc.passages[0],
+                collection.documents[1].passages[0].sentences[0],
+                doc.passages[0].annotations[0], doc.passages[0].relations[0]]:
+        assert json.dumps(biocjson.toJSON(obj)) == biocjson.dumps(obj)
+
+
+def test_documents_infon():
+    with open(file, encoding='utf8') as fp:
+        collection = biocjson.load(fp)
+    collection.infons['documents'] = []
+    collection.infons['x'] = '"documents": []'
+    obj = biocjson.toJSON(collection)
+    for kwargs in [{}, {'ensure_ascii': False}, {'sort_keys': True},
+                   {'separators': (',', ':')}]:
+        s = biocjson.dumps(collection, **kwargs)
+        assert json.dumps(obj, **kwargs) == s
+        assert len(json.loads(s)['documents']) == len(collection.documents)
+    fp = io.StringIO()
+    biocjson.dump(collection, fp)
+    assert json.dumps(obj) == fp.getvalue()
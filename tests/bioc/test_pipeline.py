@@ -0,0 +1,158 @@
+import functools
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+import bioc
+from bioc import biocxml, biocjson, pipeline
+from tests.utils import assert_everything
+
+file = Path(__file__).parent / 'everything.xml'
+
+
+def _identity(document):
+    return document
+
+
+def _add_infon(document):
+    document.infons['processed'] = 'yes'
+    return document
+
+
+def _drop_first(document):
+    return None if document.id == '1' else document
+
+
+def _fail(document):
+    raise ValueError(document.id)
+
+
+def _crash_once(marker, document):
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    return document
+
+
+def _crash_on(ids, document):
+    if document.id in ids:
+        os._exit(1)
+    return document
+
+
+class _BrokenOnSubmit(ProcessPoolExecutor):
+    """Raises BrokenProcessPool on the first submit, as a pool does when a
+    worker died before the crash was noticed."""
+    broken = True
+
+    def submit(self, *args, **kwargs):
+        if _BrokenOnSubmit.broken:
+            _BrokenOnSubmit.broken = False
+            raise BrokenProcessPool('A child process terminated abruptly')
+        return super(_BrokenOnSubmit, self).submit(*args, **kwargs)
+
+
+def test_run_xml():
+    f = io.BytesIO()
+    with biocxml.iterparse(str(file)) as reader, \
+            biocxml.iterwrite(f) as writer:
+        writer.write_collection_info(reader.get_collection_info())
+        stats = pipeline.run(_add_infon, reader, writer, workers=2)
+    assert 2 == stats.read == stats.processed == stats.written
+    assert 0 == stats.restarts
+    assert {'read', 'process', 'write', 'total'} == set(stats.throughput())
+    assert 'PipelineStats[' in str(stats)
+
+    collection = biocxml.loads(f.getvalue().decode('utf8'))
+    assert_everything(collection)
+    assert {'yes'} == {d.infons['processed'] for d in collection.documents}
+
+
+def test_run_json():
+    with open(file, encoding='utf8') as fp:
+        collection = biocxml.load(fp)
+    s = io.StringIO()
+    with biocjson.iterwriter(s) as writer:
+        for document in collection.documents:
+            writer.write(document)
+
+    results = []
+    with biocjson.iterreader(io.StringIO(s.getvalue())) as reader:
+        stats = pipeline.run(_drop_first, reader, results.append, workers=2,
+                             ordered=False)
+    assert 2 == stats.processed
+    assert 1 == stats.written
+    assert ['2'] == [d.id for d in results]
+
+    with pytest.raises(TypeError):
+        pipeline.run(_identity, [], 'foo')
+
+
+def test_imap_order():
+    documents = []
+    for i in range(20):
+        document = bioc.BioCDocument()
+        document.id = str(i)
+        documents.append(document)
+    results = list(pipeline.imap(_identity, documents, workers=2,
+                                 max_inflight=3))
+    assert [d.id for d in documents] == [d.id for d in results]
+
+    results = list(pipeline.imap(_identity, documents, workers=2,
+                                 ordered=False))
+    assert {d.id for d in documents} == {d.id for d in results}
+
+    with pytest.raises(ValueError):
+        list(pipeline.imap(_identity, documents, max_inflight=0))
+
+
+def test_imap_error():
+    with pytest.raises(ValueError):
+        list(pipeline.imap(_fail, [bioc.BioCDocument()], workers=1))
+
+
+def test_imap_crash(tmp_path):
+    func = functools.partial(_crash_once, str(tmp_path / 'marker'))
+    documents = [bioc.BioCDocument() for _ in range(5)]
+    stats = pipeline.PipelineStats()
+    results = list(pipeline.imap(func, documents, workers=2, stats=stats))
+    assert 5 == len(results)
+    assert 1 == stats.restarts
+
+    func = functools.partial(_crash_once, str(tmp_path / 'marker2'))
+    with pytest.raises(BrokenProcessPool):
+        list(pipeline.imap(func, documents, workers=2, max_restarts=0))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_imap_poison(ordered):
+    func = functools.partial(_crash_on, {'3', '7'})
+    documents = []
+    for i in range(10):
+        document = bioc.BioCDocument()
+        document.id = str(i)
+        documents.append(document)
+    stats = pipeline.PipelineStats()
+    results = list(pipeline.imap(func, documents, workers=2, ordered=ordered,
+                                 max_restarts=1, stats=stats))
+    ids = [d.id for d in results]
+    if not ordered:
+        ids.sort(key=int)
+    assert ['0', '1', '2', '4', '5', '6', '8', '9'] == ids
+    assert [3, 7] == stats.skipped
+    assert 8 == stats.processed
+    assert 'skipped=2' in str(stats)
+
+
+def test_imap_broken_on_submit(monkeypatch):
+    monkeypatch.setattr(pipeline, 'ProcessPoolExecutor', _BrokenOnSubmit)
+    documents = [bioc.BioCDocument() for _ in range(5)]
+    stats = pipeline.PipelineStats()
+    results = list(pipeline.imap(_identity, documents, workers=2,
+                                 stats=stats))
+    assert 5 == len(results)
+    assert 1 == stats.restarts
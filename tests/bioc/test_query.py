@@ -0,0 +1,153 @@
+import pytest
+
+import bioc
+from bioc import biocjson, DOCUMENT, PASSAGE, SENTENCE
+from bioc.biocquery import infon, query
+
+
+def _annotation(id, type, offset, length, **infons):
+    ann = bioc.BioCAnnotation()
+    ann.id = id
+    ann.infons['type'] = type
+    ann.infons.update(infons)
+    ann.add_location(bioc.BioCLocation(offset, length))
+    return ann
+
+
+def _collection():
+    collection = bioc.BioCCollection()
+    for i, type in enumerate(['Gene', 'Disease', 'Gene']):
+        doc = bioc.BioCDocument()
+        doc.id = str(i)
+        doc.add_annotation(_annotation('D%d' % i, type, 0, 3))
+        passage = bioc.BioCPassage.of_text('a' * 20, 0)
+        passage.add_annotation(_annotation('P%d' % i, type, 5, 3,
+                                           identifier='672'))
+        passage.add_annotation(_annotation('Q%d' % i, 'Chemical', 12, 3))
+        doc.add_passage(passage)
+        passage = bioc.BioCPassage()
+        passage.offset = 30
+        sentence = bioc.BioCSentence.of_text('b' * 10, 30)
+        sentence.add_annotation(_annotation('S%d' % i, type, 32, 2))
+        passage.add_sentence(sentence)
+        rel = bioc.BioCRelation()
+        rel.id = 'R%d' % i
+        rel.infons['type'] = 'Association'
+        rel.add_node(bioc.BioCNode('P%d' % i, 'arg'))
+        passage.add_relation(rel)
+        doc.add_passage(passage)
+        collection.add_document(doc)
+    return collection
+
+
+collection = _collection()
+
+
+def _ids(q):
+    return [r.annotation.id if r.annotation is not None else r.relation.id
+            for r in q]
+
+
+def test_query():
+    q = query(collection).annotations(type='Gene')
+    assert ['D0', 'P0', 'S0', 'D2', 'P2', 'S2'] == _ids(q)
+    assert 6 == q.count()
+
+    q = query(collection).annotations(type='Gene', level=PASSAGE) \
+        .where(infon('identifier') != None)
+    assert ['P0', 'P2'] == _ids(q)
+    r = next(iter(q))
+    assert r.document is collection.documents[0]
+    assert r.passage is collection.documents[0].passages[0]
+    assert r.sentence is None
+
+    q = query(collection).annotations(level=(PASSAGE, SENTENCE)) \
+        .where(infon('identifier') == None)
+    assert ['Q0', 'S0', 'Q1', 'S1', 'Q2', 'S2'] == _ids(q)
+
+    q = query(collection).annotations(docid='1', level=DOCUMENT)
+    assert ['D1'] == _ids(q)
+
+    q = query(collection).annotations() \
+        .where(infon('type').isin(['Disease', 'Chemical'])
+               & ~(infon('type') == 'Chemical'))
+    assert ['D1', 'P1', 'S1'] == _ids(q)
+    q = query(collection).annotations(type='Chemical') \
+        .where(lambda ann: ann.id.endswith('1'))
+    assert ['Q1'] == _ids(q)
+
+    q = query(collection).relations(type='Association', level=PASSAGE)
+    assert ['R0', 'R1', 'R2'] == _ids(q)
+    assert [] == _ids(query(collection).relations(level=SENTENCE))
+
+    with pytest.raises(TypeError):
+        query(collection).annotations().where('foo')
+
+
+def test_query_offsets():
+    q = query(collection).annotations(start=4, end=13)
+    assert ['P0', 'Q0', 'P1', 'Q1', 'P2', 'Q2'] == _ids(q)
+    q = query(collection).annotations(type='Gene', start=31, docid='2')
+    assert ['S2'] == _ids(q)
+    q = query(collection.documents[0]).annotations(end=3)
+    assert ['D0'] == _ids(q)
+
+
+def test_query_required():
+    assert {'Gene'} == (infon('type') == 'Gene').required
+    assert set() == (infon('type') == 'a<b').required
+    assert set() == (infon('type') != 'Gene').required
+    assert {'Gene', '672'} \
+           == ((infon('type') == 'Gene') & (infon('id') == '672')).required
+    assert set() \
+           == ((infon('type') == 'Gene') | (infon('id') == '672')).required
+
+
+def test_query_xml(tmp_path):
+    path = tmp_path / 'collection.xml'
+    with open(path, 'w', encoding='utf8') as fp:
+        bioc.dump(collection, fp)
+    q = query(path).annotations(type='Gene', level=PASSAGE) \
+        .where(infon('identifier') != None)
+    assert ['P0', 'P2'] == _ids(q)
+    assert ['S1'] == _ids(query(str(path)).annotations(docid='1',
+                                                       level=SENTENCE))
+    assert ['R0', 'R1', 'R2'] == _ids(query(path).relations())
+
+    # documents without the type are not parsed
+    with open(path, encoding='utf8') as fp:
+        s = fp.read()
+    with open(path, 'w', encoding='utf8') as fp:
+        fp.write(s.replace('<id>1</id>', '<id>1</id><passage><offset>x'
+                                         '</offset></passage>'))
+    with pytest.raises(ValueError):
+        query(path).annotations().count()
+    assert 6 == query(path).annotations(type='Gene').count()
+
+    with pytest.raises(ValueError):
+        query(path, format='foo')
+
+
+def test_query_jsonl(tmp_path):
+    path = tmp_path / 'collection.jsonl'
+    with biocjson.iterwriter(path) as writer:
+        for doc in collection.documents:
+            writer.write(doc)
+    q = query(path).annotations(type='Gene', level=PASSAGE) \
+        .where(infon('identifier') != None)
+    assert ['P0', 'P2'] == _ids(q)
+    assert ['D1'] == _ids(query(path).annotations(docid='1', level=DOCUMENT))
+
+    with biocjson.iterreader(path) as reader:
+        assert ['Q0', 'Q1', 'Q2'] \
+               == _ids(query(reader).annotations(type='Chemical'))
+
+
+def test_query_json(tmp_path):
+    path = tmp_path / 'collection.json'
+    with open(path, 'w', encoding='utf8') as fp:
+        biocjson.dump(collection, fp)
+    q = query(path).annotations(type='Gene', level=PASSAGE) \
+        .where(infon('identifier') != None)
+    assert ['P0', 'P2'] == _ids(q)
+    assert ['D1'] == _ids(query(path).annotations(docid='1', level=DOCUMENT))
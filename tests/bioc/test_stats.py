@@ -0,0 +1,84 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+import bioc
+from bioc import biocjson, stats
+
+file = Path(__file__).parent / 'everything.xml'
+with open(file, encoding='utf8') as fp:
+    collection = bioc.load(fp)
+
+
+def test_collect():
+    s = stats.collect(collection)
+    assert 2 == s.documents
+    assert 2 == s.passages
+    assert 2 == s.sentences
+    assert 5 == s.annotations
+    assert 3 == s.relations
+    assert {None: 5} == s.annotation_types.to_dict()
+    d = s.to_dict()
+    assert 5 == d['infon_keys']['annotation-infon-key']
+    assert 1 == d['infon_cardinalities']['annotation-infon-key']
+    assert [] == d['saturated_infon_keys']
+    assert 2 == d['sentence_lengths']['count']
+    assert 11 == d['sentence_lengths']['max']
+    assert 5 == d['annotation_lengths']['count']
+    json.dumps(d)
+    assert 'BioCStats[documents=2' in str(s)
+
+    assert 1 == stats.collect(collection.documents[0]).documents
+
+
+def test_collect_file(tmp_path):
+    expected = stats.collect(collection).to_dict()
+    assert expected == stats.collect(file).to_dict()
+
+    path = tmp_path / 'everything.jsonl'
+    with biocjson.iterwriter(path) as writer:
+        for doc in collection.documents:
+            writer.write(doc)
+    assert expected == stats.collect(path).to_dict()
+
+    path = tmp_path / 'everything.json'
+    with open(path, 'w', encoding='utf8') as fp:
+        biocjson.dump(collection, fp)
+    assert expected == stats.collect(path).to_dict()
+
+    with pytest.raises(ValueError):
+        stats.collect(file, format='foo')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_collect_files(workers):
+    s = stats.collect_files([file, file, str(file)], workers=workers)
+    assert 6 == s.documents
+    assert 15 == s.annotations
+    assert 9 == s.relations
+    assert 1 == s.infon_cardinalities()['annotation-infon-key']
+
+
+def test_merge():
+    a = stats.BioCStats(max_values=2)
+    for i in range(3):
+        ann = bioc.BioCAnnotation()
+        ann.infons['type'] = 'Gene'
+        ann.infons['identifier'] = str(i)
+        ann.text = 'a' * (i + 1)
+        doc = bioc.BioCDocument()
+        doc.add_annotation(ann)
+        a.add_document(doc)
+    assert 2 == a.infon_cardinalities()['identifier']
+    assert ['identifier'] == a.to_dict()['saturated_infon_keys']
+
+    b = pickle.loads(pickle.dumps(stats.collect(collection)))
+    b.merge(a)
+    assert 5 == b.documents
+    assert {None: 5, 'Gene': 3} == b.annotation_types.to_dict()
+    assert 2 == b.infon_cardinalities()['identifier']
+    lengths = b.annotation_lengths.to_dict()
+    assert 8 == lengths['count']
+    assert [[1, 1, 1], [2, 3, 7]] == lengths['buckets']
@@ -40,6 +40,42 @@ def test_get_text():
         bioc.get_text(c.documents[1])
 
 
+def test_get_text_cache():
+    doc = bioc.BioCDocument()
+    passage = bioc.BioCPassage()
+    passage.offset = 2
+    passage.add_sentence(bioc.BioCSentence.of_text('abc', 2))
+    doc.add_passage(passage)
+    assert (2, 'abc') == bioc.get_text(passage)
+    assert bioc.get_text(doc)[1] is bioc.get_text(doc)[1]
+    assert (0, '\n\nabc') == bioc.get_text(doc)
+
+    passage.add_sentence(bioc.BioCSentence.of_text('de', 6))
+    assert (2, 'abc de') == bioc.get_text(passage)
+    assert (0, '\n\nabc de') == bioc.get_text(doc)
+
+    passage.sentences[1] = bioc.BioCSentence.of_text('fg', 6)
+    assert (0, '\n\nabc fg') == bioc.get_text(doc)
+    # changes to a sentence in place
+    passage.sentences[1].text = 'xy'
+    assert (2, 'abc xy') == bioc.get_text(passage)
+    assert (0, '\n\nabc xy') == bioc.get_text(doc)
+    passage.sentences[1].offset = 7
+    assert (2, 'abc  xy') == bioc.get_text(passage)
+    passage.sentences[1].offset = 6
+    passage.sentences[1].text = 'fg'
+
+    passage.offset = 1
+    assert (1, ' abc fg') == bioc.get_text(passage)
+
+    doc.add_passage(bioc.BioCPassage.of_text('h', 10))
+    assert (0, '\n abc fg\n\nh') == bioc.get_text(doc)
+
+    passage.sentences[1] = bioc.BioCSentence.of_text('fg', 3)
+    with pytest.raises(ValueError):
+        bioc.get_text(doc)
+
+
 def test_pretty_print():
     tmp = tempfile.mktemp()
     bioc.pretty_print(file, tmp)
@@ -54,3 +90,50 @@ def test_shorten_text():
 
     s = 'a' * 50
     assert bioc.utils.shorten_text(s) == repr('a' * 17 + ' ... ' + 'a' * 17)
+
+
+def test_projection():
+    assert frozenset() == bioc.utils.projection()
+    assert {'relations'} == bioc.utils.projection(skip=['relations'])
+    assert {'infons', 'annotations', 'relations'} \
+           == bioc.utils.projection(fields={'text'})
+    assert {'sentences', 'infons', 'annotations', 'relations'} \
+           == bioc.utils.projection(skip={'sentences'}, fields={'text'})
+    with pytest.raises(ValueError):
+        bioc.utils.projection(skip={'foo'})
+    with pytest.raises(ValueError):
+        bioc.utils.projection(fields={'passages'})
+
+
+def test_string_cache():
+    cache = bioc.utils.StringCache(maxsize=4)
+    a = ''.join(['ty', 'pe'])
+    b = ''.join(['ty', 'pe'])
+    assert a is not b
+    assert cache(a) is a
+    assert cache(b) is a
+    assert cache(None) is None
+    assert len(cache) == 2
+
+    # a full cache still admits new strings and keeps frequent ones
+    for i in range(100):
+        assert cache(str(i)) == str(i)
+        assert cache(''.join(['ty', 'pe'])) is a
+        assert len(cache) <= 4
+    c = ''.join(['ke', 'y'])
+    assert cache(c) is c
+    assert cache(''.join(['ke', 'y'])) is c
+    # strings that are no longer seen are evicted
+    for i in range(4):
+        cache(str(i))
+    assert cache(''.join(['ty', 'pe'])) is not a
+
+    cache.clear()
+    assert len(cache) == 0
+    assert bioc.utils.StringCache(maxsize=0)(a) is a
+    with pytest.raises(ValueError):
+        bioc.utils.StringCache(maxsize=-1)
+
+    assert bioc.utils.string_cache(False) is None
+    assert isinstance(bioc.utils.string_cache(True), bioc.utils.StringCache)
+    assert bioc.utils.string_cache(cache) is cache
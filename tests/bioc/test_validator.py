@@ -1,9 +1,13 @@
 import copy
+import io
+import json
 from pathlib import Path
 
 import pytest
 
 import bioc
+from bioc import biocjson, biocxml
+from bioc.validator import BioCValidator
 
 file = Path(__file__).parent / 'everything.xml'
 with open(file, encoding='utf8') as fp:
@@ -50,3 +54,111 @@ def test_onerror():
 
     with pytest.raises(AssertionError):
         bioc.validate(c, onerror=onerror)
+
+
+def test_validate_passage_text():
+    passage = bioc.BioCPassage()
+    passage.offset = 10
+    passage.add_sentence(bioc.BioCSentence.of_text('abc', 10))
+    passage.add_sentence(bioc.BioCSentence.of_text('def', 15))
+    ann = bioc.BioCAnnotation()
+    ann.id = 'T1'
+    ann.text = 'def'
+    ann.add_location(bioc.BioCLocation(15, 3))
+    passage.add_annotation(ann)
+    rel = bioc.BioCRelation()
+    rel.id = 'R1'
+    rel.add_node(bioc.BioCNode('T1', 'arg'))
+    passage.add_relation(rel)
+    rel = bioc.BioCRelation()
+    rel.id = 'R2'
+    rel.add_node(bioc.BioCNode('R1', 'arg'))
+    passage.add_relation(rel)
+
+    doc = bioc.BioCDocument()
+    doc.id = '1'
+    doc.add_passage(passage)
+    ann = bioc.BioCAnnotation()
+    ann.id = 'T2'
+    ann.text = 'abc\n\nd'
+    ann.add_location(bioc.BioCLocation(10, 6))
+    doc.add_annotation(ann)
+    BioCValidator().validate_doc(doc)
+
+    rel.add_node(bioc.BioCNode('T3', 'arg'))
+    errors = []
+    BioCValidator(lambda msg, tb: errors.append(msg)).validate_doc(doc)
+    assert len(errors) == 1
+    assert 'T3' in errors[0]
+
+
+def _write_invalid(tmp_path):
+    c = copy.deepcopy(collection)
+    c.documents[0].passages[0].annotations[0].text = 'abc'
+    c.documents[0].passages[0].relations[0].nodes[0].refid = 'abc'
+    path = tmp_path / 'invalid.xml'
+    with open(path, 'w', encoding='utf8') as fp:
+        bioc.dump(c, fp)
+    return c, path
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_stream_xml(tmp_path, workers):
+    summary = bioc.validate_stream(file, workers=workers)
+    assert 2 == summary.documents
+    assert 0 == summary.invalid_documents == summary.errors
+
+    c, path = _write_invalid(tmp_path)
+    report = tmp_path / 'report.jsonl'
+    summary = bioc.validate_stream(path, report, workers=workers,
+                                   batch_size=1)
+    assert {'documents': 2, 'invalid_documents': 1, 'errors': 2} \
+           == {k: v for k, v in summary.to_dict().items() if k != 'elapsed'}
+    with open(report, encoding='utf8') as fp:
+        errors = [json.loads(line) for line in fp]
+    assert 2 == len(errors)
+    doc = c.documents[0]
+    assert {doc.id} == {e['docid'] for e in errors}
+    assert {doc.passages[0].annotations[0].id,
+            doc.passages[0].relations[0].id} \
+           == {e['annotation'] for e in errors}
+    assert errors[0]['path'].startswith('document %s --> passage' % doc.id)
+    assert 'ValidationSummary[' in str(summary)
+
+
+def test_validate_stream_jsonl(tmp_path):
+    c, _ = _write_invalid(tmp_path)
+    path = tmp_path / 'invalid.jsonl'
+    with biocjson.iterwriter(path) as writer:
+        for doc in c.documents:
+            writer.write(doc)
+    with open(path, 'a', encoding='utf8') as fp:
+        fp.write('{"bioctype": "BioCDocument"}\n')
+    report = io.StringIO()
+    summary = bioc.validate_stream(path, report, workers=2)
+    assert 3 == summary.documents
+    assert 2 == summary.invalid_documents
+    assert 3 == summary.errors
+    assert 3 == len(report.getvalue().splitlines())
+
+
+def test_validate_stream_json(tmp_path):
+    c, _ = _write_invalid(tmp_path)
+    path = tmp_path / 'invalid.json'
+    with open(path, 'w', encoding='utf8') as fp:
+        biocjson.dump(c, fp)
+    summary = bioc.validate_stream(path, workers=1)
+    assert 2 == summary.documents
+    assert 1 == summary.invalid_documents
+    assert 2 == summary.errors
+
+
+def test_validate_stream_reader(tmp_path):
+    _, path = _write_invalid(tmp_path)
+    with biocxml.iterparse(str(path)) as reader:
+        summary = bioc.validate_stream(reader, workers=1)
+    assert 2 == summary.documents
+    assert 2 == summary.errors
+
+    with pytest.raises(ValueError):
+        bioc.validate_stream(path, format='foo')
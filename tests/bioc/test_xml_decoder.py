@@ -1,7 +1,13 @@
+import copy
+import io
+import pickle
+import tracemalloc
 from pathlib import Path
 
 import pytest
+from lxml import etree
 
+import bioc
 from bioc import biocxml
 from tests.utils import assert_everything
 
@@ -33,4 +39,245 @@ def test_iterparse():
         collection = reader.get_collection_info()
         for document in reader:
             collection.add_document(document)
-    assert_everything(collection)
\ No newline at end of file
+    assert_everything(collection)
+
+
+def _make_collection(n):
+    collection = bioc.BioCCollection()
+    for i in range(n):
+        document = bioc.BioCDocument.of_text('')
+        document.id = str(i)
+        passage = bioc.BioCPassage.of_text('abcdefghij', 0)
+        ann = bioc.BioCAnnotation()
+        ann.id = 'T%d' % i
+        ann.text = 'bc'
+        ann.add_location(bioc.BioCLocation(1, 2))
+        passage.add_annotation(ann)
+        document.add_passage(passage)
+        collection.add_document(document)
+    return collection
+
+
+def test_iterparse_release(monkeypatch):
+    # record the iterparse context to look at the tree that it builds
+    contexts = []
+    iterparse = etree.iterparse
+
+    def record(*args, **kwargs):
+        context = iterparse(*args, **kwargs)
+        contexts.append(context)
+        return context
+
+    monkeypatch.setattr(etree, 'iterparse', record)
+    s = biocxml.dumps(_make_collection(100))
+    with biocxml.iterparse(io.BytesIO(s.encode('utf8')),
+                           track_memory=True) as reader:
+        for i, document in enumerate(reader):
+            assert str(i) == document.id
+            assert 'bc' == document.passages[0].annotations[0].text
+            assert reader.peak_memory > 0
+            assert reader.peak_rss > 0
+        # documents read before are released
+        root, = [c.root for c in contexts]
+        assert 1 == len(root)
+        assert 0 == len(root[0])
+    assert 99 == i
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize('reset_peak', [True, False])
+def test_iterparse_track_memory(monkeypatch, reset_peak):
+    if not reset_peak:
+        # as before Python 3.9
+        monkeypatch.delattr(tracemalloc, 'reset_peak', raising=False)
+    collection = _make_collection(3)
+    # the first document is much larger than the others
+    collection.documents[0].passages[0].text = 'x' * (8 << 20)
+    s = biocxml.dumps(collection).encode('utf8')
+    del collection
+    peak_rss = []
+    peak_memory = []
+    with biocxml.iterparse(io.BytesIO(s), track_memory=True) as reader:
+        for document in reader:
+            del document
+            peak_rss.append(reader.peak_rss)
+            peak_memory.append(reader.peak_memory)
+    assert not tracemalloc.is_tracing()
+    # the peaks are measured per document
+    assert peak_memory[0] > 8 << 20
+    assert peak_memory[2] < 4 << 20
+    assert all(peak_rss)
+
+
+def test_iterparse_peak_rss(monkeypatch):
+    # each document gets the peak measured while it was read
+    counter = iter(range(100))
+    monkeypatch.setattr(biocxml.decoder, '_peak_rss', lambda: next(counter))
+    s = biocxml.dumps(_make_collection(3)).encode('utf8')
+    with biocxml.iterparse(io.BytesIO(s), track_memory=True) as reader:
+        assert [0, 1, 2] == [reader.peak_rss for _ in reader]
+
+
+def test_reset_peak_rss():
+    if not biocxml.decoder._reset_peak_rss():
+        pytest.skip('the peak resident set size cannot be reset')
+    buf = b'x' * (64 << 20)
+    del buf
+    peak = biocxml.decoder._peak_rss()
+    assert biocxml.decoder._reset_peak_rss()
+    assert biocxml.decoder._peak_rss() < peak - (32 << 20)
+
+
+def test_iterparse_track_memory_close():
+    s = biocxml.dumps(_make_collection(10)).encode('utf8')
+    with biocxml.iterparse(io.BytesIO(s), track_memory=True) as reader:
+        next(reader)
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert next(reader, None) is None
+
+    # tracing started by someone else is left alone
+    tracemalloc.start()
+    try:
+        with biocxml.iterparse(io.BytesIO(s), track_memory=True) as reader:
+            next(reader)
+            assert reader.peak_memory is None
+            assert reader.peak_rss > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_load_skip():
+    with open(file, encoding='utf8') as fp:
+        collection = biocxml.load(fp, skip={'relations', 'sentences'})
+    document = collection.documents[0]
+    assert '1' == document.id
+    assert 0 == len(document.relations)
+    assert 0 == len(document.passages[0].relations)
+    assert 2 == len(document.passages[0].annotations)
+    assert 'abcdefghijklmnopqrstuvwxyz' == document.passages[0].text
+    assert 0 == len(collection.documents[1].passages[0].sentences)
+
+    with pytest.raises(ValueError):
+        biocxml.loads('<collection/>', skip={'foo'})
+
+
+def test_iterparse_fields():
+    with biocxml.iterparse(str(file), fields={'text'}) as reader:
+        documents = list(reader)
+    assert {} == documents[0].infons
+    passage = documents[0].passages[0]
+    assert 'abcdefghijklmnopqrstuvwxyz' == passage.text
+    assert {} == passage.infons
+    assert 0 == len(passage.annotations)
+    assert 0 == len(passage.relations)
+    sentence = documents[1].passages[0].sentences[1]
+    assert 34 == sentence.offset
+    assert '测试Non-ASCII' == sentence.text
+    assert 0 == len(sentence.annotations)
+
+
+def test_load_lazy():
+    with open(file, encoding='utf8') as fp:
+        collection = biocxml.load(fp, lazy=True)
+    document = collection.documents[0]
+    assert isinstance(document, biocxml.BioCXMLLazyDocument)
+    assert '1' == document.id
+    assert 'infons' not in document.__dict__
+    assert 'document-infon-value' == document.infons['document-infon-key']
+    assert 'passages' not in document.__dict__
+    assert_everything(collection)
+
+    # decoded fields are cached
+    assert document.passages is document.passages
+    document.add_annotation(bioc.BioCAnnotation())
+    assert 2 == len(document.annotations)
+
+
+def test_iterparse_lazy():
+    with biocxml.iterparse(str(file), lazy=True) as reader:
+        collection = reader.get_collection_info()
+        for document in reader:
+            collection.add_document(document)
+    assert_everything(collection)
+
+
+def test_lazy_copy():
+    with open(file, encoding='utf8') as fp:
+        collection = biocxml.load(fp, lazy=True)
+    c = copy.deepcopy(collection)
+    assert_everything(c)
+    c = pickle.loads(pickle.dumps(collection))
+    assert_everything(c)
+    c = collection.clone()
+    assert_everything(c)
+    assert type(c.documents[0]) is bioc.BioCDocument
+    assert c.equals(biocxml.load(str(file)))
+
+
+def test_mmap_reader():
+    with biocxml.BioCXMLMmapReader(file) as reader:
+        collection = reader.get_collection_info()
+        for document in reader:
+            collection.add_document(document)
+    assert_everything(collection)
+
+    with biocxml.BioCXMLMmapReader(file, lazy=True, skip={'sentences'}) \
+            as reader:
+        documents = list(reader)
+    assert isinstance(documents[0], biocxml.BioCXMLLazyDocument)
+    assert 'abcdefghijklmnopqrstuvwxyz' == documents[0].passages[0].text
+    assert 0 == len(documents[1].passages[0].sentences)
+
+
+def test_mmap_reader_empty(tmp_path):
+    src = tmp_path / 'empty.xml'
+    collection = bioc.BioCCollection()
+    collection.source = 'source'
+    with open(src, 'w', encoding='utf8') as fp:
+        biocxml.dump(collection, fp)
+    with biocxml.BioCXMLMmapReader(src) as reader:
+        assert 'source' == reader.get_collection_info().source
+        assert 0 == len(list(reader))
+
+
+def test_load_workers():
+    collection = biocxml.load(str(file), workers=2)
+    assert_everything(collection)
+    assert 'UTF-8' == collection.encoding
+
+    with open(file, encoding='utf8') as fp:
+        collection = biocxml.load(fp, workers=2, skip={'relations'})
+    assert 0 == len(collection.documents[0].relations)
+
+    with pytest.raises(ValueError):
+        biocxml.load(str(file), workers=2, lazy=True)
+    with pytest.raises(ValueError):
+        biocxml.load(io.BytesIO(b'<collection/>'), workers=2)
+
+
+def test_load_workers_order(tmp_path):
+    src = tmp_path / 'collection.xml'
+    with open(src, 'w', encoding='utf8') as fp:
+        biocxml.dump(_make_collection(50), fp)
+    collection = biocxml.load(src, workers=3)
+    assert [str(i) for i in range(50)] == [d.id for d in collection.documents]
+
+
+def test_load_intern():
+    collection = biocxml.load(str(file), intern=True)
+    passage = collection.documents[0].passages[0]
+    ann1, ann2 = passage.annotations
+    (k1, v1), = ann1.infons.items()
+    (k2, v2), = ann2.infons.items()
+    assert k1 is k2 and v1 is v2
+
+    collection = biocxml.load(str(file), intern=False)
+    assert_everything(collection)
+
+    cache = bioc.utils.StringCache()
+    with biocxml.iterparse(str(file), intern=cache) as reader:
+        document = next(reader)
+    assert 'document-infon-key' in [k for k in document.infons]
+    assert len(cache) > 0
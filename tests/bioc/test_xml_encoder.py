@@ -3,7 +3,9 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from lxml import etree
 
+import bioc
 from bioc import biocxml
 from tests.utils import assert_everything
 
@@ -56,3 +58,175 @@ def test_iterwrite_io():
 
     collection = biocxml.loads(f.getvalue().decode('utf-8'))
     assert_everything(collection)
+
+
+def test_write_document():
+    collection = _get_collection()
+    collection.documents[0].passages[0].annotations[0].text = None
+    collection.documents[0].passages[0].annotations[1].text = ''
+    collection.documents[0].infons['escape'] = '<a & "b">\r\n'
+    collection.documents[0].infons['empty'] = ''
+    relation = bioc.BioCRelation()
+    relation.id = 'R4'
+    collection.documents[0].add_relation(relation)
+    collection.documents[1].passages[0].sentences[0].text = ''
+    for document in collection.documents:
+        f = io.BytesIO()
+        with etree.xmlfile(f, encoding='utf8') as xf:
+            biocxml.encoder.write_document(xf, document)
+        expected = etree.tostring(biocxml.encoder.encode_document(document),
+                                  encoding='utf8', xml_declaration=False)
+        assert expected == f.getvalue()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'flush_every': 1},
+    {'flush_every': 1000},
+    {'flush_every': None},
+    {'flush_every': None, 'flush_bytes': 1},
+    {'flush_bytes': 1},
+    {'flush_every': 2, 'flush_bytes': 1 << 20},
+])
+def test_iterwrite_flush(kwargs):
+    collection = _get_collection()
+    f = io.BytesIO()
+    with biocxml.iterwrite(f, **kwargs) as writer:
+        writer.write_collection_info(collection)
+        for document in collection.documents:
+            writer.write_document(document)
+    collection = biocxml.loads(f.getvalue().decode('utf-8'))
+    assert_everything(collection)
+
+
+def test_iterwrite_flush_bytes_file():
+    collection = _get_collection()
+    tmp = tempfile.mktemp()
+    with biocxml.iterwrite(tmp, flush_bytes=1024) as writer:
+        writer.write_collection_info(collection)
+        for document in collection.documents:
+            writer.write_document(document)
+    with open(tmp, encoding='utf8') as fp:
+        collection = biocxml.load(fp)
+    assert_everything(collection)
+
+
+class _Recorder(io.BytesIO):
+    """Record the size of every write."""
+
+    def __init__(self):
+        super(_Recorder, self).__init__()
+        self.sizes = []
+
+    def write(self, data):
+        self.sizes.append(len(data))
+        return super(_Recorder, self).write(data)
+
+
+def test_iterwrite_flush_bytes_pending():
+    collection = _get_collection()
+    document = collection.documents[0]
+    size = len(etree.tostring(biocxml.encoder.encode_document(document)))
+    f = _Recorder()
+    with biocxml.iterwrite(f, flush_bytes=3 * size) as writer:
+        writer.write_collection_info(collection)
+        for _ in range(20):
+            writer.write_document(document)
+    # the output is written in chunks of flush_bytes plus at most one
+    # document
+    assert len(f.sizes) >= 5
+    assert all(3 * size <= n < 5 * size for n in f.sizes[:-1])
+    collection = biocxml.loads(f.getvalue().decode('utf-8'))
+    assert 20 == len(collection.documents)
+
+
+def test_iterwrite_flush_bytes_only():
+    collection = _get_collection()
+    document = collection.documents[0]
+    # flush_bytes alone does not flush after every document
+    f = _Recorder()
+    with biocxml.iterwrite(f, flush_bytes=1 << 20) as writer:
+        for _ in range(50):
+            writer.write_document(document)
+    assert 1 == len(f.sizes)
+    # whichever threshold comes first
+    f = _Recorder()
+    with biocxml.iterwrite(f, flush_every=10,
+                           flush_bytes=1 << 20) as writer:
+        for _ in range(50):
+            writer.write_document(document)
+    assert 5 <= len(f.sizes) <= 6
+    assert 50 == len(biocxml.loads(f.getvalue().decode('utf-8')).documents)
+
+
+def _tostring(collection, pretty_print):
+    """Serialize the element tree of the collection with lxml."""
+    doc = etree.ElementTree(biocxml.encoder.encode_collection(collection))
+    s = etree.tostring(doc,
+                       pretty_print=pretty_print,
+                       encoding=collection.encoding,
+                       standalone=collection.standalone)
+    return s.decode(collection.encoding)
+
+
+def _get_tricky_collection():
+    collection = _get_collection()
+    collection.infons['<&>'] = 'a "b" \'c\'\n\t\r'
+    document = collection.documents[0]
+    document.id = '测试 & <id>'
+    document.infons['number'] = 1
+    passage = document.passages[0]
+    passage.annotations[0].text = None
+    passage.annotations[1].text = ''
+    passage.annotations[1].id = 'a"\n\t\r<>&'
+    relation = bioc.BioCRelation()
+    relation.id = 'R4'
+    passage.add_relation(relation)
+    passage.relations[0].nodes[0].role = '&role"'
+    sentence = collection.documents[1].passages[0].sentences[0]
+    sentence.text = 'a > b && c < d\r\n]]>'
+    sentence.annotations[0].infons['\U0001F600'] = '\x7f\x85'
+    collection.source = None
+    return collection
+
+
+@pytest.mark.parametrize('pretty_print', [True, False])
+@pytest.mark.parametrize('encoding,standalone', [
+    ('UTF-8', True),
+    ('utf-8', False),
+    ('utf8', None),
+    ('ASCII', True),
+    ('us-ascii', None),
+    ('iso-8859-1', None),
+    ('utf-16', True),
+])
+def test_dumps_identical(pretty_print, encoding, standalone):
+    for collection in (_get_collection(), _get_tricky_collection(),
+                       bioc.BioCCollection()):
+        collection.encoding = encoding
+        collection.standalone = standalone
+        expected = _tostring(collection, pretty_print)
+        assert expected == biocxml.dumps(collection,
+                                         pretty_print=pretty_print)
+        f = io.BytesIO()
+        biocxml.dump(collection, f, pretty_print=pretty_print)
+        assert expected == f.getvalue().decode(encoding)
+
+
+def test_dumps_invalid_char():
+    collection = _get_collection()
+    collection.documents[0].infons['key'] = 'a\x00b'
+    with pytest.raises(ValueError):
+        biocxml.dumps(collection)
+
+
+def test_dump_round_trip():
+    collection = _get_tricky_collection()
+    # None is decoded as an empty string
+    collection.source = ''
+    collection.documents[0].passages[0].annotations[0].text = ''
+    tmp = tempfile.mktemp()
+    with open(tmp, 'wb') as fp:
+        biocxml.dump(collection, fp, pretty_print=False)
+    with open(tmp, 'rb') as fp:
+        actual = biocxml.load(fp)
+    assert biocxml.dumps(collection) == biocxml.dumps(actual)
@@ -0,0 +1,121 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import bioc
+from bioc import biocxml
+from bioc.biocxml.index import load_index
+from bioc.biocxml.scanner import iter_document_spans, document_id, parse_span
+from tests.utils import assert_everything
+
+file = Path(__file__).parent / 'everything.xml'
+
+
+def test_iter_document_spans():
+    s = b'<collection><documents/><document/>' \
+        b'<document id="x"><id>1</id></document></collection>'
+    spans = list(iter_document_spans(s))
+    assert [(24, 11), (35, 38)] == spans
+    assert s[35:73].endswith(b'</document>')
+
+    with pytest.raises(ValueError):
+        list(iter_document_spans(b'<collection><document><id>1</id>'))
+
+
+def test_build_index(tmp_path):
+    src = tmp_path / 'everything.xml'
+    shutil.copy(file, src)
+    index = biocxml.build_index(src)
+    assert ['1', '2'] == list(index)
+    assert index == load_index(src)
+
+    # the index is out of date
+    with open(src, 'ab') as fp:
+        fp.write(b'\n')
+    assert load_index(src) is None
+
+
+def test_indexed_reader(tmp_path):
+    src = tmp_path / 'everything.xml'
+    shutil.copy(file, src)
+    with biocxml.BioCXMLIndexedReader(src) as reader:
+        assert 2 == len(reader)
+        assert '2' in reader
+        assert '3' not in reader
+        collection = reader.get_collection_info()
+        for docid in reader:
+            collection.add_document(reader.get(docid))
+        with pytest.raises(KeyError):
+            reader.get('3')
+    assert_everything(collection)
+    assert (tmp_path / 'everything.xml.idx').exists()
+
+    index_path = tmp_path / 'index'
+    with biocxml.BioCXMLIndexedReader(src, index_path,
+                                      skip={'relations'}) as reader:
+        document = reader['1']
+    assert index_path.exists()
+    assert '1' == document.id
+    assert 0 == len(document.relations)
+
+
+def test_indexed_reader_empty(tmp_path):
+    src = tmp_path / 'empty.xml'
+    collection = bioc.BioCCollection()
+    collection.source = 'source'
+    with open(src, 'w', encoding='utf8') as fp:
+        biocxml.dump(collection, fp)
+    with biocxml.BioCXMLIndexedReader(src) as reader:
+        assert 0 == len(reader)
+        assert 'source' == reader.get_collection_info().source
+
+
+def test_document_id():
+    s = b'<collection><document><id>a&amp;b</id></document>' \
+        b'<document></document></collection>'
+    (o1, l1), (o2, l2) = iter_document_spans(s)
+    assert 'a&b' == document_id(s, o1, l1)
+    assert document_id(s, o2, l2) is None
+    assert 'a&b' == parse_span(s, o1, l1).findtext('id')
+
+    for element, expected in [
+        (b'<id >1</id >', '1'),
+        (b'<id\n  type="pmid">2</id>', '2'),
+        (b'<id> 3\n</id>', ' 3\n'),
+        (b'<identifier>x</identifier><id>4</id>', '4'),
+        (b'<id/>', ''),
+        (b'<id x:y="z">5</id>', None),
+    ]:
+        s = b'<document>' + element + b'</document>'
+        assert expected == document_id(s, 0, len(s))
+        if expected is not None:
+            assert expected == (parse_span(s, 0, len(s)).findtext('id'))
+
+
+def test_build_index_no_id(tmp_path):
+    src = tmp_path / 'noid.xml'
+    src.write_bytes(b'<collection><source>s</source>'
+                    b'<document><id>1</id></document>'
+                    b'<document><passage><offset>0</offset></passage>'
+                    b'</document></collection>')
+    with pytest.warns(UserWarning, match='byte 61'):
+        index = biocxml.build_index(src)
+    assert ['1'] == list(index)
+
+    src.write_bytes(b'<collection><document><id>1\n</id></document>'
+                    b'<document><id> 2 </id></document></collection>')
+    with pytest.warns(UserWarning, match='line break'):
+        index = biocxml.build_index(src)
+    assert [' 2 '] == list(index)
+    assert index == load_index(src)
+
+    # no document has an id
+    src.write_bytes(b'<collection><source>s</source>'
+                    b'<document></document></collection>')
+    with pytest.warns(UserWarning):
+        with biocxml.BioCXMLIndexedReader(src) as reader:
+            assert 0 == len(reader)
+            collection = reader.get_collection_info()
+    assert 's' == collection.source
+    assert 0 == len(collection.documents)